@@ -0,0 +1,142 @@
+"""
+Conversion Benchmark Suite
+Runs convert scenarios over synthetic CSV files and records rows/s, MB/s, peak RSS
+and output database size to a JSON results file.
+
+Examples:
+    python benchmarks/bench_conversion.py
+    python benchmarks/bench_conversion.py --rows 1e4,1e6 --scenarios mixed,wide_text
+    python benchmarks/bench_conversion.py --rows 1e8 --scenarios numeric --timeout 86400
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import tempfile
+
+from harness import (RESULTS_DIR, run_worker, load_runs, append_run,
+                     previous_result, format_change, print_table)
+from metrics import peak_rss_mb
+from synthetic_csv import generate_csv, COLUMN_TYPES
+
+
+SUITE = 'conversion'
+
+# Each scenario stresses one aspect of the input; sizes are chosen on the command line
+SCENARIOS = {
+    'numeric': {'columns': 10, 'type_mix': ['int', 'float']},
+    'mixed': {'columns': 12, 'type_mix': list(COLUMN_TYPES)},
+    'wide_text': {'columns': 40, 'type_mix': ['text'], 'string_width': 48},
+    'quoted': {'columns': 8, 'type_mix': ['int', 'text'], 'quoting': 'embedded'},
+    'latin1': {'columns': 8, 'type_mix': ['int', 'text', 'category'], 'encoding': 'latin-1'},
+    'sparse': {'columns': 12, 'type_mix': list(COLUMN_TYPES), 'null_density': 0.5},
+}
+
+DEFAULT_ROWS = '1e4,1e5'
+MAX_ROWS = 100_000_000
+
+
+def data_file(data_dir, scenario, rows, seed):
+    """Path of the cached synthetic CSV for a scenario; identical settings share a file"""
+    settings = json.dumps({'scenario': SCENARIOS[scenario], 'rows': rows, 'seed': seed}, sort_keys=True)
+    digest = hashlib.blake2b(settings.encode(), digest_size=6).hexdigest()
+    return os.path.join(data_dir, f"{scenario}_{rows}_{digest}.csv")
+
+
+def worker(payload):
+    """Measure one conversion in this process and print the result as JSON"""
+    from converter import run_conversion
+
+    csv_file = payload['csv_file']
+    out_dir = tempfile.mkdtemp(prefix='csvsql-bench-')
+    csv_bytes = os.path.getsize(csv_file)
+
+    start = time.perf_counter()
+    summary = run_conversion(csv_file, 'bench', out_dir, 'bench', force=True, **payload.get('options', {}))
+    seconds = time.perf_counter() - start
+
+    db_file = summary['database']
+    db_bytes = os.path.getsize(db_file)
+    if not payload.get('keep'):
+        os.remove(db_file)
+        os.rmdir(out_dir)
+
+    print(json.dumps({
+        'seconds': seconds,
+        'rows_per_s': summary['rows'] / seconds,
+        'mb_per_s': csv_bytes / (1024 * 1024) / seconds,
+        'peak_rss_mb': peak_rss_mb(),
+        'csv_mb': csv_bytes / (1024 * 1024),
+        'db_mb': db_bytes / (1024 * 1024),
+        'stages': {record['stage']: record['seconds'] for record in summary['metrics']['stages']},
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CSV to SQLite conversion")
+    parser.add_argument('--scenarios', default=",".join(SCENARIOS),
+                        help="Comma separated scenarios: " + ", ".join(SCENARIOS))
+    parser.add_argument('--rows', default=DEFAULT_ROWS,
+                        help=f"Comma separated row counts, e.g. 1e4,1e6 (up to {MAX_ROWS:.0e})")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'csvsql-bench-data'),
+                        help="Directory for generated CSV files (reused between runs)")
+    parser.add_argument('--options', default='{}',
+                        help="JSON object of extra run_conversion options, e.g. '{\"parse_dates\": true}'")
+    parser.add_argument('--output', default=os.path.join(RESULTS_DIR, 'conversion.json'))
+    parser.add_argument('--timeout', type=float, default=None, help="Seconds allowed per scenario")
+    parser.add_argument('--keep', action='store_true', help="Keep the output databases")
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(json.loads(args.worker))
+        return
+
+    scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"Unknown scenario(s): {', '.join(unknown)}")
+
+    row_counts = [int(float(value)) for value in args.rows.split(',')]
+    if any(rows < 1 or rows > MAX_ROWS for rows in row_counts):
+        parser.error(f"Row counts must be between 1 and {MAX_ROWS:.0e}")
+
+    options = json.loads(args.options)
+    os.makedirs(args.data_dir, exist_ok=True)
+    runs = load_runs(args.output)
+    results = []
+
+    for rows in row_counts:
+        for scenario in scenarios:
+            csv_file = data_file(args.data_dir, scenario, rows, args.seed)
+            if not os.path.exists(csv_file):
+                print(f"Generating {scenario} with {rows:,} rows...", flush=True)
+                generate_csv(csv_file + '.tmp', rows, seed=args.seed, **SCENARIOS[scenario])
+                os.replace(csv_file + '.tmp', csv_file)
+
+            print(f"Converting {scenario} with {rows:,} rows...", flush=True)
+            result = {'scenario': scenario, 'rows': rows, 'options': options}
+            result.update(run_worker(__file__, {'csv_file': csv_file, 'options': options, 'keep': args.keep},
+                                     timeout=args.timeout))
+
+            previous = previous_result(runs, SUITE, {'scenario': scenario, 'rows': rows, 'options': options})
+            result['vs_previous'] = format_change(result.get('rows_per_s'),
+                                                  previous.get('rows_per_s') if previous else None)
+            results.append(result)
+
+    print()
+    print_table(results, [('scenario', 'Scenario'), ('rows', 'Rows'), ('seconds', 'Seconds'),
+                          ('rows_per_s', 'Rows/s'), ('mb_per_s', 'MB/s'), ('peak_rss_mb', 'Peak RSS MB'),
+                          ('csv_mb', 'CSV MB'), ('db_mb', 'DB MB'), ('vs_previous', 'vs previous'),
+                          ('error', 'Error')])
+
+    append_run(args.output, SUITE, results, settings={'seed': args.seed, 'options': options})
+    print(f"\nResults appended to {args.output}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
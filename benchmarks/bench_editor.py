@@ -0,0 +1,215 @@
+"""
+Database Editor Benchmark Suite
+Times the data-access side of the database viewer and editor (db_operations,
+export) against large SQLite tables without Tk: schema load, first page, scroll
+page, time-to-first-row, the record/column edit operations and streaming export.
+
+Examples:
+    python benchmarks/bench_editor.py
+    python benchmarks/bench_editor.py --rows 1e6,1e7 --operations first_page,scroll_page
+    python benchmarks/bench_editor.py --rows 1e8 --timeout 86400
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import sqlite3
+import argparse
+import tempfile
+import statistics
+
+from harness import (RESULTS_DIR, run_worker, load_runs, append_run,
+                     previous_result, format_change, print_table)
+from metrics import peak_rss_mb
+
+
+SUITE = 'editor'
+TABLE = 'bench'
+
+# Read-only operations are repeated and the median is kept; edits run once on a fresh copy
+READ_OPERATIONS = ('schema_load', 'first_page', 'scroll_page', 'time_to_first_row')
+EDIT_OPERATIONS = ('delete_record', 'edit_record', 'add_column', 'delete_column')
+EXPORT_OPERATIONS = ('export_csv', 'export_csv_gz', 'export_parquet')
+OPERATIONS = READ_OPERATIONS + EDIT_OPERATIONS + EXPORT_OPERATIONS
+
+DEFAULT_ROWS = '1e5'
+MAX_ROWS = 100_000_000
+
+
+def build_database(path, rows):
+    """
+    Create a deterministic benchmark table shaped like a plain converter output
+
+    Values are derived from the row number, so the same row count always gives
+    the same data. There is no primary key or index, as in a default conversion.
+    """
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute(f'CREATE TABLE "{TABLE}" (id INTEGER, category TEXT, amount REAL, note TEXT, created TEXT)')
+        conn.execute(f'''
+            WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < ?)
+            INSERT INTO "{TABLE}"
+            SELECT n,
+                   'status_' || (n * 7919 % 20),
+                   (n * 2654435761 % 1000000) / 100.0,
+                   printf('note %012d', n * 40503 % 1000000007),
+                   date('2020-01-01', '+' || (n % 1826) || ' days')
+            FROM seq
+        ''', (rows,))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def database_path(data_dir, rows):
+    """Path of the cached benchmark database for a row count"""
+    return os.path.join(data_dir, f"editor_{rows}.db")
+
+
+def time_call(func, repeat=1):
+    """Median wall time of repeated calls, and the result of the last call"""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def worker(payload):
+    """Measure one operation in this process and print the result as JSON"""
+    import db_operations as ops
+    import export
+
+    operation = payload['operation']
+    rows = payload['rows']
+    db_file = payload['db_file']
+    work_dir = None
+
+    if operation in EDIT_OPERATIONS:
+        # Edits change the table, so they run on a copy (the copy is not timed)
+        work_dir = tempfile.mkdtemp(prefix='csvsql-bench-')
+        db_file = shutil.copyfile(db_file, os.path.join(work_dir, 'editor.db'))
+    elif operation in EXPORT_OPERATIONS:
+        work_dir = tempfile.mkdtemp(prefix='csvsql-bench-')
+
+    conn = sqlite3.connect(db_file)
+    repeat = payload.get('repeat', 5)
+    target = rows // 2 + 1
+    extra = {}
+
+    def first_row():
+        fresh = sqlite3.connect(db_file)
+        try:
+            table = ops.list_tables(fresh)[0]
+            ops.table_columns(fresh, table)
+            ops.count_rows(fresh, table)
+            return ops.fetch_page(fresh, table)
+        finally:
+            fresh.close()
+
+    try:
+        if operation == 'schema_load':
+            seconds, _ = time_call(lambda: (ops.list_tables(conn), ops.table_columns(conn, TABLE),
+                                            ops.count_rows(conn, TABLE)), repeat)
+        elif operation == 'first_page':
+            seconds, _ = time_call(lambda: ops.fetch_page(conn, TABLE), repeat)
+        elif operation == 'scroll_page':
+            # A page from the middle of the table, as after scrolling halfway down
+            seconds, _ = time_call(lambda: ops.fetch_page(conn, TABLE, offset=rows // 2), repeat)
+        elif operation == 'time_to_first_row':
+            seconds, _ = time_call(first_row, repeat)
+        elif operation == 'delete_record':
+            # Preview then delete, as the editor does
+            seconds, _ = time_call(lambda: (ops.find_records(conn, TABLE, {'id': target}),
+                                            ops.delete_records(conn, TABLE, {'id': target})))
+        elif operation == 'edit_record':
+            seconds, _ = time_call(lambda: (ops.find_records(conn, TABLE, {'id': target}),
+                                            ops.update_records(conn, TABLE, 'note', 'edited', 'id', target)))
+        elif operation == 'add_column':
+            seconds, _ = time_call(lambda: ops.add_column(conn, TABLE, 'extra', 'TEXT', 'n/a'))
+        elif operation == 'delete_column':
+            seconds, _ = time_call(lambda: ops.delete_column(conn, TABLE, 'note'))
+        elif operation in EXPORT_OPERATIONS:
+            extension = {'export_csv': '.csv', 'export_csv_gz': '.csv.gz', 'export_parquet': '.parquet'}[operation]
+            seconds, stats = time_call(lambda: export.export_table(conn, TABLE, os.path.join(work_dir, TABLE + extension)))
+            extra = {'rows_per_second': stats['rows_per_second'], 'mb_per_second': stats['mb_per_second']}
+        else:
+            raise ValueError(f"Unknown operation: {operation}")
+    finally:
+        conn.close()
+        if work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(json.dumps({
+        'seconds': seconds,
+        'ms': seconds * 1000,
+        'peak_rss_mb': peak_rss_mb(),
+        **extra,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark database viewer and editor operations")
+    parser.add_argument('--operations', default=",".join(OPERATIONS),
+                        help="Comma separated operations: " + ", ".join(OPERATIONS))
+    parser.add_argument('--rows', default=DEFAULT_ROWS,
+                        help=f"Comma separated row counts, e.g. 1e5,1e7 (up to {MAX_ROWS:.0e})")
+    parser.add_argument('--repeat', type=int, default=5, help="Repetitions of read-only operations")
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'csvsql-bench-data'),
+                        help="Directory for generated databases (reused between runs)")
+    parser.add_argument('--output', default=os.path.join(RESULTS_DIR, 'editor.json'))
+    parser.add_argument('--timeout', type=float, default=None, help="Seconds allowed per operation")
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(json.loads(args.worker))
+        return
+
+    operations = [name.strip() for name in args.operations.split(',') if name.strip()]
+    unknown = [name for name in operations if name not in OPERATIONS]
+    if unknown:
+        parser.error(f"Unknown operation(s): {', '.join(unknown)}")
+
+    row_counts = [int(float(value)) for value in args.rows.split(',')]
+    if any(rows < 1 or rows > MAX_ROWS for rows in row_counts):
+        parser.error(f"Row counts must be between 1 and {MAX_ROWS:.0e}")
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    runs = load_runs(args.output)
+    results = []
+
+    for rows in row_counts:
+        db_file = database_path(args.data_dir, rows)
+        if not os.path.exists(db_file):
+            print(f"Building database with {rows:,} rows...", flush=True)
+            build_database(db_file + '.tmp', rows)
+            os.replace(db_file + '.tmp', db_file)
+
+        for operation in operations:
+            print(f"Timing {operation} on {rows:,} rows...", flush=True)
+            result = {'operation': operation, 'rows': rows}
+            result.update(run_worker(__file__, {'operation': operation, 'rows': rows, 'db_file': db_file,
+                                                'repeat': args.repeat}, timeout=args.timeout))
+
+            previous = previous_result(runs, SUITE, {'operation': operation, 'rows': rows})
+            result['vs_previous'] = format_change(result.get('seconds'),
+                                                  previous.get('seconds') if previous else None,
+                                                  higher_is_better=False)
+            results.append(result)
+
+    print()
+    print_table(results, [('operation', 'Operation'), ('rows', 'Rows'), ('ms', 'ms'),
+                          ('rows_per_second', 'Rows/s'), ('peak_rss_mb', 'Peak RSS MB'),
+                          ('vs_previous', 'vs previous'), ('error', 'Error')])
+
+    append_run(args.output, SUITE, results, settings={'repeat': args.repeat})
+    print(f"\nResults appended to {args.output}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""
+Insert Benchmark Suite
+Compares the ways a transformed batch can be written to SQLite: pandas
+DataFrame.to_sql against the executemany writer in writer.py. Batches are read
+and transformed once, outside the measurement; the insert alone is timed
+(median of several runs), then repeated under tracemalloc to record how much Python memory it allocates.
+
+Examples:
+    python benchmarks/bench_insert.py
+    python benchmarks/bench_insert.py --rows 1e6 --scenarios mixed,wide_text --writers executemany
+"""
+
+import os
+import sys
+import json
+import time
+import statistics
+import sqlite3
+import argparse
+import tempfile
+import tracemalloc
+
+from harness import RESULTS_DIR, run_worker, append_run, print_table
+from synthetic_csv import generate_csv
+from bench_conversion import SCENARIOS, data_file
+
+
+SUITE = 'insert'
+
+WRITERS = ('to_sql', 'executemany')
+
+DEFAULT_ROWS = '1e5'
+MAX_ROWS = 10_000_000
+BATCH_ROWS = 50_000
+
+
+def write_batches(writer, conn, batches):
+    """Insert every batch into the bench table with one writer, committing per batch"""
+    from writer import insert_batch
+
+    for batch in batches:
+        if writer == 'to_sql':
+            batch.to_sql('bench', conn, if_exists='append', index=False)
+        else:
+            insert_batch(conn, 'bench', batch)
+        conn.commit()
+
+
+def worker(payload):
+    """Measure one writer in this process and print the result as JSON"""
+    from converter import BatchTransformer, create_table
+    from readers import get_reader
+
+    writer = payload['writer']
+    transformer = BatchTransformer([])
+    batches = [transformer.transform(batch)
+               for batch in get_reader(payload['csv_file']).raw_batches(BATCH_ROWS)]
+    rows = sum(len(batch) for batch in batches)
+    work_dir = tempfile.mkdtemp(prefix='csvsql-bench-')
+
+    def run(name):
+        db_file = os.path.join(work_dir, name)
+        conn = sqlite3.connect(db_file)
+        try:
+            create_table(conn, 'bench', batches[0], [])
+            conn.commit()
+            write_batches(writer, conn, batches)
+        finally:
+            conn.close()
+            os.remove(db_file)
+
+    timings = []
+    for attempt in range(payload.get('repeat', 3)):
+        start = time.perf_counter()
+        run(f'timed_{attempt}.db')
+        timings.append(time.perf_counter() - start)
+    seconds = statistics.median(timings)
+
+    # tracemalloc slows allocation down, so memory is measured on a second run
+    tracemalloc.start()
+    run('traced.db')
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    os.rmdir(work_dir)
+
+    print(json.dumps({
+        'seconds': seconds,
+        'rows_per_s': rows / seconds,
+        'peak_alloc_mb': peak / (1024 * 1024),
+        'alloc_bytes_per_row': peak / max(1, min(rows, BATCH_ROWS)),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DataFrame inserts into SQLite")
+    parser.add_argument('--scenarios', default=",".join(SCENARIOS),
+                        help="Comma separated scenarios: " + ", ".join(SCENARIOS))
+    parser.add_argument('--writers', default=",".join(WRITERS),
+                        help="Comma separated writers: " + ", ".join(WRITERS))
+    parser.add_argument('--rows', default=DEFAULT_ROWS,
+                        help=f"Comma separated row counts, e.g. 1e4,1e6 (up to {MAX_ROWS:.0e})")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'csvsql-bench-data'),
+                        help="Directory for generated CSV files (shared with bench_conversion.py)")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed inserts per measurement (median)")
+    parser.add_argument('--output', default=os.path.join(RESULTS_DIR, 'insert.json'))
+    parser.add_argument('--timeout', type=float, default=None, help="Seconds allowed per measurement")
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(json.loads(args.worker))
+        return
+
+    scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"Unknown scenario(s): {', '.join(unknown)}")
+
+    writers = [name.strip() for name in args.writers.split(',') if name.strip()]
+    unknown = [name for name in writers if name not in WRITERS]
+    if unknown:
+        parser.error(f"Unknown writer(s): {', '.join(unknown)}")
+
+    row_counts = [int(float(value)) for value in args.rows.split(',')]
+    if any(rows < 1 or rows > MAX_ROWS for rows in row_counts):
+        parser.error(f"Row counts must be between 1 and {MAX_ROWS:.0e}")
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    results = []
+
+    for rows in row_counts:
+        for scenario in scenarios:
+            csv_file = data_file(args.data_dir, scenario, rows, args.seed)
+            if not os.path.exists(csv_file):
+                print(f"Generating {scenario} with {rows:,} rows...", flush=True)
+                generate_csv(csv_file + '.tmp', rows, seed=args.seed, **SCENARIOS[scenario])
+                os.replace(csv_file + '.tmp', csv_file)
+
+            baseline = None
+            for writer in writers:
+                print(f"Inserting {scenario} with {rows:,} rows using {writer}...", flush=True)
+                result = {'scenario': scenario, 'rows': rows, 'writer': writer}
+                result.update(run_worker(__file__, {'csv_file': csv_file, 'writer': writer,
+                                                    'repeat': args.repeat}, timeout=args.timeout))
+                # Allocation and speed relative to the first writer measured for this scenario
+                if baseline is None:
+                    baseline = result
+                elif 'error' not in result and 'error' not in baseline:
+                    result['alloc_vs_first'] = f"{result['peak_alloc_mb'] / baseline['peak_alloc_mb']:.2f}x"
+                    result['speed_vs_first'] = f"{result['rows_per_s'] / baseline['rows_per_s']:.2f}x"
+                results.append(result)
+
+    print()
+    print_table(results, [('scenario', 'Scenario'), ('rows', 'Rows'), ('writer', 'Writer'),
+                          ('seconds', 'Seconds'), ('rows_per_s', 'Rows/s'), ('peak_alloc_mb', 'Peak alloc MB'),
+                          ('alloc_bytes_per_row', 'Alloc B/row'), ('alloc_vs_first', 'Alloc vs first'),
+                          ('speed_vs_first', 'Speed vs first'), ('error', 'Error')])
+
+    append_run(args.output, SUITE, results, settings={'seed': args.seed, 'batch_rows': BATCH_ROWS, 'repeat': args.repeat})
+    print(f"\nResults appended to {args.output}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
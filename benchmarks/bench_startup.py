@@ -0,0 +1,119 @@
+"""
+Startup Benchmark
+Measures cold start of the GUI: import time of main_gui, which heavy modules it
+pulls in, and (when a display is available) the time from process launch until
+the main window is drawn, checked against a first-paint target.
+
+Examples:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --repeat 10 --target 0.5
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+from harness import (REPO_ROOT, RESULTS_DIR, load_runs, append_run,
+                     previous_result, format_change, print_table)
+
+
+SUITE = 'startup'
+
+# Modules that must not be loaded before the user starts a conversion
+HEAVY_MODULES = ('pandas', 'numpy', 'converter', 'edit_sql')
+
+DEFAULT_TARGET = 1.0
+
+
+def measure_import():
+    """Import main_gui in a fresh interpreter; returns seconds and heavy modules loaded"""
+    code = ("import sys, time, json; start = time.perf_counter(); import main_gui; "
+            "print(json.dumps({'seconds': time.perf_counter() - start, "
+            f"'loaded': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))")
+    result = subprocess.run([sys.executable, '-c', code], cwd=REPO_ROOT,
+                            capture_output=True, text=True, timeout=120)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure_first_paint(timeout):
+    """Seconds from launching main_gui.py until the main window reports it is drawn"""
+    env = dict(os.environ, CSVSQL_STARTUP_PROBE='1')
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, 'main_gui.py'], cwd=REPO_ROOT, env=env,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    try:
+        for line in process.stdout:
+            if line.strip() == 'first_paint':
+                seconds = time.perf_counter() - start
+                process.wait(timeout=timeout)
+                return seconds
+        raise RuntimeError(process.stderr.read().strip() or "main window did not report first paint")
+    finally:
+        if process.poll() is None:
+            process.kill()
+
+
+def has_display():
+    """Whether a Tk window can be opened here"""
+    if sys.platform.startswith('win') or sys.platform == 'darwin':
+        return True
+    return bool(os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark GUI cold start")
+    parser.add_argument('--repeat', type=int, default=5, help="Launches per measurement (median is kept)")
+    parser.add_argument('--target', type=float, default=DEFAULT_TARGET, help="First-paint target in seconds")
+    parser.add_argument('--timeout', type=float, default=60)
+    parser.add_argument('--output', default=os.path.join(RESULTS_DIR, 'startup.json'))
+    args = parser.parse_args()
+
+    runs = load_runs(args.output)
+    results = []
+
+    imports = [measure_import() for _ in range(args.repeat)]
+    results.append({
+        'measurement': 'import_main_gui',
+        'seconds': statistics.median(run['seconds'] for run in imports),
+        'heavy_modules': ", ".join(imports[-1]['loaded']) or 'none',
+    })
+
+    if has_display():
+        try:
+            seconds = statistics.median(measure_first_paint(args.timeout) for _ in range(args.repeat))
+            results.append({
+                'measurement': 'first_paint',
+                'seconds': seconds,
+                'target': 'met' if seconds <= args.target else f'missed ({args.target:.2f}s)',
+            })
+        except (RuntimeError, subprocess.TimeoutExpired) as e:
+            results.append({'measurement': 'first_paint', 'error': str(e)})
+    else:
+        results.append({'measurement': 'first_paint', 'error': 'no display available'})
+
+    for result in results:
+        previous = previous_result(runs, SUITE, {'measurement': result['measurement']})
+        result['vs_previous'] = format_change(result.get('seconds'),
+                                              previous.get('seconds') if previous else None,
+                                              higher_is_better=False)
+
+    print_table(results, [('measurement', 'Measurement'), ('seconds', 'Seconds'),
+                          ('heavy_modules', 'Heavy modules'), ('target', 'Target'),
+                          ('vs_previous', 'vs previous'), ('error', 'Error')])
+
+    append_run(args.output, SUITE, results, settings={'repeat': args.repeat, 'target': args.target})
+    print(f"\nResults appended to {args.output}")
+
+    # Fail (for CI) when heavy modules creep back into the startup path
+    if imports[-1]['loaded']:
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
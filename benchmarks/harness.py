@@ -0,0 +1,128 @@
+"""
+Benchmark Harness
+Shared helpers for the benchmark scripts: isolated worker processes, peak memory,
+environment capture and an append-only JSON results file for comparing runs over time.
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import sqlite3
+import subprocess
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARK_DIR)
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, 'results')
+
+# Make the application modules importable from the benchmark scripts
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+
+def git_commit():
+    """Short commit hash of the working tree, or None outside a git checkout"""
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                                capture_output=True, text=True, timeout=10)
+        return result.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def environment_info():
+    """Versions and machine details recorded with every run"""
+    info = {
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+    for module in ('pandas', 'numpy'):
+        try:
+            info[module] = __import__(module).__version__
+        except ImportError:
+            info[module] = None
+    return info
+
+
+def run_worker(script, payload, timeout=None):
+    """
+    Run one measurement in a fresh interpreter so peak memory is per scenario
+
+    The worker is invoked as `python <script> --worker '<json payload>'` and must
+    print its result as a single JSON object on the last line of stdout. A worker
+    that fails or runs past timeout seconds yields {'error': ...} instead, so the
+    rest of the suite still runs and its results are kept.
+    """
+    try:
+        result = subprocess.run([sys.executable, script, '--worker', json.dumps(payload)],
+                                capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {'error': f"timed out after {timeout:g}s"}
+    if result.returncode != 0:
+        return {'error': result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'worker failed'}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def load_runs(path):
+    """Load all recorded runs from a results file"""
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f).get('runs', [])
+
+
+def append_run(path, suite, results, settings=None):
+    """Append a run to the results file and return the stored record"""
+    runs = load_runs(path)
+    record = {
+        'suite': suite,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': git_commit(),
+        'environment': environment_info(),
+        'settings': settings or {},
+        'results': results,
+    }
+    runs.append(record)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'runs': runs}, f, indent=2)
+    return record
+
+
+def previous_result(runs, suite, match):
+    """Most recent earlier result of a suite whose fields equal all items in match"""
+    for run in reversed(runs):
+        if run.get('suite') != suite:
+            continue
+        for result in run.get('results', []):
+            if all(result.get(key) == value for key, value in match.items()):
+                return result
+    return None
+
+
+def format_change(current, previous, higher_is_better=True):
+    """Relative change between two measurements as text, e.g. '+12.5%'"""
+    if current is None or not previous:
+        return ''
+    change = (current - previous) / previous * 100
+    marker = '' if abs(change) < 5 else (' better' if (change > 0) == higher_is_better else ' worse')
+    return f"{change:+.1f}%{marker}"
+
+
+def print_table(rows, columns):
+    """Print rows (dicts) as an aligned text table with the given (key, header) columns"""
+    def cell(value):
+        if isinstance(value, float):
+            return f"{value:,.2f}"
+        return '' if value is None else str(value)
+
+    widths = [max([len(header)] + [len(cell(row.get(key))) for row in rows]) for key, header in columns]
+    print("  ".join(header.ljust(width) for (_, header), width in zip(columns, widths)))
+    print("  ".join('-' * width for width in widths))
+    for row in rows:
+        print("  ".join(cell(row.get(key)).ljust(width) for (key, _), width in zip(columns, widths)))
@@ -0,0 +1,146 @@
+"""
+Synthetic CSV Generator
+Writes deterministic CSV files for benchmarks. Row count, column count, type mix,
+string widths, quoting, encoding and null density are all configurable, and the
+same settings and seed always produce byte-identical files.
+"""
+
+import csv
+import argparse
+import numpy as np
+import pandas as pd
+
+
+COLUMN_TYPES = ('int', 'float', 'text', 'date', 'category', 'bool')
+
+QUOTING_MODES = {
+    'minimal': csv.QUOTE_MINIMAL,    # plain values, quotes only where needed
+    'all': csv.QUOTE_ALL,            # every field quoted
+    'embedded': csv.QUOTE_MINIMAL,   # text contains commas, quotes and line breaks
+}
+
+PLAIN_ALPHABET = np.array(list("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 "))
+ACCENTED_ALPHABET = np.array(list("àáâäçèéêëìíîïñòóôöùúûüßÀÉÖÜ"))
+EMBEDDED_SPECIALS = np.array(list(',"\n'))
+
+CATEGORY_VALUES = np.array([f"status_{i:02d}" for i in range(20)])
+DATE_START = np.datetime64('2020-01-01T00:00:00')
+DATE_RANGE_SECONDS = 5 * 365 * 24 * 3600
+
+
+def _alphabet(encoding, quoting):
+    """Characters used for text columns, chosen to exercise decoding and quoting"""
+    parts = [PLAIN_ALPHABET]
+    if encoding.lower().replace('_', '-') not in ('ascii', 'us-ascii'):
+        parts.append(ACCENTED_ALPHABET)
+    if quoting == 'embedded':
+        parts.append(EMBEDDED_SPECIALS)
+    return np.concatenate(parts)
+
+
+def _random_strings(rng, count, width, alphabet):
+    """Vectorized generation of fixed-width random strings"""
+    chars = alphabet[rng.integers(0, len(alphabet), size=(count, width))]
+    return np.ascontiguousarray(chars).view(f'<U{width}').ravel()
+
+
+def _column_values(rng, column_type, count, string_width, alphabet):
+    """Generate one block of values for a column type"""
+    if column_type == 'int':
+        return rng.integers(-1_000_000_000, 1_000_000_000, size=count)
+    if column_type == 'float':
+        return np.round(rng.normal(0, 1000, size=count), 4)
+    if column_type == 'text':
+        return _random_strings(rng, count, string_width, alphabet)
+    if column_type == 'date':
+        seconds = rng.integers(0, DATE_RANGE_SECONDS, size=count).astype('timedelta64[s]')
+        return np.datetime_as_string(DATE_START + seconds, unit='s')
+    if column_type == 'category':
+        return CATEGORY_VALUES[rng.integers(0, len(CATEGORY_VALUES), size=count)]
+    if column_type == 'bool':
+        return np.where(rng.random(count) < 0.5, 'true', 'false')
+    raise ValueError(f"Unknown column type: {column_type}")
+
+
+def column_layout(columns, type_mix):
+    """Assign types to columns round-robin from the type mix"""
+    for column_type in type_mix:
+        if column_type not in COLUMN_TYPES:
+            raise ValueError(f"Unknown column type '{column_type}', expected one of: {', '.join(COLUMN_TYPES)}")
+    return [(f"{type_mix[i % len(type_mix)]}_{i}", type_mix[i % len(type_mix)]) for i in range(columns)]
+
+
+def generate_csv(path, rows, columns=10, type_mix=COLUMN_TYPES, string_width=12, quoting='minimal',
+                 encoding='utf-8', null_density=0.0, seed=42, block_rows=100_000):
+    """
+    Write a deterministic synthetic CSV file
+
+    Args:
+        path (str): Output file path
+        rows (int): Number of data rows
+        columns (int): Number of columns
+        type_mix (tuple): Column types assigned round-robin (see COLUMN_TYPES)
+        string_width (int): Characters per text value
+        quoting (str): 'minimal', 'all' or 'embedded' (see QUOTING_MODES)
+        encoding (str): File encoding, e.g. 'utf-8', 'latin-1', 'utf-16'
+        null_density (float): Share of empty fields in every column (0.0 - 1.0)
+        seed (int): Random seed; each block is seeded from (seed, block number)
+        block_rows (int): Rows generated and written per block
+
+    Returns:
+        int: Size of the written file in bytes
+    """
+    if quoting not in QUOTING_MODES:
+        raise ValueError(f"Quoting must be one of: {', '.join(QUOTING_MODES)}")
+    if not 0.0 <= null_density < 1.0:
+        raise ValueError("Null density must be between 0.0 and 1.0")
+
+    layout = column_layout(columns, tuple(type_mix))
+    alphabet = _alphabet(encoding, quoting)
+
+    with open(path, 'w', encoding=encoding, newline='') as f:
+        written = 0
+        block = 0
+        while written < rows or (rows == 0 and block == 0):
+            count = min(block_rows, rows - written)
+            rng = np.random.default_rng([seed, block])
+
+            data = {}
+            for name, column_type in layout:
+                values = pd.Series(_column_values(rng, column_type, count, string_width, alphabet))
+                if null_density:
+                    values = values.astype(object).mask(rng.random(count) < null_density)
+                data[name] = values
+
+            pd.DataFrame(data, columns=[name for name, _ in layout]).to_csv(
+                f, header=(block == 0), index=False, quoting=QUOTING_MODES[quoting], lineterminator='\n'
+            )
+            written += count
+            block += 1
+
+    with open(path, 'rb') as f:
+        f.seek(0, 2)
+        return f.tell()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic CSV file")
+    parser.add_argument('path', help="Output CSV path")
+    parser.add_argument('--rows', type=float, default=10_000)
+    parser.add_argument('--columns', type=int, default=10)
+    parser.add_argument('--types', default=",".join(COLUMN_TYPES),
+                        help="Comma separated column types: " + ", ".join(COLUMN_TYPES))
+    parser.add_argument('--string-width', type=int, default=12)
+    parser.add_argument('--quoting', choices=list(QUOTING_MODES), default='minimal')
+    parser.add_argument('--encoding', default='utf-8')
+    parser.add_argument('--null-density', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    size = generate_csv(args.path, int(args.rows), args.columns, tuple(args.types.split(',')),
+                        args.string_width, args.quoting, args.encoding, args.null_density, args.seed)
+    print(f"Wrote {int(args.rows)} rows ({size / (1024 * 1024):.1f} MB) to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Cleanup Module
+Vectorized per-batch cleanup before rows are written: numeric columns are
+downcast to the smallest dtype that holds their values, and text columns can
+be trimmed with their empty and placeholder values ("NA", "null", "-", ...)
+turned into real NULLs.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# Values stored as NULL when text values are normalized (compared after trimming)
+NULL_VALUES = ('', 'NA', 'N/A', 'n/a', 'na', 'null', 'NULL', 'Null', 'None', 'none', 'nan', 'NaN', '-', '--')
+
+
+def parse_null_values(normalize_values):
+    """
+    Placeholder values for the normalize_values option
+
+    Args:
+        normalize_values: True for NULL_VALUES, or a list (or comma separated
+                          string) of values to store as NULL in addition to ''
+
+    Returns:
+        list: Values to replace, or None if text values are not normalized
+    """
+    if not normalize_values:
+        return None
+    if normalize_values is True:
+        return list(NULL_VALUES)
+    if isinstance(normalize_values, str):
+        normalize_values = normalize_values.split(',')
+    return [''] + [str(value).strip() for value in normalize_values if str(value).strip()]
+
+
+def normalize_text(df, null_values):
+    """
+    Trim text columns and store placeholder values as NULL (modifies df in place)
+
+    Only columns holding nothing but strings are touched, so JSON text,
+    booleans or mixed columns keep their values.
+    """
+    for col in df.columns:
+        series = df[col]
+        if not (pd.api.types.is_string_dtype(series) or series.dtype == object):
+            continue
+        if pd.api.types.infer_dtype(series, skipna=True) != 'string':
+            continue
+        trimmed = series.str.strip()
+        df[col] = trimmed.mask(trimmed.isin(null_values))
+    return df
+
+
+def downcast_numbers(df):
+    """
+    Store each numeric column in the smallest dtype that keeps its values (modifies df in place)
+
+    Integers go down to int8/int16/int32 (nullable ones to Int8/...); floats
+    go to float32 only when every value survives the round trip unchanged.
+    """
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_bool_dtype(series):
+            continue
+        if pd.api.types.is_integer_dtype(series):
+            df[col] = pd.to_numeric(series, downcast='integer')
+        elif series.dtype == np.float64:
+            smaller = series.astype(np.float32)
+            if ((smaller.astype(series.dtype) == series) | series.isna()).all():
+                df[col] = smaller
+    return df
@@ -1,9 +1,163 @@
 import tkinter as tk
-from tkinter import filedialog, messagebox
-from converter import convert_csv_to_sqlite
+from tkinter import filedialog, messagebox, simpledialog
 import os
 import globals
 from theme_manager import ThemableWindow, get_app_theme_manager
+from profiling import get_app_profiler
+from events import get_app_event_bus, WINDOW_CLOSED
+from jobs import ConversionJob, get_app_job_queue
+
+class ConversionOptionsDialog(simpledialog.Dialog):
+    """Dialog for optional conversion settings (keys, indexes and storage)"""
+    
+    def __init__(self, parent, options=None, width=560, height=765):
+        self.options = dict(options or {})
+        self.width = width
+        self.height = height
+        self.result = None
+        super().__init__(parent, "Advanced Conversion Options")
+    
+    def body(self, master):
+        """Create dialog body"""
+        self.geometry(f"{self.width}x{self.height}")
+        self.resizable(True, True)
+        
+        main_frame = tk.Frame(master, padx=20, pady=20)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Primary key
+        tk.Label(main_frame, text="Primary key column(s), comma separated:",
+                 font=("Arial", 10)).pack(anchor=tk.W)
+        self.primary_key_entry = tk.Entry(main_frame, font=("Arial", 12), width=40)
+        self.primary_key_entry.pack(fill=tk.X, pady=(0, 5))
+        self.primary_key_entry.insert(0, self.options.get('primary_key') or "")
+        
+        self.without_rowid_var = tk.BooleanVar(value=self.options.get('without_rowid', False))
+        tk.Checkbutton(main_frame, text="Create as WITHOUT ROWID table (requires primary key)",
+                       variable=self.without_rowid_var,
+                       font=("Arial", 10)).pack(anchor=tk.W)
+        
+        self.delta_sync_var = tk.BooleanVar(value=self.options.get('delta_sync', False))
+        tk.Checkbutton(main_frame, text="Update an existing table in place, changed rows only (requires primary key)",
+                       variable=self.delta_sync_var,
+                       font=("Arial", 10)).pack(anchor=tk.W, pady=(0, 15))
+        
+        # Indexes
+        tk.Label(main_frame,
+                 text="Indexes to build after loading, separated by ';'\n"
+                      "Use commas for composite and 'unique:' for unique indexes,\n"
+                      "e.g.  city; last_name,first_name; unique:email",
+                 font=("Arial", 10), justify=tk.LEFT).pack(anchor=tk.W)
+        self.indexes_entry = tk.Entry(main_frame, font=("Arial", 12), width=40)
+        self.indexes_entry.pack(fill=tk.X, pady=(0, 5))
+        self.indexes_entry.insert(0, self.options.get('indexes') or "")
+        
+        self.sort_input_var = tk.BooleanVar(value=bool(self.options.get('sort_input', False)))
+        tk.Checkbutton(main_frame, text="Insert rows in primary key order (else first index order); sorts the input first",
+                       variable=self.sort_input_var,
+                       font=("Arial", 10)).pack(anchor=tk.W)
+        
+        # Storage
+        self.dictionary_encode_var = tk.BooleanVar(value=bool(self.options.get('dictionary_encode', False)))
+        tk.Checkbutton(main_frame, text="Move repeated text columns into lookup tables",
+                       variable=self.dictionary_encode_var,
+                       font=("Arial", 10)).pack(anchor=tk.W, pady=(15, 0))
+        
+        self.normalize_values_var = tk.BooleanVar(value=bool(self.options.get('normalize_values', False)))
+        tk.Checkbutton(main_frame, text="Trim text and store empty, NA, null and '-' values as NULL",
+                       variable=self.normalize_values_var,
+                       font=("Arial", 10)).pack(anchor=tk.W)
+        
+        dedup_frame = tk.Frame(main_frame)
+        dedup_frame.pack(anchor=tk.W)
+        self.deduplicate_var = tk.BooleanVar(value=bool(self.options.get('deduplicate', False)))
+        tk.Checkbutton(dedup_frame, text="Skip duplicate rows, compared on (blank = all columns):",
+                       variable=self.deduplicate_var,
+                       font=("Arial", 10)).pack(side=tk.LEFT)
+        self.dedup_columns_entry = tk.Entry(dedup_frame, font=("Arial", 10), width=12)
+        self.dedup_columns_entry.pack(side=tk.LEFT, padx=(5, 0))
+        dedup_columns = self.options.get('deduplicate')
+        self.dedup_columns_entry.insert(0, dedup_columns if isinstance(dedup_columns, str) else "")
+        
+        split_frame = tk.Frame(main_frame)
+        split_frame.pack(anchor=tk.W, pady=(2, 2))
+        tk.Label(split_frame, text="Columns per table (wider files are split, blank = SQLite's limit):",
+                 font=("Arial", 10)).pack(side=tk.LEFT)
+        self.split_columns_entry = tk.Entry(split_frame, font=("Arial", 10), width=6)
+        self.split_columns_entry.pack(side=tk.LEFT, padx=(5, 0))
+        self.split_columns_entry.insert(0, str(self.options.get('split_columns') or ""))
+        
+        partition_frame = tk.Frame(main_frame)
+        partition_frame.pack(anchor=tk.W, pady=(0, 2))
+        tk.Label(partition_frame, text="Partition into one table per value of column:",
+                 font=("Arial", 10)).pack(side=tk.LEFT)
+        self.partition_by_entry = tk.Entry(partition_frame, font=("Arial", 10), width=12)
+        self.partition_by_entry.pack(side=tk.LEFT, padx=(5, 5))
+        self.partition_by_entry.insert(0, self.options.get('partition_by') or "")
+        self.partition_period_var = tk.StringVar(value=self.options.get('partition_period') or 'value')
+        tk.OptionMenu(partition_frame, self.partition_period_var, 'value', 'year', 'month', 'day').pack(side=tk.LEFT)
+        
+        self.parse_dates_var = tk.BooleanVar(value=bool(self.options.get('parse_dates', False)))
+        tk.Checkbutton(main_frame, text="Detect date/time columns and store them as:",
+                       variable=self.parse_dates_var,
+                       font=("Arial", 10)).pack(anchor=tk.W)
+        
+        self.date_storage_var = tk.StringVar(value=self.options.get('date_storage', 'iso'))
+        date_frame = tk.Frame(main_frame)
+        date_frame.pack(anchor=tk.W, padx=(25, 0))
+        tk.Radiobutton(date_frame, text="ISO-8601 text", value='iso',
+                       variable=self.date_storage_var, font=("Arial", 10)).pack(side=tk.LEFT)
+        tk.Radiobutton(date_frame, text="Epoch seconds (integer)", value='epoch',
+                       variable=self.date_storage_var, font=("Arial", 10)).pack(side=tk.LEFT, padx=(10, 0))
+        
+        # Re-runs of an unchanged file are skipped unless a rebuild is forced
+        self.force_var = tk.BooleanVar(value=self.options.get('force', False))
+        tk.Checkbutton(main_frame, text="Rebuild even if the file has not changed since the last conversion",
+                       variable=self.force_var,
+                       font=("Arial", 10)).pack(anchor=tk.W, pady=(15, 0))
+        
+        self.reject_bad_rows_var = tk.BooleanVar(value=self.options.get('reject_bad_rows', False))
+        tk.Checkbutton(main_frame, text="Quarantine rows that cannot be loaded in <table>__rejects instead of failing",
+                       variable=self.reject_bad_rows_var,
+                       font=("Arial", 10)).pack(anchor=tk.W)
+        
+        self.in_memory_var = tk.BooleanVar(value=self.options.get('in_memory', False))
+        tk.Checkbutton(main_frame, text="Build the database in memory and write the file once (must fit in RAM)",
+                       variable=self.in_memory_var,
+                       font=("Arial", 10)).pack(anchor=tk.W)
+        
+        return self.primary_key_entry  # Initial focus
+    
+    def validate(self):
+        """Check the columns per table before the dialog closes"""
+        value = self.split_columns_entry.get().strip()
+        if value and not (value.isdigit() and int(value) > 0):
+            messagebox.showerror("Invalid Value", "Columns per table must be a positive whole number",
+                                 parent=self)
+            return False
+        return True
+    
+    def apply(self):
+        """Process the result"""
+        self.result = {
+            'primary_key': self.primary_key_entry.get().strip() or None,
+            'without_rowid': self.without_rowid_var.get(),
+            'delta_sync': self.delta_sync_var.get(),
+            'indexes': self.indexes_entry.get().strip() or None,
+            'sort_input': self.sort_input_var.get(),
+            'dictionary_encode': self.dictionary_encode_var.get(),
+            'normalize_values': self.normalize_values_var.get(),
+            'deduplicate': (self.dedup_columns_entry.get().strip() or True) if self.deduplicate_var.get() else None,
+            'split_columns': int(self.split_columns_entry.get().strip() or 0) or None,
+            'partition_by': self.partition_by_entry.get().strip() or None,
+            'partition_period': None if self.partition_period_var.get() == 'value' else self.partition_period_var.get(),
+            'parse_dates': self.parse_dates_var.get(),
+            'date_storage': self.date_storage_var.get(),
+            'force': self.force_var.get(),
+            'reject_bad_rows': self.reject_bad_rows_var.get(),
+            'in_memory': self.in_memory_var.get(),
+        }
+
 
 class SetupPathsWindow(ThemableWindow):
     """Window for setting up file paths and configurations with theme support"""
@@ -13,6 +167,9 @@ class SetupPathsWindow(ThemableWindow):
         ThemableWindow.__init__(self, get_app_theme_manager())
         
         self.parent = parent
+        self.profiler = get_app_profiler()
+        self.event_bus = get_app_event_bus()
+        self.job_queue = get_app_job_queue()
         
         # Get current theme
         self.current_theme = self.theme_manager.get_current_theme()
@@ -28,11 +185,19 @@ class SetupPathsWindow(ThemableWindow):
         self.window.grab_set()
         self.window.focus_set()
         
-        # Initialize variables
+        # Announce the close however the window goes away (buttons, window manager, parent)
+        self.window.bind('<Destroy>', self.on_destroy, add='+')
+        
+        # Settings of the next conversion job
+        self.csv_path = None
+        self.db_path = None
+        self.db_name = None
+        self.table_name = None
         self.csv_selected = False
         self.path_selected = False
         self.db_name_set = False
         self.table_name_set = False
+        self.conversion_options = {}
         
         try:
             self.setup_ui()
@@ -42,6 +207,13 @@ class SetupPathsWindow(ThemableWindow):
             messagebox.showerror("UI Setup Error", f"Failed to create interface: {str(e)}")
             self.window.destroy()
     
+    def on_destroy(self, event):
+        """Stop theming this window and tell subscribers it has closed"""
+        if event.widget is not self.window:
+            return
+        self.theme_manager.unregister_theme_callback(self.on_theme_changed)
+        self.event_bus.publish(WINDOW_CLOSED, window='conversion', source=self)
+    
     def on_theme_changed(self, new_theme):
         """Called when theme changes"""
         self.current_theme = new_theme
@@ -57,13 +229,13 @@ class SetupPathsWindow(ThemableWindow):
         self.create_theme_toggle_section()
         
         # Title
-        self.title_label = tk.Label(
+        self.title_label = self.themed(tk.Label(
             self.window, 
             text="Configure Data File, save location and database name",
             font=("Arial", 16, "bold"), 
             bg=self.current_theme['bg'], 
             fg=self.current_theme['title_color']
-        )
+        ))
         self.title_label.pack(pady=20)
         self.register_special_widget(self.title_label, 'title')
         
@@ -74,7 +246,7 @@ class SetupPathsWindow(ThemableWindow):
 
     def create_theme_toggle_section(self):
         """Create theme toggle button"""
-        theme_frame = tk.Frame(self.window, bg=self.current_theme['bg'])
+        theme_frame = self.themed(tk.Frame(self.window, bg=self.current_theme['bg']))
         theme_frame.pack(anchor='ne', padx=10, pady=5)
         
         self.theme_button = self.create_theme_toggle(theme_frame)
@@ -83,115 +255,115 @@ class SetupPathsWindow(ThemableWindow):
 
     def create_CSV_section(self):
         '''Create CSV file selection section'''
-        csv_frame = tk.Frame(self.window, bg=self.current_theme['bg'])
+        csv_frame = self.themed(tk.Frame(self.window, bg=self.current_theme['bg']))
         csv_frame.pack(pady=20, padx=20, fill='x')
         
-        file_section_label = tk.Label(
+        file_section_label = self.themed(tk.Label(
             csv_frame, 
-            text="1. Select CSV File",
+            text="1. Select Data File (CSV, TSV, JSON Lines, Parquet or fixed-width)",
             font=("Arial", 12, "bold"), 
             bg=self.current_theme['bg'], 
             fg=self.current_theme['text']
-        )
+        ))
         file_section_label.pack(anchor='w', pady=(0, 10))
         
-        self.file_button = tk.Button(
+        self.file_button = self.themed(tk.Button(
             csv_frame, 
             text="Browse for Data File",
-            command=self.select_file,
+            command=self.profiler.wrap('convert.select_file', self.select_file),
             font=("Arial", 12), 
             width=20, 
             height=2, 
             bg=self.current_theme['button_bg'],
             fg=self.current_theme['button_fg'],
             cursor='hand2'
-        )
+        ))
         self.file_button.pack(pady=5)
         
-        self.file_status_label = tk.Label(
+        self.file_status_label = self.themed(tk.Label(
             csv_frame, 
             text="No file selected",
             font=("Arial", 10), 
             bg=self.current_theme['bg'], 
             fg=self.current_theme['status_error']
-        )
+        ))
         self.file_status_label.pack(pady=5)
         self.register_special_widget(self.file_status_label, 'status_error')
     
     def create_dbname_section(self):
         """Create database name and table name input section"""
-        dbname_frame = tk.Frame(self.window, bg=self.current_theme['bg'])
+        dbname_frame = self.themed(tk.Frame(self.window, bg=self.current_theme['bg']))
         dbname_frame.pack(pady=20, padx=20, fill='x')
         
         # Database name section
-        db_section = tk.Frame(dbname_frame, bg=self.current_theme['bg'])
+        db_section = self.themed(tk.Frame(dbname_frame, bg=self.current_theme['bg']))
         db_section.pack(fill='x', pady=(0, 10))
         
-        dbname_label = tk.Label(
+        dbname_label = self.themed(tk.Label(
             db_section, 
             text="2. Database name:",
             font=("Arial", 12, "bold"), 
             bg=self.current_theme['bg'], 
             fg=self.current_theme['text']
-        )
+        ))
         dbname_label.pack(side='left', padx=(0, 10))
         
-        self.dbname_entry = tk.Entry(
+        self.dbname_entry = self.themed(tk.Entry(
             db_section, 
             font=("Arial", 12), 
             width=30,
             bg=self.current_theme['entry_bg'],
             fg=self.current_theme['entry_fg'],
             insertbackground=self.current_theme['text']
-        )
+        ))
         self.dbname_entry.pack(side='left', padx=(0, 10))
         self.dbname_entry.bind("<KeyRelease>", self.validate_db_name)
         self.dbname_entry.bind("<Return>", self.set_db_name)
         
         # Database name status
-        self.db_status_label = tk.Label(
+        self.db_status_label = self.themed(tk.Label(
             db_section,
             text="Enter database name",
             font=("Arial", 10),
             bg=self.current_theme['bg'],
             fg=self.current_theme['status_warning']
-        )
+        ))
         self.db_status_label.pack(side='left', padx=(10, 0))
         self.register_special_widget(self.db_status_label, 'status_warning')
         
         # Table name section
-        table_section = tk.Frame(dbname_frame, bg=self.current_theme['bg'])
+        table_section = self.themed(tk.Frame(dbname_frame, bg=self.current_theme['bg']))
         table_section.pack(fill='x')
         
-        tablename_label = tk.Label(
+        tablename_label = self.themed(tk.Label(
             table_section,
             text='3. Table name:',
             font=("Arial", 12, "bold"),
             bg=self.current_theme['bg'],
             fg=self.current_theme['text']
-        )
+        ))
         tablename_label.pack(side='left', padx=(0, 10))
         
-        self.tablename_entry = tk.Entry(
+        self.tablename_entry = self.themed(tk.Entry(
             table_section, 
             font=("Arial", 12), 
             width=30,
             bg=self.current_theme['entry_bg'],
             fg=self.current_theme['entry_fg'],
             insertbackground=self.current_theme['text']
-        )
+        ))
         self.tablename_entry.pack(side='left', padx=(0, 10))
         self.tablename_entry.bind("<KeyRelease>", self.validate_table_name)
         self.tablename_entry.bind("<Return>", self.set_table_name)
         
         # Table name status
-        self.table_status_label = tk.Label(
+        self.table_status_label = self.themed(tk.Label(
             table_section,
             text="Enter table name",
             font=("Arial", 10),
             bg=self.current_theme['bg'],
             fg=self.current_theme['status_warning']
-        )
+        ))
         self.table_status_label.pack(side='left', padx=(10, 0))
         self.register_special_widget(self.table_status_label, 'status_warning')
     
@@ -219,7 +391,7 @@ class SetupPathsWindow(ThemableWindow):
             )
             self.register_special_widget(self.db_status_label, 'status_good')
             self.db_name_set = True
-            globals.DB_NAME = db_name
+            self.db_name = db_name
         
         self.check_conversion_ready()
     
@@ -247,7 +419,7 @@ class SetupPathsWindow(ThemableWindow):
             )
             self.register_special_widget(self.table_status_label, 'status_good')
             self.table_name_set = True
-            globals.TABLE_NAME = table_name
+            self.table_name = table_name
         
         self.check_conversion_ready()
     
@@ -280,51 +452,51 @@ class SetupPathsWindow(ThemableWindow):
     
     def create_save_path_section(self):
         """Create save path selection section"""
-        path_frame = tk.Frame(self.window, bg=self.current_theme['bg'])
+        path_frame = self.themed(tk.Frame(self.window, bg=self.current_theme['bg']))
         path_frame.pack(pady=20, padx=20, fill='x')
         
-        path_section_label = tk.Label(
+        path_section_label = self.themed(tk.Label(
             path_frame, 
             text="4. Select Save Location",
             font=("Arial", 12, "bold"), 
             bg=self.current_theme['bg'], 
             fg=self.current_theme['text']
-        )
+        ))
         path_section_label.pack(anchor='w', pady=(0, 10))
         
-        self.path_button = tk.Button(
+        self.path_button = self.themed(tk.Button(
             path_frame, 
             text="Browse for Save Location",
-            command=self.select_save_path,
+            command=self.profiler.wrap('convert.select_save_path', self.select_save_path),
             font=("Arial", 12), 
             width=20, 
             height=2, 
             bg=self.current_theme['button_bg'],
             fg=self.current_theme['button_fg'],
             cursor='hand2'
-        )
+        ))
         self.path_button.pack(pady=5)
         
-        self.path_status_label = tk.Label(
+        self.path_status_label = self.themed(tk.Label(
             path_frame, 
             text="No save path selected",
             font=("Arial", 10), 
             bg=self.current_theme['bg'], 
             fg=self.current_theme['status_error']
-        )
+        ))
         self.path_status_label.pack(pady=5)
         self.register_special_widget(self.path_status_label, 'status_error')
 
     def create_control_buttons(self):
         """Create control buttons"""
-        button_frame = tk.Frame(self.window, bg=self.current_theme['bg'])
+        button_frame = self.themed(tk.Frame(self.window, bg=self.current_theme['bg']))
         button_frame.pack(pady=30)
         
         # Convert button
-        self.convert_button = tk.Button(
+        self.convert_button = self.themed(tk.Button(
             button_frame, 
-            text="Convert CSV to SQLite",
-            command=self.perform_conversion,
+            text="Queue Conversion",
+            command=self.profiler.wrap('convert.perform_conversion', self.perform_conversion),
             font=("Arial", 12, "bold"), 
             width=20, 
             height=2, 
@@ -332,12 +504,26 @@ class SetupPathsWindow(ThemableWindow):
             fg=self.current_theme['convert_fg'],
             cursor='hand2',
             state='disabled'  # Initially disabled
-        )
+        ))
         self.convert_button.pack(side='left', padx=10)
         self.register_special_widget(self.convert_button, 'convert')
         
+        # Advanced options (keys, indexes)
+        self.options_button = self.themed(tk.Button(
+            button_frame, 
+            text="Advanced Options",
+            command=self.profiler.wrap('convert.edit_conversion_options', self.edit_conversion_options),
+            font=("Arial", 12), 
+            width=15, 
+            height=2, 
+            bg=self.current_theme['button_bg'],
+            fg=self.current_theme['button_fg'],
+            cursor='hand2'
+        ))
+        self.options_button.pack(side='left', padx=10)
+        
         # Done button (close window)
-        self.done_button = tk.Button(
+        self.done_button = self.themed(tk.Button(
             button_frame, 
             text="Close",
             command=self.close_setup,
@@ -347,11 +533,11 @@ class SetupPathsWindow(ThemableWindow):
             bg=self.current_theme['button_bg'],
             fg=self.current_theme['button_fg'],
             cursor='hand2'
-        )
+        ))
         self.done_button.pack(side='left', padx=10)
         
         # Cancel button
-        self.cancel_button = tk.Button(
+        self.cancel_button = self.themed(tk.Button(
             button_frame, 
             text="Cancel",
             command=self.cancel_operation,
@@ -361,9 +547,20 @@ class SetupPathsWindow(ThemableWindow):
             bg=self.current_theme['exit_bg'],
             fg=self.current_theme['exit_fg'],
             cursor='hand2'
-        )
+        ))
         self.cancel_button.pack(side='left', padx=10)
         self.register_special_widget(self.cancel_button, 'exit')
+        
+        # Confirms queued jobs; they keep running after this window is closed
+        self.queue_status_label = self.themed(tk.Label(
+            self.window,
+            text="Conversions run in the background. Queue as many files as you like.",
+            font=("Arial", 10),
+            bg=self.current_theme['bg'],
+            fg=self.current_theme['status_info']
+        ))
+        self.queue_status_label.pack(pady=(0, 10))
+        self.register_special_widget(self.queue_status_label, 'status_info')
     
     def check_conversion_ready(self):
         """Check if all requirements are met for conversion"""
@@ -387,63 +584,53 @@ class SetupPathsWindow(ThemableWindow):
         
         return ready
     
+    def edit_conversion_options(self):
+        """Open the advanced options dialog and keep the chosen settings"""
+        dialog = ConversionOptionsDialog(self.window, self.conversion_options)
+        if dialog.result is not None:
+            self.conversion_options = dialog.result
+    
     def perform_conversion(self):
-        """Perform the CSV to SQLite conversion"""
+        """Queue a conversion job with the current settings; it runs in the background"""
         if not self.check_conversion_ready():
             messagebox.showerror("Conversion Error", 
                                "Please ensure all fields are properly filled:\n"
-                               "- CSV file selected\n"
+                               "- Data file selected\n"
                                "- Valid database name\n"
                                "- Valid table name\n"
                                "- Save location selected")
             return
         
         try:
-            # Disable button during conversion
-            self.convert_button.config(
-                state='disabled', 
-                text='Converting...',
-                bg=self.current_theme['disabled_bg'],
-                fg=self.current_theme['disabled_fg']
-            )
-            self.window.update()
+            job = ConversionJob(self.csv_path, self.db_name, self.db_path, self.table_name,
+                                self.conversion_options)
+            self.job_queue.submit(job)
             
-            # Perform conversion
-            success = convert_csv_to_sqlite(
-                csv_file=globals.CSV_PATH,
-                db_file=globals.DB_NAME,
-                db_path=globals.DB_PATH,
-                table_name=globals.TABLE_NAME
-            )
+            # The database tools open the latest conversion target
+            globals.ACTIVE_DATABASE = job.database
             
-            if success:
-                # Optionally close window after successful conversion
-                response = messagebox.askyesno("Conversion Complete", 
-                                             "Conversion completed successfully!\n\n"
-                                             "Would you like to close this window?")
-                if response:
-                    self.close_setup()
+            self.queue_status_label.config(
+                text=f"✓ Queued job {job.describe()}. You can queue more files or close this window.",
+                fg=self.current_theme['status_good']
+            )
+            self.register_special_widget(self.queue_status_label, 'status_good')
             
         except Exception as e:
-            messagebox.showerror("Conversion Error", f"An error occurred during conversion:\n{str(e)}")
-        
-        finally:
-            # Re-enable button
-            self.convert_button.config(
-                state='normal', 
-                text='Convert CSV to SQLite',
-                bg=self.current_theme['convert_bg'],
-                fg=self.current_theme['convert_fg']
-            )
+            messagebox.showerror("Conversion Error", f"Could not queue the conversion:\n{str(e)}")
 
     def select_file(self):
         """Handle file selection with error handling"""
         try:
             filename = filedialog.askopenfilename(
-                title="Select CSV Data File",
+                title="Select Data File",
                 filetypes=[
+                    ("All data files", "*.csv *.txt *.tsv *.tab *.jsonl *.ndjson *.parquet *.pq *.fwf *.dat"),
                     ("CSV files", "*.csv"),
-                    ("Text files", "*.txt"),
+                    ("Text files", "*.txt *.dat"),
+                    ("TSV files", "*.tsv *.tab"),
+                    ("JSON Lines files", "*.jsonl *.ndjson"),
+                    ("Parquet files", "*.parquet *.pq"),
+                    ("Fixed-width files", "*.fwf"),
                     ("All files", "*.*")
                 ],
                 initialdir=os.path.expanduser("~")
@@ -468,8 +655,7 @@ class SetupPathsWindow(ThemableWindow):
                     if not response:
                         return
                 
-                # Set global variables
-                globals.CSV_PATH = filename
+                self.csv_path = filename
                 self.csv_selected = True
                 
                 # Update UI
@@ -508,8 +694,7 @@ class SetupPathsWindow(ThemableWindow):
                                        "Cannot write to the selected directory. Please choose another location.")
                     return
                 
-                # Set global variables
-                globals.DB_PATH = savepath
+                self.db_path = savepath
                 self.path_selected = True
                 
                 # Update UI
@@ -534,29 +719,13 @@ class SetupPathsWindow(ThemableWindow):
                                     "Are you sure you want to cancel?\n"
                                     "All current settings will be lost.")
         if response:
-            # Call the parent's cleanup if it exists
-            if hasattr(self.parent, 'conversion_window') and self.parent.conversion_window == self:
-                self.parent.conversion_window = None
-            
-            # Unregister from theme callbacks before destroying
-            try:
-                self.theme_manager.unregister_theme_callback(self.on_theme_changed)
-            except:
-                pass
+            # Cleanup and the close event run from on_destroy
             self.window.destroy()
 
     def close_setup(self):
         """Close the setup window"""
         try:
-            # Call the parent's cleanup if it exists
-            if hasattr(self.parent, 'conversion_window') and self.parent.conversion_window == self:
-                self.parent.conversion_window = None
-            
-            # Unregister from theme callbacks before destroying
-            try:
-                self.theme_manager.unregister_theme_callback(self.on_theme_changed)
-            except:
-                pass
+            # Cleanup and the close event run from on_destroy
             self.window.destroy()
         except Exception as e:
             print(f"Error closing window: {e}")
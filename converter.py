@@ -5,34 +5,311 @@ from tkinter import messagebox
 import os
 from pathlib import Path
 import logging
+import re
+from indexes import parse_index_spec, parse_key_columns, build_indexes
+from dictionary_encoding import (DictionaryEncoder, detect_low_cardinality_columns,
+                                 lookup_table_name, view_name)
+from date_parsing import DateConverter, detect_date_columns
+from fingerprint import compute_fingerprint, is_up_to_date, store_fingerprint, forget_fingerprint
+from delta_sync import can_sync, diff_rows, apply_delta, write_row_hashes, drop_row_hashes
+from metrics import ConversionMetrics, format_metrics
+from readers import get_reader, detect_format, ColumnCoercer
+from pipeline import run_pipeline, BatchSizer
+from rejects import RejectLog, create_rejects_table, drop_rejects_table, rejects_table_name
+from cleanup import parse_null_values, normalize_text, downcast_numbers
+from writer import insert_batch
+from sql_util import quote
+from memory_db import open_memory_copy, persist_database
+from wide_tables import TableSplitter, column_limit, drop_column_groups
+from partitions import Partitioner, create_union_view, drop_partitions
+from dedup import DuplicateFilter, parse_dedup_columns
+from external_sort import ExternalSorter, parse_sort_columns
 
-def convert_csv_to_sqlite(csv_file, db_file, db_path, table_name):
+
+# SQLite column type per pandas dtype; anything else is stored as TEXT
+DTYPE_MAP = {
+    'int8': 'INTEGER',
+    'int16': 'INTEGER', 
+    'int32': 'INTEGER',
+    'int64': 'INTEGER',
+    'Int8': 'INTEGER',
+    'Int16': 'INTEGER',
+    'Int32': 'INTEGER',
+    'Int64': 'INTEGER',
+    'uint8': 'INTEGER',
+    'uint16': 'INTEGER',
+    'uint32': 'INTEGER', 
+    'uint64': 'INTEGER',
+    'float16': 'REAL',
+    'float32': 'REAL',
+    'float64': 'REAL',
+    'object': 'TEXT',
+    'string': 'TEXT',
+    'bool': 'INTEGER',
+    'boolean': 'INTEGER',
+    'datetime64[ns]': 'TEXT',
+    'timedelta64[ns]': 'TEXT',
+    'category': 'TEXT'
+}
+
+
+def clean_column_name(name):
+    """Clean a single column name the same way CSV headers are cleaned"""
+    return re.sub('[^a-zA-Z0-9_]', '_', str(name)).strip()
+
+
+def sanitize_columns(df):
+    """Clean column names (remove special characters that might cause SQL issues) and make them unique"""
+    df.columns = df.columns.astype(str).str.replace('[^a-zA-Z0-9_]', '_', regex=True)
+    df.columns = df.columns.str.strip()
+    
+    # Handle duplicate column names
+    if df.columns.duplicated().any():
+        df.columns = pd.io.common.dedup_names(df.columns, is_potential_multiindex=False)
+    return df
+
+
+class BatchTransformer:
+    """
+    Cleans, types, date-normalizes, dictionary-encodes and downcasts batches for one conversion
+    
+    Column types, date columns and encoded columns are chosen on the first
+    batch (or the whole DataFrame) and applied to every later batch, so all
+    batches arrive at the writer with the same columns and types.
+    """
+    
+    def __init__(self, key_columns, parse_dates=False, date_storage='iso', dictionary_encode=False,
+                 reject=None, normalize_values=False, downcast=True, dedup=None):
+        self.key_columns = key_columns
+        self.parse_dates = parse_dates
+        self.date_storage = date_storage
+        self.dictionary_encode = dictionary_encode
+        self.null_values = parse_null_values(normalize_values)
+        self.downcast = downcast
+        # Optional dedup.DuplicateFilter; rows are compared once typed, before encoding and downcasting
+        self.dedup = dedup
+        # Optional callback(rows, reasons) for rows whose values do not fit their column type
+        self.coercer = ColumnCoercer(reject)
+        self.date_converter = None
+        self.encoder = None
+        self.columns = None
+        # Optional callback(encoder), called before the first batch is encoded
+        self.seed_lookups = None
+    
+    def configure(self, df):
+        """Check the key columns and pick date and dictionary-encoded columns from the first batch"""
+        self.columns = list(df.columns)
+        
+        missing = [col for col in self.key_columns if col not in df.columns]
+        if missing:
+            raise ValueError(f"Primary key column(s) not found in input: {', '.join(missing)}")
+        
+        # Normalize date/time columns so they can be range-scanned through an index
+        if self.parse_dates:
+            if self.parse_dates is True:
+                date_columns = detect_date_columns(df)
+            else:
+                parse_dates = self.parse_dates
+                if isinstance(parse_dates, str):
+                    parse_dates = parse_dates.split(',')
+                date_columns = [clean_column_name(col) for col in parse_dates if str(col).strip()]
+                missing = [col for col in date_columns if col not in df.columns]
+                if missing:
+                    raise ValueError(f"Date columns not found in input: {', '.join(missing)}")
+            if date_columns:
+                self.date_converter = DateConverter(date_columns, self.date_storage)
+        
+        # Dictionary-encode repeated text columns into lookup tables
+        if self.dictionary_encode:
+            if self.dictionary_encode is True:
+                encode_columns = detect_low_cardinality_columns(
+                    df, exclude=self.key_columns + (self.date_converter.columns if self.date_converter else []))
+            else:
+                dictionary_encode = self.dictionary_encode
+                if isinstance(dictionary_encode, str):
+                    dictionary_encode = dictionary_encode.split(',')
+                encode_columns = [clean_column_name(col) for col in dictionary_encode if str(col).strip()]
+                missing = [col for col in encode_columns if col not in df.columns]
+                if missing:
+                    raise ValueError(f"Columns to encode not found in input: {', '.join(missing)}")
+                if set(encode_columns) & set(self.key_columns):
+                    raise ValueError("Primary key columns cannot be dictionary-encoded")
+            if encode_columns:
+                self.encoder = DictionaryEncoder(encode_columns)
+                if self.seed_lookups:
+                    self.seed_lookups(self.encoder)
+    
+    def transform(self, df):
+        """Clean, coerce, date-normalize, deduplicate, encode and downcast one batch"""
+        df = sanitize_columns(df)
+        if self.null_values:
+            # Before typing, so a numeric column with '-' placeholders stays numeric
+            df = normalize_text(df, self.null_values)
+        df = self.coercer.coerce(df)
+        if self.columns is None:
+            self.configure(df)
+        if self.date_converter:
+            df = self.date_converter.convert(df)
+        if self.dedup:
+            df = self.dedup.filter(df)
+        if self.encoder:
+            df = self.encoder.encode(df)
+        if self.downcast:
+            df = downcast_numbers(df)
+        return df
+    
+    def log_summary(self):
+        """Log values that kept their original form (type mismatches, unparsed dates)"""
+        self.coercer.log_summary()
+        if self.date_converter:
+            self.date_converter.log_summary()
+
+
+def create_table(conn, table_name, df, key_columns, without_rowid=False, date_converter=None, encoder=None):
+    """
+    Replace the target table with an empty one whose columns match a transformed batch
+    
+    The fingerprint of the old table goes first, so a failed rebuild is never
+    reported as up to date.
+    """
+    # Create table schema with proper types
+    columns = []
+    for col, dtype in df.dtypes.items():
+        sqlite_type = DTYPE_MAP.get(str(dtype), 'TEXT')
+        if date_converter and col in date_converter.columns:
+            # Keep the declared type even when some values could not be parsed
+            sqlite_type = date_converter.sqlite_type
+        if encoder and col in encoder.lookups:
+            sqlite_type += f' REFERENCES "{lookup_table_name(table_name, col)}"(id)'
+        columns.append(f'{quote(col)} {sqlite_type}')
+    
+    # Declare the primary key from the chosen key column(s)
+    if key_columns:
+        key_sql = ", ".join(quote(col) for col in key_columns)
+        columns.append(f'PRIMARY KEY ({key_sql})')
+    
+    # Create table
+    create_sql = f'CREATE TABLE IF NOT EXISTS "{table_name}" ({", ".join(columns)})'
+    if without_rowid:
+        create_sql += ' WITHOUT ROWID'
+    
+    cursor = conn.cursor()
+    try:
+        # Drop existing table (and the lookup view of a previous run) if they exist
+        forget_fingerprint(conn, table_name)
+        cursor.execute(f'DROP VIEW IF EXISTS "{view_name(table_name)}"')
+        cursor.execute(f'DROP TABLE IF EXISTS "{table_name}"')
+        cursor.execute(create_sql)
+        conn.commit()
+    except sqlite3.Error as e:
+        raise sqlite3.Error(f"Error creating table: {e}")
+    finally:
+        cursor.close()
+
+
+def run_conversion(csv_file, db_file, db_path, table_name, indexes=None,
+                   primary_key=None, without_rowid=False, dictionary_encode=False,
+                   parse_dates=False, date_storage='iso', force=False,
+                   delta_sync=False, reject_bad_rows=False, normalize_values=False,
+                   split_columns=None, partition_by=None, partition_period=None,
+                   deduplicate=None, duplicates='skip', sort_input=None, input_format=None, reader_options=None,
+                   batch_rows=None, memory_budget_mb=None, in_memory=False, progress_callback=None,
+                   metrics_callback=None, metrics_log=None):
     """
-    Convert CSV data to SQLite database
+    Convert CSV (or TSV, JSON Lines, Parquet, fixed-width) data to SQLite database
+    without any user interaction
+    
+    Errors are raised (FileNotFoundError, PermissionError, ValueError,
+    sqlite3.Error, ...) instead of being shown, so this can run headless.
     
     Args:
-        csv_file (str): Path to the CSV file
+        csv_file (str): Path to the input file
         db_file (str): Name of the SQLite database file (with .db extension)
         db_path (str): Directory path where the database should be created
         table_name (str): Name of the table to create in the database
+        indexes: Optional index specification (see indexes.parse_index_spec),
+                 built after the bulk insert has finished
+        primary_key: Optional key column name, or list of names for a composite key
+        without_rowid (bool): Create the table as WITHOUT ROWID (requires primary_key)
+        dictionary_encode: True to detect low-cardinality text columns automatically,
+                           or a list of column names to move into lookup tables
+        parse_dates: True to detect date/time columns automatically, or a list of column names
+        date_storage (str): 'iso' for ISO-8601 TEXT or 'epoch' for INTEGER seconds since 1970 (UTC)
+        force (bool): Rebuild the table even if the source and options are unchanged
+        delta_sync (bool): Apply only inserted, changed and deleted rows (by primary_key)
+                           to an existing table instead of rebuilding it
+        reject_bad_rows (bool): Store unparseable rows and rows with values of the wrong
+                                type in <table>__rejects instead of failing (see rejects.py)
+        normalize_values: True to trim text values and store empty and placeholder values
+                          ('NA', 'null', '-', ...) as NULL, or a list of placeholder values
+        split_columns (int): Store at most this many columns per table, splitting the rest
+                             into <table>__part2, ... joined by the <table>_full view (see
+                             wide_tables.py); if None only inputs wider than SQLite's
+                             column limit are split
+        partition_by (str): Route rows into <table>__p_<value> tables by this column and
+                            make <table> a UNION ALL view over them (see partitions.py)
+        partition_period (str): Partition by the 'year', 'month' or 'day' of the
+                                partition_by date column instead of by its value
+        deduplicate: True to find rows that repeat an earlier row, or column name(s) to
+                     find repeated values of those columns (see dedup.py)
+        duplicates (str): 'skip' to load only the first occurrence, 'count' to load
+                          every row and only report how many were duplicates
+        sort_input: True to insert rows in primary key order (without a key, in the
+                    order of the first index), or column name(s) to sort by; the input
+                    is sorted with bounded memory first (see external_sort.py)
+        input_format (str): Input format (see readers.INPUT_FORMATS); detected from
+                            the file extension if None, CSV if unrecognized
+        reader_options (dict): Options for the reader, e.g. {'sep': ';'} or
+                               {'widths': [10, 8, 12]} for fixed-width files
+        batch_rows (int): Fixed rows per batch of the read -> transform -> write pipeline;
+                          if None the size adapts to memory_budget_mb
+        memory_budget_mb (float): Memory for the batches in the pipeline; defaults to
+                                  CSVSQL_MEMORY_BUDGET_MB or 512 (see pipeline.BatchSizer)
+        in_memory (bool): Convert into an in-memory copy of the database and write the
+                          file once at the end with the backup API (see memory_db.py);
+                          the whole database must fit in RAM
+        progress_callback (callable): Optional callback(stage, done, total, detail);
+                                      'write' reports rows inserted so far (total None),
+                                      'sort' rows collected for sorting (total None),
+                                      'persist' pages copied of the in-memory database
+        metrics_callback (callable): Optional callback(event) receiving 'stage_start' and
+                                     'stage_end' events (see metrics.ConversionMetrics)
+        metrics_log (str): Optional JSON Lines file; one entry with all stage
+                           measurements is appended per run
     
     Returns:
-        bool: True if successful, False otherwise
+        dict: Run summary; 'status' is 'converted', 'synced' or 'up_to_date', and
+              'metrics' holds per-stage timings, rows/bytes and memory high-water marks
     """
     conn = None
     cursor = None
+    dedup = None
+    sorter = None
+    metrics = ConversionMetrics([metrics_callback] if metrics_callback else [])
+    
+    def finish(summary):
+        """Attach the stage measurements to the summary and log them"""
+        metrics.finish()
+        summary['metrics'] = metrics.as_dict()
+        if metrics_log:
+            metrics.write_log(metrics_log, {'source': csv_file, 'database': summary['database'],
+                                            'table': table_name, 'status': summary['status']})
+        return summary
     
     try:
         # Validate inputs
         if not csv_file or not db_file or not db_path or not table_name:
             raise ValueError("All parameters (csv_file, db_file, db_path, table_name) must be provided")
         
-        # Check if CSV file exists and is readable
+        # Check if the input file exists and is readable
         if not os.path.exists(csv_file):
-            raise FileNotFoundError(f"CSV file not found: {csv_file}")
+            raise FileNotFoundError(f"Input file not found: {csv_file}")
         
         if not os.access(csv_file, os.R_OK):
-            raise PermissionError(f"Cannot read CSV file: {csv_file}")
+            raise PermissionError(f"Cannot read input file: {csv_file}")
+        
+        # Fails early on an unknown format; nothing is read yet
+        reader = get_reader(csv_file, input_format, **(reader_options or {}))
         
         # Validate table name (basic SQL injection prevention)
         if not table_name.replace('_', '').replace('-', '').isalnum():
@@ -51,138 +328,410 @@ def convert_csv_to_sqlite(csv_file, db_file, db_path, table_name):
         if not db_file.lower().endswith('.db'):
             full_db_path += '.db'
         
-        # Read CSV with error handling
-        try:
-            df = pd.read_csv(csv_file)
-        except pd.errors.EmptyDataError:
-            raise ValueError("CSV file is empty")
-        except pd.errors.ParserError as e:
-            raise ValueError(f"Error parsing CSV file: {e}")
-        except UnicodeDecodeError:
-            # Try different encodings
-            encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-            df = None
-            for encoding in encodings:
-                try:
-                    df = pd.read_csv(csv_file, encoding=encoding)
-                    break
-                except UnicodeDecodeError:
-                    continue
-            if df is None:
-                raise ValueError("Unable to decode CSV file with common encodings")
-        
-        # Check if DataFrame is empty
-        if df.empty:
-            raise ValueError("CSV file contains no data")
-        
-        # Clean column names (remove special characters that might cause SQL issues)
-        df.columns = df.columns.str.replace('[^a-zA-Z0-9_]', '_', regex=True)
-        df.columns = df.columns.str.strip()
-        
-        # Handle duplicate column names
-        if df.columns.duplicated().any():
-            df.columns = pd.io.common.dedup_names(df.columns, is_potential_multiindex=False)
+        # Skip the whole conversion when this exact source was already converted
+        # with the same options (size, mtime, sampled content hash and options must match)
+        conversion_options = {
+            'table_name': table_name,
+            'indexes': indexes,
+            'primary_key': primary_key,
+            'without_rowid': without_rowid,
+            'dictionary_encode': dictionary_encode,
+            'parse_dates': parse_dates,
+            'date_storage': date_storage,
+            'delta_sync': delta_sync,
+            'reject_bad_rows': reject_bad_rows,
+            'normalize_values': normalize_values,
+            'split_columns': split_columns,
+            'partition_by': partition_by,
+            'partition_period': partition_period,
+            'deduplicate': deduplicate,
+            'duplicates': duplicates,
+            'sort_input': sort_input,
+            'input_format': input_format,
+            'reader_options': reader_options,
+        }
+        with metrics.stage('fingerprint') as stage:
+            fingerprint = compute_fingerprint(csv_file, conversion_options)
+            up_to_date = not force and is_up_to_date(full_db_path, table_name, fingerprint)
+            stage.bytes = fingerprint['size']
+        
+        if up_to_date:
+            logging.info(f"{csv_file} is unchanged since the last conversion into {table_name}, skipping")
+            return finish({'status': 'up_to_date', 'database': full_db_path, 'table': table_name})
+        
+        # Parse key and index specifications up front so bad input fails before any work
+        index_specs = parse_index_spec(indexes)
+        for index in index_specs:
+            index['columns'] = [clean_column_name(col) for col in index['columns']]
+        key_columns = [clean_column_name(col) for col in parse_key_columns(primary_key)]
+        
+        if without_rowid and not key_columns:
+            raise ValueError("A WITHOUT ROWID table requires a primary key column")
+        
+        if delta_sync and not key_columns:
+            raise ValueError("Delta sync requires a primary key to match rows")
+        
+        if delta_sync and reject_bad_rows:
+            # A rejected row would look deleted from the snapshot
+            raise ValueError("Rejecting bad rows is not supported with delta sync")
+        
+        # Split tables are linked by rowid and written by the full rebuild only
+        splitter = TableSplitter(table_name, split_columns)
+        if split_columns and (delta_sync or dictionary_encode or without_rowid):
+            raise ValueError("Splitting tables is not supported with delta sync, "
+                             "lookup tables or WITHOUT ROWID tables")
+        
+        # Partitions are written by the full rebuild; <table> becomes a view over them
+        partitioner = None
+        if partition_period and not partition_by:
+            raise ValueError("A partition period needs a partition column")
+        if partition_by:
+            if delta_sync or dictionary_encode or split_columns:
+                raise ValueError("Partitioning is not supported with delta sync, lookup tables "
+                                 "or split tables")
+            partitioner = Partitioner(table_name, clean_column_name(partition_by), partition_period)
+        
+        reject_log = None
+        if reject_bad_rows:
+            reject_log = RejectLog()
+            reader.skip_bad_lines(reject_log.add_bad_line)
+        
+        dedup_columns = parse_dedup_columns(deduplicate)
+        if dedup_columns is not None:
+            dedup = DuplicateFilter([clean_column_name(col) for col in dedup_columns], duplicates,
+                                    memory_budget_mb)
+        
+        # Delta sync writes only the changed rows; their order does not matter
+        sort_columns = parse_sort_columns(sort_input, key_columns, index_specs)
+        if sort_columns is not None:
+            if delta_sync:
+                raise ValueError("Sorting the input is not supported with delta sync")
+            sorter = ExternalSorter([clean_column_name(col) for col in sort_columns], memory_budget_mb)
+        
+        # Delta sync keeps full-width dtypes: row hashes depend on them
+        transformer = BatchTransformer(key_columns, parse_dates, date_storage, dictionary_encode,
+                                       reject_log.add_rows if reject_log else None,
+                                       normalize_values, downcast=not delta_sync, dedup=dedup)
         
         # Connect to SQLite database
         try:
-            conn = sqlite3.connect(full_db_path)
+            conn = open_memory_copy(full_db_path) if in_memory else sqlite3.connect(full_db_path)
             cursor = conn.cursor()
         except sqlite3.Error as e:
             raise sqlite3.Error(f"Cannot connect to database: {e}")
         
-        # Enhanced data type mapping
-        dtype_map = {
-            'int8': 'INTEGER',
-            'int16': 'INTEGER', 
-            'int32': 'INTEGER',
-            'int64': 'INTEGER',
-            'uint8': 'INTEGER',
-            'uint16': 'INTEGER',
-            'uint32': 'INTEGER', 
-            'uint64': 'INTEGER',
-            'float16': 'REAL',
-            'float32': 'REAL',
-            'float64': 'REAL',
-            'object': 'TEXT',
-            'string': 'TEXT',
-            'bool': 'INTEGER',
-            'datetime64[ns]': 'TEXT',
-            'timedelta64[ns]': 'TEXT',
-            'category': 'TEXT'
-        }
+        def persist():
+            """Write the in-memory database to the target file (in_memory mode only)"""
+            if not in_memory:
+                return
+            
+            def on_persist_progress(done, total):
+                if progress_callback:
+                    progress_callback('persist', done, total, None)
+            
+            with metrics.stage('persist') as stage:
+                stage.bytes = persist_database(conn, full_db_path, on_persist_progress)
         
-        # Create table schema with proper types
-        columns = []
-        for col, dtype in df.dtypes.items():
-            # Clean column name for SQL
-            safe_col = str(col).replace('"', '""')  # Escape quotes
-            sqlite_type = dtype_map.get(str(dtype), 'TEXT')
-            columns.append(f'"{safe_col}" {sqlite_type}')
+        # Delta sync diffs the whole file against the stored row hashes, so it
+        # reads everything at once; full rebuilds stream through the pipeline
+        df = None
+        if delta_sync:
+            with metrics.stage('read') as stage:
+                # The reader raises ValueError for empty, unparseable or undecodable input
+                df = reader.read_all()
+                stage.rows = len(df)
+                stage.bytes = os.path.getsize(csv_file)
+            
+            with metrics.stage('transform') as stage:
+                # Reuse the stored codes so unchanged rows hash the same as before
+                transformer.seed_lookups = lambda encoder: encoder.load_lookup_tables(conn, table_name)
+                df = transformer.transform(df)
+                transformer.log_summary()
+                stage.rows = len(df)
         
-        # Create table
-        create_sql = f'CREATE TABLE IF NOT EXISTS "{table_name}" ({", ".join(columns)})'
+        encoder = transformer.encoder
         
-        try:
-            # Drop existing table if it exists
-            cursor.execute(f'DROP TABLE IF EXISTS "{table_name}"')
-            cursor.execute(create_sql)
+        # Update an existing table in place when only a few rows changed
+        if df is not None and can_sync(conn, table_name, list(df.columns), key_columns):
+            with metrics.stage('delta_diff') as stage:
+                inserts, updates, deletes, new_hashes = diff_rows(conn, table_name, df, key_columns)
+                stage.rows = len(df)
+            
+            with metrics.stage('delta_apply') as stage:
+                changes = apply_delta(conn, table_name, key_columns, inserts, updates, deletes, new_hashes)
+                stage.rows = sum(changes.values())
+            
+            with metrics.stage('verify'):
+                cursor.execute(f'SELECT COUNT(*) FROM "{table_name}"')
+                row_count = cursor.fetchone()[0]
+                if row_count != len(df):
+                    raise Exception(f"Data verification failed: Expected {len(df)} rows, found {row_count}")
+            
+            if encoder:
+                with metrics.stage('lookups'):
+                    encoder.write_lookup_tables(conn, table_name)
+                    encoder.create_view(conn, table_name, list(df.columns))
+            
+            with metrics.stage('index'):
+                build_indexes(conn, table_name, index_specs)
+            store_fingerprint(conn, table_name, fingerprint)
             conn.commit()
-        except sqlite3.Error as e:
-            raise sqlite3.Error(f"Error creating table: {e}")
+            persist()
+            
+            return finish({
+                'status': 'synced',
+                'database': full_db_path,
+                'table': table_name,
+                'rows': row_count,
+                'columns': len(df.columns),
+                'changes': changes,
+                'duplicates': dedup.duplicates if dedup else None,
+            })
         
-        # Insert data using pandas to_sql for better handling
-        try:
-            df.to_sql(table_name, conn, if_exists='replace', index=False, method='multi')
+        # Full rebuild: reading, transforming and inserting overlap (see pipeline.py).
+        # The table is replaced when the first transformed batch arrives.
+        rows_written = 0
+        table_created = False
+        
+        if reject_log:
+            create_rejects_table(conn, table_name)
+        else:
+            drop_rejects_table(conn, table_name)
+        drop_column_groups(conn, table_name)
+        conn.commit()
+        
+        def create_tables(batch):
+            """Create the table, or one table per column group if it has to be split"""
+            if not splitter.plan(list(batch.columns), key_columns, column_limit(conn)):
+                create_table(conn, table_name, batch, key_columns, without_rowid,
+                             transformer.date_converter, transformer.encoder)
+                return
+            if delta_sync or dictionary_encode or without_rowid:
+                raise ValueError(f"The input has {len(batch.columns)} columns, more than SQLite allows "
+                                 f"in one table; split tables do not support delta sync, "
+                                 f"lookup tables or WITHOUT ROWID tables")
+            for position, (part_table, columns) in enumerate(splitter.tables()):
+                create_table(conn, part_table, batch[columns], key_columns if position == 0 else [],
+                             date_converter=transformer.date_converter)
+            splitter.use_rowid_key(conn)
+        
+        def write(batch):
+            nonlocal rows_written, table_created
+            if not table_created:
+                # Replace the previous result, partitioned or not; partitions are created as rows arrive
+                drop_partitions(conn, table_name, drop_table=partitioner is not None)
+                # Lookup tables of the previous run, even for columns no longer encoded
+                DictionaryEncoder.drop_tables(conn, table_name)
+                if partitioner:
+                    forget_fingerprint(conn, table_name)
+                    conn.commit()
+                else:
+                    create_tables(batch)
+                table_created = True
+            if reject_log:
+                reject_log.write(conn, table_name)
+            if batch.empty:
+                # Every row of the batch was rejected
+                return
+            try:
+                if partitioner:
+                    for part_table, part, new in partitioner.split(batch):
+                        if new:
+                            create_table(conn, part_table, part, key_columns, without_rowid,
+                                         transformer.date_converter)
+                        insert_batch(conn, part_table, part)
+                elif splitter.split:
+                    splitter.insert(conn, batch, insert_batch)
+                else:
+                    insert_batch(conn, table_name, batch)
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                raise Exception(f"Error inserting data: {e}")
+            rows_written += len(batch)
+            if progress_callback:
+                progress_callback('write', rows_written, None, None)
+        
+        # Without a fixed size, batches are sized to the memory budget from the rows read so far.
+        # Each batch is committed on its own, so this is also the commit interval.
+        sizer = None if batch_rows else BatchSizer(memory_budget_mb)
+        
+        def numbered(batches):
+            """Number rows across batches so rejects can report their position"""
+            start = 0
+            for batch in batches:
+                if len(batch):
+                    if sizer:
+                        sizer.observe(batch)
+                    batch.index = pd.RangeIndex(start, start + len(batch))
+                    start += len(batch)
+                    yield batch
+        
+        if df is not None:
+            # Delta sync found no table to update; the transformed data is already in memory
+            source, transform = [df], (lambda batch: batch)
+        else:
+            source = numbered(reader.raw_batches(batch_rows or sizer))
+            transform = transformer.transform
+        
+        sort_stages = []
+        if sorter:
+            def collect(batch):
+                sorter.add(batch)
+                if progress_callback:
+                    progress_callback('sort', sorter.rows, None, None)
+            
+            # Read and transform everything first, then insert the merged runs in key order
+            with metrics.stage('sort') as stage:
+                sort_pipeline = run_pipeline(source, transform, collect)
+                stage.rows = sorter.rows
+                stage.bytes = os.path.getsize(csv_file)
+            metrics.settings['sort_runs'] = len(sorter.runs)
+            sort_stages = [stats for stats in sort_pipeline['stages'] if stats['stage'] != 'write']
+            # Renumbered in key order: the rowids of split tables follow the row numbers
+            source, transform = numbered(sorter.sorted_batches(batch_rows or sizer.rows)), (lambda batch: batch)
+        
+        with metrics.stage('pipeline') as stage:
+            pipeline = run_pipeline(source, transform, write)
+            stage.rows = rows_written
+            stage.bytes = os.path.getsize(csv_file)
+        if sorter:
+            # The second pipeline reads the merged runs and has nothing to transform
+            merge_stages = [dict(stats, stage='merge') for stats in pipeline['stages'] if stats['stage'] == 'read']
+            pipeline['stages'] = sort_stages + merge_stages + [stats for stats in pipeline['stages']
+                                                               if stats['stage'] == 'write']
+        if sizer and df is None:
+            metrics.settings.update(sizer.as_dict())
+        metrics.settings['commit_rows'] = batch_rows or (sizer.rows if df is None else len(df))
+        for stage_stats in pipeline['stages']:
+            metrics.record(stage_stats['stage'], stage_stats['busy_seconds'], rows=stage_stats['rows'],
+                           utilization=stage_stats['utilization'],
+                           starved_seconds=stage_stats['starved_seconds'],
+                           blocked_seconds=stage_stats['blocked_seconds'])
+        if reject_log:
+            reject_log.write(conn, table_name)
+            if reject_log.count:
+                logging.warning(f"{reject_log.count} row(s) of {csv_file} were rejected, "
+                                f"see table {rejects_table_name(table_name)}")
+        conn.commit()
+        if df is None:
+            transformer.log_summary()
+        
+        if dedup and dedup.duplicates:
+            logging.info(f"{dedup.duplicates} duplicate row(s) in {csv_file} "
+                         f"{'skipped' if duplicates == 'skip' else 'loaded'}")
+        
+        if rows_written == 0:
+            if reject_log and reject_log.count:
+                raise ValueError(f"All {reject_log.count} rows were rejected, "
+                                 f"see table '{rejects_table_name(table_name)}'")
+            raise ValueError("Input file contains no data")
+        
+        columns = transformer.columns
+        encoder = transformer.encoder
+        
+        if partitioner:
+            create_union_view(conn, table_name)
             conn.commit()
-        except Exception as e:
-            conn.rollback()
-            raise Exception(f"Error inserting data: {e}")
         
-        # Verify data was inserted
-        cursor.execute(f'SELECT COUNT(*) FROM "{table_name}"')
-        row_count = cursor.fetchone()[0]
+        with metrics.stage('verify'):
+            # Verify data was inserted
+            cursor.execute(f'SELECT COUNT(*) FROM "{table_name}"')
+            row_count = cursor.fetchone()[0]
         
-        if row_count != len(df):
-            raise Exception(f"Data verification failed: Expected {len(df)} rows, found {row_count}")
+            if row_count != rows_written:
+                raise Exception(f"Data verification failed: Expected {rows_written} rows, found {row_count}")
         
-        success_msg = (f"Success! Data has been successfully converted and saved.\n\n"
-                      f"Database: {full_db_path}\n"
-                      f"Table: {table_name}\n" 
-                      f"Rows: {row_count}\n"
-                      f"Columns: {len(df.columns)}")
+        # Write lookup tables and the view that joins them back
+        lookup_sizes = {}
+        if encoder:
+            with metrics.stage('lookups') as stage:
+                lookup_sizes = encoder.write_lookup_tables(conn, table_name)
+                encoder.create_view(conn, table_name, columns)
+                conn.commit()
+                stage.rows = sum(lookup_sizes.values())
         
-        messagebox.showinfo("Conversion Successful", success_msg)
-        return True
+        with metrics.stage('row_hashes'):
+            # Keep row hashes for the next delta sync, or drop stale ones
+            if delta_sync:
+                write_row_hashes(conn, table_name, df, key_columns)
+            else:
+                drop_row_hashes(conn, table_name)
+            conn.commit()
         
-    except FileNotFoundError as e:
-        error_msg = f"File Error: {str(e)}"
-        messagebox.showerror("File Not Found", error_msg)
-        logging.error(error_msg)
-        return False
+        # Build indexes only now that the bulk insert is finished
+        def on_index_progress(done, total, name, seconds):
+            if progress_callback:
+                progress_callback('index', done, total, name)
         
-    except PermissionError as e:
-        error_msg = f"Permission Error: {str(e)}"
-        messagebox.showerror("Permission Denied", error_msg)
-        logging.error(error_msg)
-        return False
+        with metrics.stage('index'):
+            if partitioner:
+                # Every partition is indexed on the partition column, so the others are skipped by a seek
+                partition_specs = list(index_specs)
+                if not any(spec['columns'][0] == partitioner.column for spec in index_specs):
+                    partition_specs.append({'columns': [partitioner.column], 'unique': False, 'name': None})
+                index_timings = []
+                for part_table in partitioner.rows:
+                    # Index names are unique per database: a named index gets one name per partition
+                    specs = [dict(spec, name=f"{spec['name']}_{part_table}") if spec['name'] else spec
+                             for spec in partition_specs]
+                    index_timings += build_indexes(conn, part_table, specs, on_index_progress,
+                                                   analyze=False)
+                conn.execute('ANALYZE')
+                conn.commit()
+            elif splitter.split:
+                # Each index goes on the table holding its columns
+                index_timings = []
+                for index_table, specs in splitter.index_tables(index_specs):
+                    index_timings += build_indexes(conn, index_table, specs, on_index_progress)
+            else:
+                index_timings = build_indexes(conn, table_name, index_specs, on_index_progress)
         
-    except ValueError as e:
-        error_msg = f"Data Error: {str(e)}"
-        messagebox.showerror("Invalid Data", error_msg)
-        logging.error(error_msg)
-        return False
+        split_tables = []
+        full_view = None
+        if splitter.split:
+            split_tables = [part_table for part_table, _ in splitter.tables()]
+            full_view = splitter.create_view(conn, column_limit(conn))
+            if not full_view:
+                logging.warning(f"{table_name} has {len(columns)} columns, more than a view can hold; "
+                                f"join its tables {', '.join(split_tables)} on rowid instead")
+            conn.commit()
         
-    except sqlite3.Error as e:
-        error_msg = f"Database Error: {str(e)}"
-        messagebox.showerror("Database Error", error_msg)
-        logging.error(error_msg)
-        return False
+        # Remember what was converted so an unchanged re-run can be skipped
+        store_fingerprint(conn, table_name, fingerprint)
+        conn.commit()
+        persist()
+        
+        return finish({
+            'status': 'converted',
+            'database': full_db_path,
+            'table': table_name,
+            'rows': row_count,
+            'columns': len(columns),
+            'primary_key': key_columns,
+            'without_rowid': without_rowid,
+            'date_columns': transformer.date_converter.columns if transformer.date_converter else [],
+            'date_storage': date_storage,
+            'lookup_sizes': lookup_sizes,
+            'index_timings': index_timings,
+            'rejected': reject_log.count if reject_log else None,
+            'split_tables': split_tables,
+            'full_view': full_view,
+            'partitions': dict(sorted(partitioner.rows.items())) if partitioner else {},
+            'partition_by': partitioner.column if partitioner else None,
+            'partition_period': partition_period,
+            'duplicates': dedup.duplicates if dedup else None,
+            'duplicate_mode': duplicates,
+            'sorted_by': sorter.columns if sorter else None,
+        })
         
     except Exception as e:
-        error_msg = f"Unexpected Error: {str(e)}"
-        messagebox.showerror("Error", error_msg)
-        logging.error(error_msg)
-        return False
+        # Keep the stages that did run so a failure can be located in the log
+        if metrics_log:
+            metrics.finish()
+            metrics.write_log(metrics_log, {'source': csv_file, 'table': table_name,
+                                            'status': 'failed', 'error': str(e)})
+        raise
         
     finally:
         # Ensure database connection is properly closed
@@ -190,11 +739,142 @@ def convert_csv_to_sqlite(csv_file, db_file, db_path, table_name):
             cursor.close()
         if conn:
             conn.close()
+        if dedup:
+            # Removes the spill file of a large dedup run
+            dedup.close()
+        if sorter:
+            sorter.close()
+
+
+def format_summary(summary):
+    """
+    Build the user-facing message for a run summary returned by run_conversion
+    
+    Returns:
+        tuple: (title, message)
+    """
+    if summary['status'] == 'up_to_date':
+        return ("Up to Date",
+                f"Table '{summary['table']}' in {summary['database']} is already up to date.\n\n"
+                f"The source file and conversion options have not changed "
+                f"since the last conversion, so nothing was done.")
+    
+    if summary['status'] == 'synced':
+        changes = summary['changes']
+        return ("Sync Successful",
+                f"Success! Table '{summary['table']}' has been synchronized.\n\n"
+                f"Database: {summary['database']}\n"
+                f"Rows: {summary['rows']}\n"
+                f"Inserted: {changes['inserted']}\n"
+                f"Updated: {changes['updated']}\n"
+                f"Deleted: {changes['deleted']}")
+    
+    success_msg = (f"Success! Data has been successfully converted and saved.\n\n"
+                  f"Database: {summary['database']}\n"
+                  f"Table: {summary['table']}\n" 
+                  f"Rows: {summary['rows']}\n"
+                  f"Columns: {summary['columns']}")
+    
+    if summary['primary_key']:
+        success_msg += f"\nPrimary key: {', '.join(summary['primary_key'])}"
+        if summary['without_rowid']:
+            success_msg += " (WITHOUT ROWID)"
+    
+    if summary['date_columns']:
+        storage_label = 'epoch seconds' if summary['date_storage'] == 'epoch' else 'ISO-8601'
+        success_msg += f"\nDate columns: {', '.join(summary['date_columns'])} ({storage_label})"
+    
+    if summary['lookup_sizes']:
+        lookups = ", ".join(f"{col} ({size} values)" for col, size in summary['lookup_sizes'].items())
+        success_msg += f"\nLookup tables: {lookups}\nView: {view_name(summary['table'])}"
+    
+    if summary.get('split_tables'):
+        success_msg += f"\nSplit into: {', '.join(summary['split_tables'])}"
+        if summary.get('full_view'):
+            success_msg += f" (view {summary['full_view']})"
+    
+    if summary.get('partitions'):
+        by = f"{summary['partition_period']} of {summary['partition_by']}" if summary['partition_period'] \
+            else summary['partition_by']
+        success_msg += (f"\nPartitions: {len(summary['partitions'])} tables by {by} "
+                        f"(view {summary['table']} unions them)")
+    
+    if summary.get('duplicates'):
+        action = "skipped" if summary['duplicate_mode'] == 'skip' else "found (loaded)"
+        success_msg += f"\nDuplicate rows {action}: {summary['duplicates']:,}"
+    
+    if summary.get('sorted_by'):
+        success_msg += f"\nRows inserted in order of: {', '.join(summary['sorted_by'])}"
+    
+    if summary.get('rejected'):
+        success_msg += (f"\nRejected rows: {summary['rejected']:,} "
+                        f"(see table {rejects_table_name(summary['table'])})")
+    
+    if summary['index_timings']:
+        total_index_time = sum(seconds for _, seconds in summary['index_timings'])
+        success_msg += f"\nIndexes: {len(summary['index_timings'])} built in {total_index_time:.2f}s"
+    
+    if summary.get('metrics'):
+        success_msg += f"\n\nStage timings:\n{format_metrics(summary['metrics'])}"
+    
+    return ("Conversion Successful", success_msg)
+
+
+def format_error(error):
+    """
+    Build the message box title and text for a failed conversion
+    
+    Args:
+        error (Exception): Error raised by run_conversion
+    
+    Returns:
+        tuple: (title, message)
+    """
+    if isinstance(error, FileNotFoundError):
+        return "File Not Found", f"File Error: {str(error)}"
+    if isinstance(error, PermissionError):
+        return "Permission Denied", f"Permission Error: {str(error)}"
+    if isinstance(error, ValueError):
+        message = f"Data Error: {str(error)}"
+        if str(error).startswith("Error parsing CSV"):
+            message = message.rstrip() + ("\n\nTo load the other rows, enable 'Quarantine rows that cannot be "
+                        "loaded' in the advanced options.")
+        return "Invalid Data", message
+    if isinstance(error, sqlite3.Error):
+        return "Database Error", f"Database Error: {str(error)}"
+    return "Error", f"Unexpected Error: {str(error)}"
+
+def convert_csv_to_sqlite(csv_file, db_file, db_path, table_name, **options):
+    """
+    Convert CSV data to SQLite database and report the outcome in message boxes
+    
+    Args:
+        csv_file (str): Path to the CSV file
+        db_file (str): Name of the SQLite database file (with .db extension)
+        db_path (str): Directory path where the database should be created
+        table_name (str): Name of the table to create in the database
+        **options: Conversion options, see run_conversion
+    
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    try:
+        summary = run_conversion(csv_file, db_file, db_path, table_name, **options)
+        title, message = format_summary(summary)
+        messagebox.showinfo(title, message)
+        return True
+        
+    except Exception as e:
+        title, error_msg = format_error(e)
+        messagebox.showerror(title, error_msg)
+        logging.error(error_msg)
+        return False
 
 # Example usage with validation
-def safe_convert_csv_to_sqlite(csv_file, db_file, db_path, table_name):
+def safe_convert_csv_to_sqlite(csv_file, db_file, db_path, table_name, **options):
     """
     Wrapper function with additional validation before conversion.
+    Extra keyword options are passed through to convert_csv_to_sqlite.
     """
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -203,8 +883,8 @@ def safe_convert_csv_to_sqlite(csv_file, db_file, db_path, table_name):
         messagebox.showerror("Invalid Input", "All parameters must be provided")
         return False
     
-    # Check file extension
-    if not csv_file.lower().endswith('.csv'):
-        messagebox.showwarning("File Type Warning", "File does not have .csv extension")
+    # Check file extension (unrecognized files are read as CSV)
+    if not options.get('input_format') and detect_format(csv_file) is None:
+        messagebox.showwarning("File Type Warning", "File extension not recognized, reading it as CSV")
     # Call the main conversion function
-    return convert_csv_to_sqlite(csv_file, db_file, db_path, table_name)
\ No newline at end of file
+    return convert_csv_to_sqlite(csv_file, db_file, db_path, table_name, **options)
\ No newline at end of file
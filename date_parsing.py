@@ -0,0 +1,139 @@
+"""
+Date Parsing Module
+Detects date/time text columns and normalizes them to ISO-8601 text or integer epoch seconds.
+"""
+
+import re
+import logging
+import pandas as pd
+
+
+# Storage modes for normalized date columns
+DATE_STORAGE_MODES = ('iso', 'epoch')
+
+# Cheap pre-filter so plain numbers and free text are never handed to the date parser
+DATE_PATTERN = re.compile(
+    r'^\s*(\d{4}[-/.]\d{1,2}[-/.]\d{1,2}|\d{1,2}[-/.]\d{1,2}[-/.]\d{2,4})([ T]\d{1,2}:\d{2}(:\d{2}(\.\d+)?)?)?'
+    r'\s*(Z|[+-]\d{2}:?\d{2})?\s*$'
+)
+
+
+def _parse(values, date_format):
+    """Parse a Series of strings to naive UTC datetimes, unparseable values become NaT"""
+    parsed = pd.to_datetime(values, errors='coerce', utc=True, format=date_format)
+    return parsed.dt.tz_localize(None)
+
+
+def detect_date_columns(df, sample_size=1000, min_ratio=0.9, exclude=None):
+    """
+    Find text columns that hold dates or timestamps
+
+    Args:
+        df: DataFrame (or first chunk) to inspect
+        sample_size (int): Number of non-null values to test per column
+        min_ratio (float): Share of sampled values that must parse as dates
+        exclude: Column names that must never be converted
+
+    Returns:
+        list: Column names holding dates, in table order
+    """
+    exclude = set(exclude or [])
+    columns = []
+    for col, dtype in df.dtypes.items():
+        if col in exclude or str(dtype) not in ('object', 'string', 'str'):
+            continue
+
+        sample = df[col].dropna().astype(str).head(sample_size)
+        if sample.empty:
+            continue
+
+        if sample.str.match(DATE_PATTERN).mean() < min_ratio:
+            continue
+
+        if _parse(sample, 'mixed').notna().mean() >= min_ratio:
+            columns.append(col)
+    return columns
+
+
+class DateConverter:
+    """Normalizes date columns chunk by chunk using a parse format picked on the first chunk"""
+
+    def __init__(self, columns, storage='iso'):
+        if storage not in DATE_STORAGE_MODES:
+            raise ValueError(f"Date storage must be one of: {', '.join(DATE_STORAGE_MODES)}")
+        self.columns = list(columns)
+        self.storage = storage
+        self.formats = {}     # column -> format passed to pd.to_datetime
+        self.unparsed = {col: 0 for col in self.columns}
+
+    @property
+    def sqlite_type(self):
+        """Declared column type for converted date columns"""
+        return 'INTEGER' if self.storage == 'epoch' else 'TEXT'
+
+    def _configure(self, col, values):
+        """Pick the fastest format that parses this column"""
+        sample = values.dropna().head(1000)
+        date_format = 'mixed'
+        if not sample.empty and _parse(sample, 'ISO8601').notna().all():
+            date_format = 'ISO8601'
+        self.formats[col] = date_format
+
+    def convert(self, df):
+        """
+        Replace date columns with ISO-8601 text or epoch seconds
+
+        ISO-8601 text sorts chronologically, so both modes can be range-scanned
+        through an index. Each value is written on its own: a date without a
+        time part as YYYY-MM-DD, others with the time and, if they have any,
+        microseconds, so the text does not depend on how the file was batched.
+        Values that do not parse are kept as they were.
+
+        Args:
+            df: DataFrame or chunk to convert
+
+        Returns:
+            DataFrame: Copy of df with normalized date columns
+        """
+        df = df.copy()
+        for col in self.columns:
+            values = df[col].astype('object')
+            if col not in self.formats:
+                self._configure(col, values)
+
+            parsed = _parse(values, self.formats[col])
+
+            if self.storage == 'epoch':
+                converted = pd.Series(parsed.to_numpy().astype('datetime64[s]').astype('int64'),
+                                      index=df.index).astype('Int64')
+            else:
+                converted = self._iso_text(parsed)
+            converted = converted.where(parsed.notna(), None)
+
+            failed = parsed.isna() & values.notna()
+            if failed.any():
+                self.unparsed[col] += int(failed.sum())
+                converted = converted.astype('object')
+                converted[failed] = values[failed]
+
+            df[col] = converted
+
+        return df
+
+    @staticmethod
+    def _iso_text(parsed):
+        """Format datetimes as the shortest ISO-8601 text that keeps their time and microseconds"""
+        converted = parsed.dt.strftime('%Y-%m-%d').astype('object')
+        timed = parsed.notna() & (parsed != parsed.dt.normalize())
+        if timed.any():
+            fraction = timed & (parsed.dt.microsecond != 0)
+            seconds = timed & ~fraction
+            converted[seconds] = parsed[seconds].dt.strftime('%Y-%m-%d %H:%M:%S')
+            converted[fraction] = parsed[fraction].dt.strftime('%Y-%m-%d %H:%M:%S.%f')
+        return converted
+
+    def log_summary(self):
+        """Log columns where some values could not be parsed"""
+        for col, count in self.unparsed.items():
+            if count:
+                logging.warning(f"Date column {col}: {count} value(s) could not be parsed and were kept as text")
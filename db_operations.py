@@ -0,0 +1,163 @@
+"""
+Database Operations Module
+Data-access side of the database editor, kept free of Tk so it can be reused
+headless (benchmarks, scripts). All functions take an open sqlite3 connection
+and raise sqlite3.Error on failure; the editor dialogs report the errors.
+"""
+
+import os
+import sqlite3
+import globals
+
+
+# Rows loaded per page by the database viewer
+PAGE_SIZE = 500
+
+
+def database_file(db_path, db_name):
+    """Full path of a database file, adding the .db extension if it is missing"""
+    if not db_name.lower().endswith('.db'):
+        db_name += '.db'
+    return os.path.join(db_path, db_name)
+
+
+def list_tables(conn):
+    """Names of the user tables, hiding SQLite and converter bookkeeping tables"""
+    prefix = globals.INTERNAL_TABLE_PREFIX
+    cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table' "
+                          "AND name NOT LIKE 'sqlite_%' AND substr(name, 1, ?) != ?",
+                          (len(prefix), prefix))
+    return [row[0] for row in cursor.fetchall()]
+
+
+def table_columns(conn, table_name):
+    """
+    Column names and declared types of a table
+
+    Returns:
+        list: (name, type) tuples in table order
+    """
+    cursor = conn.execute(f"PRAGMA table_info([{table_name}])")
+    return [(col[1], col[2]) for col in cursor.fetchall()]
+
+
+def count_rows(conn, table_name):
+    """Number of rows in a table"""
+    return conn.execute(f"SELECT COUNT(*) FROM [{table_name}]").fetchone()[0]
+
+
+def fetch_page(conn, table_name, offset=0, limit=PAGE_SIZE):
+    """
+    One page of table rows in storage order
+
+    Args:
+        conn: Open sqlite3 connection
+        table_name (str): Table to read
+        offset (int): Number of rows to skip
+        limit (int): Maximum number of rows to return
+
+    Returns:
+        list: Row tuples
+    """
+    cursor = conn.execute(f"SELECT * FROM [{table_name}] LIMIT ? OFFSET ?", (limit, offset))
+    return cursor.fetchall()
+
+
+def where_clause(filters):
+    """
+    Build an AND-ed equality WHERE clause
+
+    Args:
+        filters (dict): Mapping of column name to the value it must equal
+
+    Returns:
+        tuple: (clause, params)
+    """
+    if not filters:
+        raise ValueError("At least one filter column is required")
+    clause = " AND ".join(f"[{col}] = ?" for col in filters)
+    return clause, list(filters.values())
+
+
+def find_records(conn, table_name, filters):
+    """All rows whose columns equal the given filter values"""
+    clause, params = where_clause(filters)
+    return conn.execute(f"SELECT * FROM [{table_name}] WHERE {clause}", params).fetchall()
+
+
+def insert_record(conn, table_name, values):
+    """
+    Insert one row with values for the given columns only
+
+    Args:
+        values (dict): Mapping of column name to value (None for NULL)
+    """
+    cols_sql = ", ".join(f"[{c}]" for c in values)
+    placeholders = ", ".join("?" for _ in values)
+    conn.execute(f"INSERT INTO [{table_name}] ({cols_sql}) VALUES ({placeholders})", list(values.values()))
+    conn.commit()
+
+
+def delete_records(conn, table_name, filters):
+    """
+    Delete all rows matching the filters
+
+    Returns:
+        int: Number of deleted rows
+    """
+    clause, params = where_clause(filters)
+    cursor = conn.execute(f"DELETE FROM [{table_name}] WHERE {clause}", params)
+    conn.commit()
+    return cursor.rowcount
+
+
+def update_records(conn, table_name, column, value, where_column, where_value):
+    """
+    Set one column on every row where where_column equals where_value
+
+    Returns:
+        int: Number of updated rows
+    """
+    cursor = conn.execute(f"UPDATE [{table_name}] SET [{column}] = ? WHERE [{where_column}] = ?",
+                          (value, where_value))
+    conn.commit()
+    return cursor.rowcount
+
+
+def add_column(conn, table_name, column_name, column_type='TEXT', default=None):
+    """Add a column; existing rows get the default value (NULL if none)"""
+    sql = f"ALTER TABLE [{table_name}] ADD COLUMN [{column_name}] {column_type.upper()}"
+    if default:
+        sql += f" DEFAULT '{default}'"
+    conn.execute(sql)
+    conn.commit()
+
+
+def delete_column(conn, table_name, column_name):
+    """
+    Remove a column by recreating the table from the remaining columns
+
+    Raises:
+        ValueError: If the column does not exist or is the last column
+    """
+    column_names = [name for name, _ in table_columns(conn, table_name)]
+    if column_name not in column_names:
+        raise ValueError(f"Column '{column_name}' not found in table '{table_name}'")
+
+    remaining_columns = [col for col in column_names if col != column_name]
+    if not remaining_columns:
+        raise ValueError("Cannot delete the last column from a table")
+
+    # SQLite doesn't support DROP COLUMN everywhere, so copy into a new table
+    temp_table = f"{table_name}_temp"
+    columns_sql = ", ".join(f"[{col}]" for col in remaining_columns)
+    try:
+        if not conn.in_transaction:
+            conn.execute("BEGIN")
+        conn.execute(f"CREATE TABLE [{temp_table}] AS SELECT {columns_sql} FROM [{table_name}]")
+        conn.execute(f"DROP TABLE [{table_name}]")
+        conn.execute(f"ALTER TABLE [{temp_table}] RENAME TO [{table_name}]")
+        conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+        raise
@@ -0,0 +1,179 @@
+"""
+Dedup Module
+Duplicate detection while batches stream through the converter. Every row,
+or only its key columns, is reduced to a 64-bit hash; the hashes seen so far
+are kept as sorted NumPy arrays (8 bytes per row) and spill to a temporary
+SQLite file once they outgrow their share of the memory budget, so a file of
+any length is deduplicated in one pass before its rows reach the database.
+
+Two different rows share a 64-bit hash with a probability of about n²/2^65
+(1 in 370,000 for 10 million rows); the later of the two would be taken for
+a duplicate.
+"""
+
+import os
+import sqlite3
+import tempfile
+import numpy as np
+import pandas as pd
+
+from pipeline import memory_budget_mb
+
+
+DUPLICATE_MODES = ('skip', 'count')
+
+# Share of the memory budget the in-memory hashes may use before spilling
+DEDUP_MEMORY_SHARE = 0.5
+
+HASH_BYTES = 8
+
+
+def parse_dedup_columns(deduplicate):
+    """
+    Columns compared by the deduplicate option
+
+    Args:
+        deduplicate: True for whole rows, or a column name, comma separated
+                     names or a list of names
+
+    Returns:
+        list: Column names, empty for whole rows, or None if rows are not deduplicated
+    """
+    if not deduplicate:
+        return None
+    if deduplicate is True:
+        return []
+    if isinstance(deduplicate, str):
+        deduplicate = deduplicate.split(',')
+    return [str(col).strip() for col in deduplicate if str(col).strip()]
+
+
+class HashSet:
+    """
+    Set of 64-bit hashes: sorted in-memory runs, spilled to a SQLite file when full
+
+    Runs are merged like a log-structured tree (a run is merged into the one
+    before it once it is at least half its size), so lookups search a
+    logarithmic number of sorted arrays.
+    """
+
+    def __init__(self, max_memory_hashes):
+        self.max_memory_hashes = max(1, int(max_memory_hashes))
+        self.runs = []
+        self.memory_hashes = 0
+        self.spilled_hashes = 0
+        self.spill_path = None
+        self._spill = None
+
+    def contains(self, hashes):
+        """Boolean mask of the (unique, sorted) hashes already in the set"""
+        found = np.zeros(len(hashes), dtype=bool)
+        for run in self.runs:
+            positions = np.minimum(np.searchsorted(run, hashes), len(run) - 1)
+            found |= run[positions] == hashes
+        if self._spill is not None and not found.all():
+            candidates = hashes[~found]
+            found[~found] = np.isin(candidates, self._spilled(candidates))
+        return found
+
+    def add(self, hashes):
+        """Add sorted hashes that are not in the set yet"""
+        if not len(hashes):
+            return
+        self.runs.append(hashes)
+        self.memory_hashes += len(hashes)
+        while len(self.runs) > 1 and len(self.runs[-1]) * 2 >= len(self.runs[-2]):
+            last = self.runs.pop()
+            self.runs[-1] = np.union1d(self.runs[-1], last)
+        if self.memory_hashes > self.max_memory_hashes:
+            self._spill_runs()
+
+    def _spill_runs(self):
+        """Move the in-memory hashes to the spill file"""
+        if self._spill is None:
+            fd, self.spill_path = tempfile.mkstemp(prefix='csvsql-dedup-', suffix='.db')
+            os.close(fd)
+            # Used from the transform thread, closed from the converter's
+            self._spill = sqlite3.connect(self.spill_path, check_same_thread=False)
+            self._spill.execute('PRAGMA journal_mode = OFF')
+            self._spill.execute('PRAGMA synchronous = OFF')
+            self._spill.execute('CREATE TABLE seen (hash INTEGER PRIMARY KEY)')
+        for run in self.runs:
+            # SQLite integers are signed: store the bit pattern as int64
+            self._spill.executemany('INSERT OR IGNORE INTO seen VALUES (?)', zip(run.view(np.int64).tolist()))
+        self._spill.commit()
+        self.spilled_hashes += self.memory_hashes
+        self.runs = []
+        self.memory_hashes = 0
+
+    def _spilled(self, hashes):
+        """The given hashes that are in the spill file"""
+        conn = self._spill
+        conn.execute('CREATE TEMP TABLE IF NOT EXISTS probe (hash INTEGER PRIMARY KEY)')
+        conn.execute('DELETE FROM probe')
+        conn.executemany('INSERT INTO probe VALUES (?)', zip(hashes.view(np.int64).tolist()))
+        found = [row[0] for row in conn.execute('SELECT hash FROM probe JOIN seen USING (hash)')]
+        return np.array(found, dtype=np.int64).view(np.uint64)
+
+    def close(self):
+        """Remove the spill file"""
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+            os.remove(self.spill_path)
+
+
+class DuplicateFilter:
+    """
+    Finds rows (or key values) that already appeared earlier in the input
+
+    Call filter() with every batch, in input order; the first occurrence is
+    kept. Batches must have the same columns and dtypes, as hashes depend on
+    the dtype: readers.ColumnCoercer gives every batch of a column the same
+    dtype, and the converter filters before downcasting.
+    """
+
+    def __init__(self, columns=None, mode='skip', budget_mb=None):
+        """
+        Args:
+            columns (list): Columns to compare; None or empty for whole rows
+            mode (str): 'skip' to drop duplicates, 'count' to only count them
+            budget_mb (float): Conversion memory budget (see pipeline.memory_budget_mb);
+                               the hashes kept in memory use DEDUP_MEMORY_SHARE of it
+        """
+        if mode not in DUPLICATE_MODES:
+            raise ValueError(f"Duplicate handling must be one of: {', '.join(DUPLICATE_MODES)}")
+        self.columns = list(columns or [])
+        self.mode = mode
+        max_hashes = memory_budget_mb(budget_mb) * DEDUP_MEMORY_SHARE * 1024 * 1024 / HASH_BYTES
+        self.seen = HashSet(max_hashes)
+        self.duplicates = 0
+
+    def filter(self, df):
+        """Drop (or count) the rows of a batch seen before, in this batch or an earlier one"""
+        if df.empty:
+            return df
+        if self.columns:
+            missing = [col for col in self.columns if col not in df.columns]
+            if missing:
+                raise ValueError(f"Duplicate check column(s) not found in input: {', '.join(missing)}")
+            data = df[self.columns]
+        else:
+            data = df
+        hashes = pd.util.hash_pandas_object(data, index=False).to_numpy()
+
+        # np.unique sorts, which is the order the hash set needs; first is the first row of each hash
+        unique, first = np.unique(hashes, return_index=True)
+        is_new = ~self.seen.contains(unique)
+        self.seen.add(unique[is_new])
+
+        keep = np.zeros(len(df), dtype=bool)
+        keep[first[is_new]] = True
+        duplicates = len(df) - int(keep.sum())
+        self.duplicates += duplicates
+        if self.mode == 'count' or not duplicates:
+            return df
+        return df[keep]
+
+    def close(self):
+        self.seen.close()
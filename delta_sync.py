@@ -0,0 +1,154 @@
+"""
+Delta Sync Module
+Applies only the inserted, changed and deleted rows of a new CSV snapshot to an existing table.
+"""
+
+import sqlite3
+import pandas as pd
+import globals
+from writer import row_tuples
+from sql_util import quote
+
+
+def row_hash_table_name(table_name):
+    """Name of the table holding one hash per key of a synced table"""
+    return f"{globals.INTERNAL_TABLE_PREFIX}rowhash_{table_name}"
+
+
+def compute_row_hashes(df):
+    """
+    Hash every row of a DataFrame
+
+    Returns:
+        Series: Signed 64-bit hash per row (SQLite INTEGER range)
+    """
+    hashes = pd.util.hash_pandas_object(df, index=False).to_numpy().view('int64')
+    return pd.Series(hashes, index=df.index)
+
+
+def drop_row_hashes(conn, table_name):
+    """Remove stored row hashes of a table that is rebuilt without delta sync"""
+    conn.execute(f'DROP TABLE IF EXISTS {quote(row_hash_table_name(table_name))}')
+
+
+def write_row_hashes(conn, table_name, df, key_columns):
+    """
+    Replace the stored row hashes of a table after a full load (caller commits)
+    """
+    hash_table = quote(row_hash_table_name(table_name))
+    keys_sql = ", ".join(quote(col) for col in key_columns)
+
+    conn.execute(f'DROP TABLE IF EXISTS {hash_table}')
+    conn.execute(f'CREATE TABLE {hash_table} ({keys_sql}, row_hash INTEGER NOT NULL, '
+                 f'PRIMARY KEY ({keys_sql})) WITHOUT ROWID')
+
+    hashed = df[key_columns].copy()
+    hashed['row_hash'] = compute_row_hashes(df)
+    placeholders = ", ".join("?" for _ in range(len(key_columns) + 1))
+    conn.executemany(f'INSERT INTO {hash_table} VALUES ({placeholders})', row_tuples(hashed))
+
+
+def can_sync(conn, table_name, columns, key_columns):
+    """
+    Check whether an existing table can be updated in place
+
+    The table and its row hashes must exist and the table must have exactly
+    the same columns as the new data, otherwise a full rebuild is needed.
+    """
+    cursor = conn.cursor()
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name IN (?, ?)",
+                   (table_name, row_hash_table_name(table_name)))
+    if len(cursor.fetchall()) != 2:
+        return False
+
+    cursor.execute(f'PRAGMA table_info({quote(table_name)})')
+    existing = [row[1] for row in cursor.fetchall()]
+    if existing != list(columns):
+        return False
+
+    cursor.execute(f'PRAGMA table_info({quote(row_hash_table_name(table_name))})')
+    return [row[1] for row in cursor.fetchall()] == list(key_columns) + ['row_hash']
+
+
+def diff_rows(conn, table_name, df, key_columns):
+    """
+    Compare new data against the stored row hashes
+
+    Args:
+        conn: Open sqlite3 connection
+        table_name (str): Synced table
+        df: New snapshot (already transformed exactly like a full load)
+        key_columns (list): Key columns identifying a row
+
+    Returns:
+        tuple: (rows to insert, rows to update, keys to delete, new hashes by key)
+    """
+    if df.duplicated(subset=key_columns).any():
+        raise ValueError(f"Key column(s) {', '.join(key_columns)} contain duplicate values; "
+                         f"delta sync needs a unique key")
+
+    stored = pd.read_sql_query(f'SELECT * FROM {quote(row_hash_table_name(table_name))}', conn)
+
+    incoming = df[key_columns].copy()
+    incoming['row_hash'] = compute_row_hashes(df)
+
+    # Compare keys as text so 1 (SQLite) and 1 (CSV) match regardless of dtype
+    join_keys = [f"__key{i}" for i in range(len(key_columns))]
+    for i, col in enumerate(key_columns):
+        incoming[join_keys[i]] = incoming[col].astype(str)
+        stored[join_keys[i]] = stored[col].astype(str)
+
+    merged = incoming.merge(stored[join_keys + ['row_hash']], on=join_keys, how='outer',
+                            suffixes=('', '_stored'), indicator=True)
+
+    new_keys = merged.loc[merged['_merge'] == 'left_only', join_keys]
+    changed_keys = merged.loc[(merged['_merge'] == 'both') &
+                              (merged['row_hash'] != merged['row_hash_stored']), join_keys]
+    deleted_keys = merged.loc[merged['_merge'] == 'right_only', join_keys]
+
+    incoming_keys = pd.MultiIndex.from_frame(incoming[join_keys])
+    inserts = df[incoming_keys.isin(pd.MultiIndex.from_frame(new_keys))]
+    updates = df[incoming_keys.isin(pd.MultiIndex.from_frame(changed_keys))]
+    deletes = stored.merge(deleted_keys, on=join_keys)[key_columns]
+
+    return inserts, updates, deletes, incoming[key_columns + ['row_hash']]
+
+
+def apply_delta(conn, table_name, key_columns, inserts, updates, deletes, new_hashes):
+    """
+    Apply inserts, updates and deletes and refresh the row hashes in one transaction
+
+    The table must have a primary key on key_columns so updates can use
+    INSERT OR REPLACE.
+
+    Returns:
+        dict: Counts of inserted, updated and deleted rows
+    """
+    hash_table = quote(row_hash_table_name(table_name))
+    columns_sql = ", ".join(quote(col) for col in inserts.columns)
+    placeholders = ", ".join("?" for _ in inserts.columns)
+    key_filter = " AND ".join(f"{quote(col)} = ?" for col in key_columns)
+
+    try:
+        cursor = conn.cursor()
+        if len(deletes):
+            cursor.executemany(f'DELETE FROM {quote(table_name)} WHERE {key_filter}', row_tuples(deletes))
+            cursor.executemany(f'DELETE FROM {hash_table} WHERE {key_filter}', row_tuples(deletes))
+
+        for rows in (inserts, updates):
+            if len(rows):
+                cursor.executemany(f'INSERT OR REPLACE INTO {quote(table_name)} ({columns_sql}) '
+                                   f'VALUES ({placeholders})', row_tuples(rows))
+
+        changed = pd.concat([inserts, updates])
+        if len(changed):
+            changed_hashes = new_hashes.loc[changed.index]
+            hash_placeholders = ", ".join("?" for _ in range(len(key_columns) + 1))
+            cursor.executemany(f'INSERT OR REPLACE INTO {hash_table} VALUES ({hash_placeholders})',
+                               row_tuples(changed_hashes))
+        conn.commit()
+    except sqlite3.Error as e:
+        conn.rollback()
+        raise sqlite3.Error(f"Error applying changes: {e}")
+
+    return {'inserted': len(inserts), 'updated': len(updates), 'deleted': len(deletes)}
@@ -0,0 +1,169 @@
+"""
+Dictionary Encoding Module
+Moves low-cardinality text columns into lookup tables and stores integer codes in the main table.
+"""
+
+import sqlite3
+import pandas as pd
+
+from sql_util import quote
+
+
+# Column dtypes that are candidates for dictionary encoding
+TEXT_DTYPES = ('object', 'string', 'str', 'category')
+
+
+def detect_low_cardinality_columns(df, max_unique=1000, max_ratio=0.2, exclude=None):
+    """
+    Find text columns whose values repeat enough to be worth a lookup table
+
+    Args:
+        df: DataFrame (or first chunk) to inspect
+        max_unique (int): Maximum number of distinct values for a column to qualify
+        max_ratio (float): Maximum distinct/rows ratio for a column to qualify
+        exclude: Column names that must never be encoded (e.g. key columns)
+
+    Returns:
+        list: Column names to encode, in table order
+    """
+    exclude = set(exclude or [])
+    row_count = len(df)
+    if row_count == 0:
+        return []
+
+    columns = []
+    for col, dtype in df.dtypes.items():
+        if col in exclude or str(dtype) not in TEXT_DTYPES:
+            continue
+        unique_count = df[col].nunique(dropna=True)
+        if 0 < unique_count <= max_unique and unique_count / row_count <= max_ratio:
+            columns.append(col)
+    return columns
+
+
+def lookup_table_name(table_name, column):
+    """
+    Name of the lookup table holding the values of an encoded column
+
+    The lookup_ prefix keeps column names such as p_x, part2 or rejects from
+    producing the names of partition, column group or rejects tables.
+    """
+    return f"{table_name}__lookup_{column}"
+
+
+def list_lookup_tables(conn, table_name):
+    """Lookup tables of a table, whichever columns a previous conversion encoded"""
+    rows = conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name GLOB ?",
+                        (lookup_table_name(table_name, '*'),)).fetchall()
+    return [name for (name,) in rows]
+
+
+def view_name(table_name):
+    """Name of the convenience view that joins lookup values back"""
+    return f"{table_name}_view"
+
+
+class DictionaryEncoder:
+    """Keeps value -> code mappings for encoded columns across one or more chunks"""
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.lookups = {col: {} for col in self.columns}
+
+    def encode(self, df):
+        """
+        Replace the values of encoded columns with integer codes
+
+        New values get the next free code, so the same encoder can be used
+        for every chunk of a file and the codes stay consistent.
+
+        Args:
+            df: DataFrame or chunk to encode
+
+        Returns:
+            DataFrame: Copy of df with encoded columns as nullable integers
+        """
+        df = df.copy()
+        for col in self.columns:
+            mapping = self.lookups[col]
+            values = df[col].astype('object')
+            for value in pd.unique(values.dropna()):
+                if value not in mapping:
+                    mapping[value] = len(mapping) + 1
+            df[col] = values.map(mapping).astype('Int64')
+        return df
+
+    def load_lookup_tables(self, conn, table_name):
+        """
+        Seed the mappings from lookup tables of a previous conversion
+
+        Keeps the codes already stored in the main table valid when it is
+        updated in place instead of rebuilt.
+        """
+        cursor = conn.cursor()
+        for col in self.columns:
+            lookup = lookup_table_name(table_name, col)
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name = ?", (lookup,))
+            if cursor.fetchone():
+                cursor.execute(f'SELECT value, id FROM "{lookup}"')
+                self.lookups[col] = dict(cursor.fetchall())
+
+    @staticmethod
+    def drop_tables(conn, table_name):
+        """Drop the view and all lookup tables left by a previous conversion (caller commits)"""
+        cursor = conn.cursor()
+        cursor.execute(f'DROP VIEW IF EXISTS "{view_name(table_name)}"')
+        for lookup in list_lookup_tables(conn, table_name):
+            cursor.execute(f'DROP TABLE IF EXISTS "{lookup}"')
+
+    def write_lookup_tables(self, conn, table_name):
+        """
+        Create and fill one lookup table per encoded column
+
+        Returns:
+            dict: Mapping of column name to number of distinct values stored
+        """
+        cursor = conn.cursor()
+        sizes = {}
+        try:
+            for col in self.columns:
+                lookup = lookup_table_name(table_name, col)
+                cursor.execute(f'DROP TABLE IF EXISTS "{lookup}"')
+                cursor.execute(f'CREATE TABLE "{lookup}" (id INTEGER PRIMARY KEY, value TEXT NOT NULL UNIQUE)')
+                cursor.executemany(
+                    f'INSERT INTO "{lookup}" (id, value) VALUES (?, ?)',
+                    ((code, str(value)) for value, code in self.lookups[col].items())
+                )
+                sizes[col] = len(self.lookups[col])
+        except sqlite3.Error as e:
+            raise sqlite3.Error(f"Error writing lookup tables: {e}")
+        return sizes
+
+    def create_view(self, conn, table_name, all_columns):
+        """
+        Create a view over the main table that shows the original text values
+
+        Args:
+            conn: Open sqlite3 connection
+            table_name (str): Main table name
+            all_columns (list): Main table columns in display order
+        """
+        select_parts = []
+        joins = []
+        for col in all_columns:
+            quoted = quote(col)
+            if col in self.lookups:
+                alias = f"l{len(joins)}"
+                joins.append(f'LEFT JOIN "{lookup_table_name(table_name, col)}" AS {alias} '
+                             f'ON {alias}.id = t.{quoted}')
+                select_parts.append(f'{alias}.value AS {quoted}')
+            else:
+                select_parts.append(f't.{quoted}')
+
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f'DROP VIEW IF EXISTS "{view_name(table_name)}"')
+            cursor.execute(f'CREATE VIEW "{view_name(table_name)}" AS SELECT {", ".join(select_parts)} '
+                           f'FROM "{table_name}" AS t {" ".join(joins)}')
+        except sqlite3.Error as e:
+            raise sqlite3.Error(f"Error creating lookup view: {e}")
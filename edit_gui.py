@@ -3,6 +3,8 @@ from tkinter import messagebox
 from GUI_tooltip import ToolTip
 from edit_sql import editsql
 from theme_manager import ThemableWindow, get_app_theme_manager
+from profiling import get_app_profiler
+from events import get_app_event_bus, WINDOW_CLOSED
 
 
 class editgui(ThemableWindow):
@@ -13,6 +15,8 @@ class editgui(ThemableWindow):
         ThemableWindow.__init__(self, get_app_theme_manager())
         
         self.parent = parent
+        self.profiler = get_app_profiler()
+        self.event_bus = get_app_event_bus()
         
         # Get current theme
         self.current_theme = self.theme_manager.get_current_theme()
@@ -28,6 +32,9 @@ class editgui(ThemableWindow):
         self.window.grab_set()
         self.window.focus_set()
         
+        # Announce the close however the window goes away (buttons, window manager, parent)
+        self.window.bind('<Destroy>', self.on_destroy, add='+')
+        
         try:
             self.setup_ui()
             # Apply initial theme
@@ -36,6 +43,13 @@ class editgui(ThemableWindow):
             messagebox.showerror("UI Setup Error", f"Failed to create interface: {str(e)}")
             self.window.destroy()
     
+    def on_destroy(self, event):
+        """Stop theming this window and tell subscribers it has closed"""
+        if event.widget is not self.window:
+            return
+        self.theme_manager.unregister_theme_callback(self.on_theme_changed)
+        self.event_bus.publish(WINDOW_CLOSED, window='edit', source=self)
+    
     def on_theme_changed(self, new_theme):
         """Called when theme changes"""
         self.current_theme = new_theme
@@ -48,13 +62,13 @@ class editgui(ThemableWindow):
         self.create_theme_toggle_section()
         
         # Title
-        self.title_label = tk.Label(
+        self.title_label = self.themed(tk.Label(
             self.window, 
             text="Database Editing Tools",
             font=("Arial", 16, "bold"), 
             bg=self.current_theme['bg'], 
             fg=self.current_theme['title_color']
-        )
+        ))
         self.title_label.pack(pady=0)
         self.register_special_widget(self.title_label, 'title')
         
@@ -67,7 +81,7 @@ class editgui(ThemableWindow):
 
     def create_theme_toggle_section(self):
         """Create theme toggle button"""
-        theme_frame = tk.Frame(self.window, bg=self.current_theme['bg'])
+        theme_frame = self.themed(tk.Frame(self.window, bg=self.current_theme['bg']))
         theme_frame.pack(anchor='ne', padx=10, pady=5)
         
         self.theme_button = self.create_theme_toggle(theme_frame)
@@ -76,226 +90,239 @@ class editgui(ThemableWindow):
 
     def view_db_section(self):
         """Section to view the database"""
-        view_frame = tk.Frame(self.window, bg=self.current_theme['bg'])
+        view_frame = self.themed(tk.Frame(self.window, bg=self.current_theme['bg']))
         view_frame.pack(pady=(15,0), padx=20, fill='x')
         
         # Create a bordered section
-        section_frame = tk.Frame(view_frame, bg=self.current_theme['bg'], relief='ridge', bd=2)
+        section_frame = self.themed(tk.Frame(view_frame, bg=self.current_theme['bg'], relief='ridge', bd=2))
         section_frame.pack(fill='x', padx=10, pady=5)
         
-        view_label = tk.Label(
+        view_label = self.themed(tk.Label(
             section_frame, 
             text="📋 View Database", 
             font=("Arial", 14, "bold"), 
             bg=self.current_theme['bg'], 
             fg=self.current_theme['text']
-        )
+        ))
         view_label.pack(pady=10)
         
-        view_button = tk.Button(
+        view_button = self.themed(tk.Button(
             section_frame, 
             text="View Database Contents",
-            command=editsql.view_database,
+            command=self.profiler.wrap('edit.view_database', editsql.view_database),
             font=("Arial", 11),
             width=25,
             height=2,
             bg=self.current_theme['button_bg'],
             fg=self.current_theme['button_fg'],
             cursor='hand2'
-        )
+        ))
         view_button.pack(pady=(0, 10))
         ToolTip(view_button, "Click to view the database contents in a new window")
+        
+        export_button = self.themed(tk.Button(
+            section_frame, 
+            text="Export Data",
+            command=self.profiler.wrap('edit.export_data', editsql.export_data),
+            font=("Arial", 11),
+            width=25,
+            bg=self.current_theme['button_bg'],
+            fg=self.current_theme['button_fg'],
+            cursor='hand2'
+        ))
+        export_button.pack(pady=(0, 10))
+        ToolTip(export_button, "Stream a table, filtered rows or a query result to CSV, compressed CSV or Parquet")
 
     def add_delete_table_section(self):
         """Section to add or delete tables"""
-        table_frame = tk.Frame(self.window, bg=self.current_theme['bg'])
+        table_frame = self.themed(tk.Frame(self.window, bg=self.current_theme['bg']))
         table_frame.pack(pady=0, padx=20, fill='x')
         
         # Create a bordered section
-        section_frame = tk.Frame(table_frame, bg=self.current_theme['bg'], relief='ridge', bd=2)
+        section_frame = self.themed(tk.Frame(table_frame, bg=self.current_theme['bg'], relief='ridge', bd=2))
         section_frame.pack(fill='x', padx=10, pady=5)
         
-        table_label = tk.Label(
+        table_label = self.themed(tk.Label(
             section_frame, 
             text="🗃️ Manage Tables", 
             font=("Arial", 14, "bold"), 
             bg=self.current_theme['bg'], 
             fg=self.current_theme['text']
-        )
+        ))
         table_label.pack(pady=10)
 
         # Input section
-        input_frame = tk.Frame(section_frame, bg=self.current_theme['bg'])
+        input_frame = self.themed(tk.Frame(section_frame, bg=self.current_theme['bg']))
         input_frame.pack(pady=5)
         
         # Button section
-        button_frame = tk.Frame(section_frame, bg=self.current_theme['bg'])
+        button_frame = self.themed(tk.Frame(section_frame, bg=self.current_theme['bg']))
         button_frame.pack(pady=10)
         
-        add_table_button = tk.Button(
+        add_table_button = self.themed(tk.Button(
             button_frame, 
             text="Add Table", 
-            command=editsql.add_table,
+            command=self.profiler.wrap('edit.add_table', editsql.add_table),
             font=("Arial", 11),
             width=15,
             bg=self.current_theme['convert_bg'],
             fg=self.current_theme['convert_fg'],
             cursor='hand2'
-        )
+        ))
         add_table_button.pack(side='left', padx=5)
         self.register_special_widget(add_table_button, 'convert')
         
-        delete_table_button = tk.Button(
+        delete_table_button = self.themed(tk.Button(
             button_frame, 
             text="Delete Table", 
-            command=editsql.delete_table,
+            command=self.profiler.wrap('edit.delete_table', editsql.delete_table),
             font=("Arial", 11),
             width=15,
             bg=self.current_theme['exit_bg'],
             fg=self.current_theme['exit_fg'],
             cursor='hand2'
-        )
+        ))
         delete_table_button.pack(side='left', padx=5)
         self.register_special_widget(delete_table_button, 'exit')
 
     def add_delete_record_section(self):
         """Section to add or delete records"""
-        record_frame = tk.Frame(self.window, bg=self.current_theme['bg'])
+        record_frame = self.themed(tk.Frame(self.window, bg=self.current_theme['bg']))
         record_frame.pack(pady=0, padx=20, fill='x')
         
         # Create a bordered section
-        section_frame = tk.Frame(record_frame, bg=self.current_theme['bg'], relief='ridge', bd=2)
+        section_frame = self.themed(tk.Frame(record_frame, bg=self.current_theme['bg'], relief='ridge', bd=2))
         section_frame.pack(fill='x', padx=10, pady=5)
         
-        record_label = tk.Label(
+        record_label = self.themed(tk.Label(
             section_frame, 
             text="📝 Manage Records", 
             font=("Arial", 14, "bold"), 
             bg=self.current_theme['bg'], 
             fg=self.current_theme['text']
-        )
+        ))
         record_label.pack(pady=10)
         
         # Button section
-        button_frame = tk.Frame(section_frame, bg=self.current_theme['bg'])
+        button_frame = self.themed(tk.Frame(section_frame, bg=self.current_theme['bg']))
         button_frame.pack(pady=10)
         
-        add_record_button = tk.Button(
+        add_record_button = self.themed(tk.Button(
             button_frame, 
             text="Add Record", 
-            command=editsql.add_record,
+            command=self.profiler.wrap('edit.add_record', editsql.add_record),
             font=("Arial", 11),
             width=15,
             bg=self.current_theme['convert_bg'],
             fg=self.current_theme['convert_fg'],
             cursor='hand2'
-        )
+        ))
         add_record_button.pack(side='left', padx=5)
         self.register_special_widget(add_record_button, 'convert')
         
-        delete_record_button = tk.Button(
+        delete_record_button = self.themed(tk.Button(
             button_frame, 
             text="Delete Record", 
-            command=editsql.delete_record,
+            command=self.profiler.wrap('edit.delete_record', editsql.delete_record),
             font=("Arial", 11),
             width=15,
             bg=self.current_theme['exit_bg'],
             fg=self.current_theme['exit_fg'],
             cursor='hand2'
-        )
+        ))
         delete_record_button.pack(side='left', padx=5)
         self.register_special_widget(delete_record_button, 'exit')
 
     def add_delete_column_section(self):
         """Section to add or delete columns"""
-        column_frame = tk.Frame(self.window, bg=self.current_theme['bg'])
+        column_frame = self.themed(tk.Frame(self.window, bg=self.current_theme['bg']))
         column_frame.pack(pady=0, padx=20, fill='x')
         
         # Create a bordered section
-        section_frame = tk.Frame(column_frame, bg=self.current_theme['bg'], relief='ridge', bd=2)
+        section_frame = self.themed(tk.Frame(column_frame, bg=self.current_theme['bg'], relief='ridge', bd=2))
         section_frame.pack(fill='x', padx=10, pady=5)
         
-        column_label = tk.Label(
+        column_label = self.themed(tk.Label(
             section_frame, 
             text="🏛️ Manage Columns", 
             font=("Arial", 14, "bold"), 
             bg=self.current_theme['bg'], 
             fg=self.current_theme['text']
-        )
+        ))
         column_label.pack(pady=10)
         
         # Button section
-        button_frame = tk.Frame(section_frame, bg=self.current_theme['bg'])
+        button_frame = self.themed(tk.Frame(section_frame, bg=self.current_theme['bg']))
         button_frame.pack(pady=10)
         
-        add_column_button = tk.Button(
+        add_column_button = self.themed(tk.Button(
             button_frame, 
             text="Add Column", 
-            command=editsql.add_column,
+            command=self.profiler.wrap('edit.add_column', editsql.add_column),
             font=("Arial", 11),
             width=15,
             bg=self.current_theme['convert_bg'],
             fg=self.current_theme['convert_fg'],
             cursor='hand2'
-        )
+        ))
         add_column_button.pack(side='left', padx=5)
         self.register_special_widget(add_column_button, 'convert')
         
-        delete_column_button = tk.Button(
+        delete_column_button = self.themed(tk.Button(
             button_frame, 
             text="Delete Column", 
-            command=editsql.delete_column,
+            command=self.profiler.wrap('edit.delete_column', editsql.delete_column),
             font=("Arial", 11),
             width=15,
             bg=self.current_theme['exit_bg'],
             fg=self.current_theme['exit_fg'],
             cursor='hand2'
-        )
+        ))
         delete_column_button.pack(side='left', padx=5)
         self.register_special_widget(delete_column_button, 'exit')
 
     def edit_record_section(self):
         """Section to edit records"""
-        edit_frame = tk.Frame(self.window, bg=self.current_theme['bg'])
+        edit_frame = self.themed(tk.Frame(self.window, bg=self.current_theme['bg']))
         edit_frame.pack(pady=0, padx=20, fill='x')
         
         # Create a bordered section
-        section_frame = tk.Frame(edit_frame, bg=self.current_theme['bg'], relief='ridge', bd=2)
+        section_frame = self.themed(tk.Frame(edit_frame, bg=self.current_theme['bg'], relief='ridge', bd=2))
         section_frame.pack(fill='x', padx=10, pady=5)
         
-        edit_label = tk.Label(
+        edit_label = self.themed(tk.Label(
             section_frame, 
             text="✏️ Edit Records", 
             font=("Arial", 14, "bold"), 
             bg=self.current_theme['bg'], 
             fg=self.current_theme['text']
-        )
+        ))
         edit_label.pack(pady=10)
         
         # Button section
-        button_frame = tk.Frame(section_frame, bg=self.current_theme['bg'])
+        button_frame = self.themed(tk.Frame(section_frame, bg=self.current_theme['bg']))
         button_frame.pack(pady=10)
         
-        edit_record_button = tk.Button(
+        edit_record_button = self.themed(tk.Button(
             button_frame, 
             text="Edit Record", 
-            command=editsql.edit_record,
+            command=self.profiler.wrap('edit.edit_record', editsql.edit_record),
             font=("Arial", 11),
             width=15,
             bg=self.current_theme['edit_bg'],
             fg=self.current_theme['edit_fg'],
             cursor='hand2'
-        )
+        ))
         edit_record_button.pack(pady=5)
         self.register_special_widget(edit_record_button, 'edit')
 
     def create_control_buttons(self):
         """Create control buttons"""
-        button_frame = tk.Frame(self.window, bg=self.current_theme['bg'])
+        button_frame = self.themed(tk.Frame(self.window, bg=self.current_theme['bg']))
         button_frame.pack(pady=30)
         
         # Info/Help button
-        help_button = tk.Button(
+        help_button = self.themed(tk.Button(
             button_frame, 
             text="Help & Info",
             command=self.show_help,
@@ -305,12 +332,12 @@ class editgui(ThemableWindow):
             bg=self.current_theme['button_bg'],
             fg=self.current_theme['button_fg'],
             cursor='hand2'
-        )
+        ))
         help_button.pack(side='left', padx=10)
         ToolTip(help_button, "Show help information about database editing")
         
         # Close button
-        done_button = tk.Button(
+        done_button = self.themed(tk.Button(
             button_frame, 
             text="Close",
             command=self.close_setup,
@@ -320,11 +347,11 @@ class editgui(ThemableWindow):
             bg=self.current_theme['button_bg'],
             fg=self.current_theme['button_fg'],
             cursor='hand2'
-        )
+        ))
         done_button.pack(side='left', padx=10)
         
         # Cancel button
-        cancel_button = tk.Button(
+        cancel_button = self.themed(tk.Button(
             button_frame, 
             text="Cancel",
             command=self.cancel_operation,
@@ -334,7 +361,7 @@ class editgui(ThemableWindow):
             bg=self.current_theme['exit_bg'],
             fg=self.current_theme['exit_fg'],
             cursor='hand2'
-        )
+        ))
         cancel_button.pack(side='left', padx=10)
         self.register_special_widget(cancel_button, 'exit')
 
@@ -343,6 +370,7 @@ class editgui(ThemableWindow):
         help_text = """Database Editing Tools Help:
 
 🔍 View Database: Display all tables and their contents
+📤 Export Data: Save a table, filtered rows or a query to CSV, CSV.gz or Parquet
 📊 Add Table: Create a new table in the database
 🗑️ Delete Table: Remove an existing table
 ➕ Add Record: Insert new data into a table
@@ -361,29 +389,13 @@ Note: Always backup your database before making changes!"""
                                     "Are you sure you want to cancel?\n"
                                     "Any unsaved changes will be lost.")
         if response:
-            # Call the parent's cleanup if it exists
-            if hasattr(self.parent, 'edit_window') and self.parent.edit_window == self:
-                self.parent.edit_window = None
-            
-            # Unregister from theme callbacks before destroying
-            try:
-                self.theme_manager.unregister_theme_callback(self.on_theme_changed)
-            except:
-                pass
+            # Cleanup and the close event run from on_destroy
             self.window.destroy()
 
     def close_setup(self):
         """Close the setup window"""
         try:
-            # Call the parent's cleanup if it exists
-            if hasattr(self.parent, 'edit_window') and self.parent.edit_window == self:
-                self.parent.edit_window = None
-            
-            # Unregister from theme callbacks before destroying
-            try:
-                self.theme_manager.unregister_theme_callback(self.on_theme_changed)
-            except:
-                pass
+            # Cleanup and the close event run from on_destroy
             self.window.destroy()
         except Exception as e:
             print(f"Error closing window: {e}")
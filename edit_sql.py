@@ -1,8 +1,14 @@
 import sqlite3
 import tkinter as tk
 import os
-from tkinter import messagebox, simpledialog, ttk
+from tkinter import messagebox, simpledialog, ttk, filedialog
 import globals
+from db_operations import (list_tables, table_columns, fetch_page,
+                           find_records, insert_record, delete_records, update_records,
+                           add_column, delete_column)
+from export import export_table, export_query, format_export_stats
+from events import get_app_event_bus, DB_CHANGED
+from partitions import partition_parent, create_union_view
 
 
 # Custom Dialog Classes for better UX
@@ -127,22 +133,13 @@ def askoption_custom(title, prompt, options, width=500, height=350, parent=None)
 class editsql:
     @staticmethod
     def get_database_connection():
-        """Get database connection using global DB_PATH and DB_NAME"""
-        if not globals.DB_PATH:
-            messagebox.showerror("Database Error", "No database path specified in globals.")
-            return None
-        
-        if not globals.DB_NAME:
-            messagebox.showerror("Database Error", "No database name specified in globals.")
+        """Get database connection to the active database (globals.ACTIVE_DATABASE)"""
+        if not globals.ACTIVE_DATABASE:
+            messagebox.showerror("Database Error", "No database selected. Set up a conversion first.")
             return None
         
         try:
-            # Construct full database path
-            db_file = globals.DB_NAME
-            if not db_file.lower().endswith('.db'):
-                db_file += '.db'
-            
-            full_db_path = os.path.join(globals.DB_PATH, db_file)
+            full_db_path = globals.ACTIVE_DATABASE
             
             # Check if database file exists
             if not os.path.exists(full_db_path):
@@ -155,6 +152,11 @@ class editsql:
             messagebox.showerror("Database Error", f"Failed to connect to database: {str(e)}")
             return None
 
+    @staticmethod
+    def _notify_changed(table_name, action):
+        """Tell subscribers (status displays, open viewers) that the database was modified"""
+        get_app_event_bus().publish(DB_CHANGED, database=globals.ACTIVE_DATABASE, table=table_name, action=action)
+
     @staticmethod
     def view_database():
         """View database contents in a new window"""
@@ -164,11 +166,8 @@ class editsql:
         
         view_window = None
         try:
-            cursor = conn.cursor()
-            
             # Get all table names
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = cursor.fetchall()
+            tables = list_tables(conn)
             
             if not tables:
                 messagebox.showinfo("Database Viewer", "Database is empty (no tables found)")
@@ -209,9 +208,7 @@ class editsql:
             notebook.pack(fill=tk.BOTH, expand=True)
             
             # Create tab for each table
-            for table in tables:
-                table_name = table[0]
-                
+            for table_name in tables:
                 # Create frame for this table
                 table_frame = ttk.Frame(notebook)
                 notebook.add(table_frame, text=table_name)
@@ -227,9 +224,7 @@ class editsql:
                 tree = ttk.Treeview(tree_frame)
                 
                 # Get column information
-                cursor.execute(f"PRAGMA table_info([{table_name}])")
-                columns_info = cursor.fetchall()
-                column_names = [col[1] for col in columns_info]
+                column_names = [name for name, _ in table_columns(conn, table_name)]
                 
                 # Configure treeview columns
                 tree['columns'] = column_names
@@ -239,9 +234,8 @@ class editsql:
                     tree.heading(col, text=col)
                     tree.column(col, width=120, minwidth=80)
                 
-                # Get table data - properly quote table name
-                cursor.execute(f"SELECT * FROM [{table_name}]")
-                rows = cursor.fetchall()
+                # Get table data (LIMIT -1: all rows)
+                rows = fetch_page(conn, table_name, limit=-1)
                 
                 # Insert data into treeview
                 for i, row in enumerate(rows):
@@ -363,6 +357,7 @@ class editsql:
             cursor.execute(f"CREATE TABLE [{table_name}] ({columns_sql})")
             conn.commit()
             
+            editsql._notify_changed(table_name, 'add_table')
             messagebox.showinfo("Success", f"Table '{table_name}' created successfully!")
             
         except sqlite3.Error as e:
@@ -381,17 +376,13 @@ class editsql:
             cursor = conn.cursor()
             
             # Get all table names
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = cursor.fetchall()
+            table_names = list_tables(conn)
             
-            if not tables:
+            if not table_names:
                 messagebox.showinfo("No Tables", "No tables found in database")
                 conn.close()
                 return
             
-            # Create selection dialog
-            table_names = [table[0] for table in tables]
-            
             # Use custom option dialog for better UX
             table_name = askoption_custom("Delete Table", 
                 "Select the table you want to delete:\n\n⚠️ Warning: This action cannot be undone!", 
@@ -409,8 +400,13 @@ class editsql:
             
             # Delete table - properly quote table name
             cursor.execute(f"DROP TABLE [{table_name}]")
+            # A deleted partition leaves the view over the remaining partitions
+            parent = partition_parent(conn, table_name)
+            if parent:
+                create_union_view(conn, parent)
             conn.commit()
             
+            editsql._notify_changed(table_name, 'delete_table')
             messagebox.showinfo("Success", f"Table '{table_name}' deleted successfully!")
             
         except sqlite3.Error as e:
@@ -426,17 +422,13 @@ class editsql:
             return
         
         try:
-            cursor = conn.cursor()
-            
             # Get table names
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = cursor.fetchall()
-            if not tables:
+            table_names = list_tables(conn)
+            if not table_names:
                 messagebox.showinfo("No Tables", "No tables found in database")
                 conn.close()
                 return
-            
-            table_names = [table[0] for table in tables]
+
             table_name = askoption_custom("Select Table",
                 "Select the table you want to add a record to:",
                 table_names, width=500, height=350)
@@ -445,10 +437,9 @@ class editsql:
                 return
             
             # Get column info
-            cursor.execute(f"PRAGMA table_info([{table_name}])")
-            columns_info = cursor.fetchall()
-            column_names = [col[1] for col in columns_info]
-            column_types = [col[2] for col in columns_info]
+            columns_info = table_columns(conn, table_name)
+            column_names = [name for name, _ in columns_info]
+            column_types = [col_type for _, col_type in columns_info]
             
             # Let user choose columns to fill
             chosen_columns = []
@@ -496,13 +487,10 @@ class editsql:
                     else:
                         values_dict[col] = val
             
-            # Build insert query only for chosen columns
-            cols_sql = ", ".join(f"[{c}]" for c in values_dict.keys())
-            placeholders = ", ".join("?" for _ in values_dict)
-            cursor.execute(f"INSERT INTO [{table_name}] ({cols_sql}) VALUES ({placeholders})",
-                        list(values_dict.values()))
-            conn.commit()
+            # Insert only the chosen columns
+            insert_record(conn, table_name, values_dict)
             
+            editsql._notify_changed(table_name, 'add_record')
             messagebox.showinfo("Success", f"Record added to '{table_name}' successfully!")
         
         except sqlite3.Error as e:
@@ -519,17 +507,13 @@ class editsql:
             return
         
         try:
-            cursor = conn.cursor()
-            
             # Get all table names
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = cursor.fetchall()
-            if not tables:
+            table_names = list_tables(conn)
+            if not table_names:
                 messagebox.showinfo("No Tables", "No tables found in database")
                 conn.close()
                 return
-            
-            table_names = [table[0] for table in tables]
+
             table_name = askoption_custom("Delete Record", 
                 "Select the table to delete records from:", 
                 table_names, width=500, height=350)
@@ -538,10 +522,9 @@ class editsql:
                 return
             
             # Get column information
-            cursor.execute(f"PRAGMA table_info([{table_name}])")
-            columns_info = cursor.fetchall()
-            column_names = [col[1] for col in columns_info]
-            column_types = [col[2] for col in columns_info]
+            columns_info = table_columns(conn, table_name)
+            column_names = [name for name, _ in columns_info]
+            column_types = [col_type for _, col_type in columns_info]
             
             # Let user select columns for filtering
             chosen_columns = []
@@ -563,8 +546,7 @@ class editsql:
                 return
             
             # Get filter values
-            conditions = []
-            params = []
+            filters = {}
             for col in chosen_columns:
                 col_type = column_types[column_names.index(col)]
                 val = askstring_custom("Filter Value",
@@ -574,14 +556,10 @@ class editsql:
                     messagebox.showinfo("Cancelled", "Operation cancelled.")
                     conn.close()
                     return
-                conditions.append(f"[{col}] = ?")
-                params.append(val)
-            
-            where_clause = " AND ".join(conditions)
+                filters[col] = val
             
             # Preview matching records
-            cursor.execute(f"SELECT * FROM [{table_name}] WHERE {where_clause}", params)
-            records = cursor.fetchall()
+            records = find_records(conn, table_name, filters)
             if not records:
                 messagebox.showinfo("No Records", "No records match the given criteria.")
                 conn.close()
@@ -594,10 +572,10 @@ class editsql:
                 return
             
             # Delete records
-            cursor.execute(f"DELETE FROM [{table_name}] WHERE {where_clause}", params)
-            conn.commit()
+            deleted = delete_records(conn, table_name, filters)
             
-            messagebox.showinfo("Success", f"Deleted {cursor.rowcount} record(s) from '{table_name}'.")
+            editsql._notify_changed(table_name, 'delete_record')
+            messagebox.showinfo("Success", f"Deleted {deleted} record(s) from '{table_name}'.")
         
         except sqlite3.Error as e:
             messagebox.showerror("Database Error", f"Failed to delete record: {str(e)}")
@@ -613,18 +591,14 @@ class editsql:
             return
         
         try:
-            cursor = conn.cursor()
-            
             # Get all table names
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = cursor.fetchall()
+            table_names = list_tables(conn)
             
-            if not tables:
+            if not table_names:
                 messagebox.showinfo("No Tables", "No tables found in database")
                 conn.close()
                 return
-            
-            table_names = [table[0] for table in tables]
+
             table_name = askoption_custom("Add Column", 
                 "Select the table to add a column to:", 
                 table_names, width=500, height=350)
@@ -654,13 +628,9 @@ class editsql:
                 width=500, height=300)
             
             # Add column - properly quote table and column names
-            sql = f"ALTER TABLE [{table_name}] ADD COLUMN [{column_name}] {column_type.upper()}"
-            if default_value:
-                sql += f" DEFAULT '{default_value}'"
-            
-            cursor.execute(sql)
-            conn.commit()
+            add_column(conn, table_name, column_name, column_type, default_value)
             
+            editsql._notify_changed(table_name, 'add_column')
             messagebox.showinfo("Success", f"Column '{column_name}' added to table '{table_name}' successfully!")
             
         except sqlite3.Error as e:
@@ -676,18 +646,14 @@ class editsql:
             return
         
         try:
-            cursor = conn.cursor()
-            
             # Get all table names
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = cursor.fetchall()
+            table_names = list_tables(conn)
             
-            if not tables:
+            if not table_names:
                 messagebox.showinfo("No Tables", "No tables found in database")
                 conn.close()
                 return
-            
-            table_names = [table[0] for table in tables]
+
             table_name = askoption_custom("Delete Column", 
                 "Select the table to delete a column from:", 
                 table_names, width=500, height=350)
@@ -697,9 +663,7 @@ class editsql:
                 return
             
             # Get column information - properly quote table name
-            cursor.execute(f"PRAGMA table_info([{table_name}])")
-            columns_info = cursor.fetchall()
-            column_names = [col[1] for col in columns_info]
+            column_names = [name for name, _ in table_columns(conn, table_name)]
             
             column_to_delete = askoption_custom("Delete Column", 
                 f"Select the column to delete from table '{table_name}':\n\n⚠️ Warning: This will recreate the table without this column.\nThis action cannot be undone!", 
@@ -716,29 +680,15 @@ class editsql:
                 conn.close()
                 return
             
-            # SQLite doesn't support DROP COLUMN directly, so we need to recreate the table
-            remaining_columns = [col for col in column_names if col != column_to_delete]
-            
-            if not remaining_columns:
+            if len(column_names) == 1:
                 messagebox.showerror("Error", "Cannot delete the last column from a table")
                 conn.close()
                 return
             
-            # Create new table without the column
-            temp_table = f"{table_name}_temp"
-            columns_sql = ", ".join([f"[{col}]" for col in remaining_columns])  # Quote column names
-            
-            # Create temporary table with remaining columns - properly quote all names
-            cursor.execute(f"CREATE TABLE [{temp_table}] AS SELECT {columns_sql} FROM [{table_name}]")
-            
-            # Drop original table - properly quote table name
-            cursor.execute(f"DROP TABLE [{table_name}]")
-            
-            # Rename temporary table - properly quote table names
-            cursor.execute(f"ALTER TABLE [{temp_table}] RENAME TO [{table_name}]")
-            
-            conn.commit()
+            # SQLite doesn't support DROP COLUMN directly, so the table is recreated
+            delete_column(conn, table_name, column_to_delete)
             
+            editsql._notify_changed(table_name, 'delete_column')
             messagebox.showinfo("Success", f"Column '{column_to_delete}' deleted from table '{table_name}' successfully!")
             
         except sqlite3.Error as e:
@@ -754,18 +704,14 @@ class editsql:
             return
         
         try:
-            cursor = conn.cursor()
-            
             # Get all table names
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = cursor.fetchall()
+            table_names = list_tables(conn)
             
-            if not tables:
+            if not table_names:
                 messagebox.showinfo("No Tables", "No tables found in database")
                 conn.close()
                 return
-            
-            table_names = [table[0] for table in tables]
+
             table_name = askoption_custom("Edit Record", 
                 "Select the table containing the record to edit:", 
                 table_names, width=500, height=350)
@@ -775,9 +721,7 @@ class editsql:
                 return
             
             # Get column information - properly quote table name
-            cursor.execute(f"PRAGMA table_info([{table_name}])")
-            columns_info = cursor.fetchall()
-            column_names = [col[1] for col in columns_info]
+            column_names = [name for name, _ in table_columns(conn, table_name)]
             
             # Get WHERE condition to identify record
             where_column = askoption_custom("Identify Record", 
@@ -797,8 +741,7 @@ class editsql:
                 return
             
             # Show current record - properly quote table and column names
-            cursor.execute(f"SELECT * FROM [{table_name}] WHERE [{where_column}] = ?", (where_value,))
-            records = cursor.fetchall()
+            records = find_records(conn, table_name, {where_column: where_value})
             
             if not records:
                 messagebox.showinfo("No Records", f"No records found with {where_column} = '{where_value}'")
@@ -836,16 +779,103 @@ class editsql:
                 new_value = None
             
             # Update record - properly quote table and column names
-            cursor.execute(f"UPDATE [{table_name}] SET [{edit_column}] = ? WHERE [{where_column}] = ?", 
-                         (new_value, where_value))
-            conn.commit()
+            update_records(conn, table_name, edit_column, new_value, where_column, where_value)
             
+            editsql._notify_changed(table_name, 'edit_record')
             messagebox.showinfo("Success", f"Record updated successfully in table '{table_name}'!")
             
         except sqlite3.Error as e:
             messagebox.showerror("Database Error", f"Failed to edit record: {str(e)}")
         finally:
             conn.close()
+
+    # Choice in the export table list that exports a custom query instead
+    CUSTOM_QUERY = "Custom SQL query..."
+
+    @staticmethod
+    def export_data():
+        """Export a table, filtered rows or a query result to CSV, gzip CSV or Parquet"""
+        conn = editsql.get_database_connection()
+        if not conn:
+            return
+        
+        progress_window = None
+        try:
+            table_names = list_tables(conn)
+            
+            source = askoption_custom("Export Data", 
+                "Select the table to export, or export the result of a query:", 
+                table_names + [editsql.CUSTOM_QUERY], width=500, height=350)
+            if not source:
+                return
+            
+            filters = {}
+            query = None
+            if source == editsql.CUSTOM_QUERY:
+                query = askstring_custom("Export Query",
+                    "Enter a SELECT query. The database is read-only while it runs.",
+                    width=600, height=250)
+                if not query:
+                    return
+            elif messagebox.askyesno("Filter Rows", f"Export only rows of '{source}' matching a filter?"):
+                column_names = [name for name, _ in table_columns(conn, source)]
+                while True:
+                    remaining_columns = [c for c in column_names if c not in filters]
+                    if not remaining_columns:
+                        break
+                    col_choice = askoption_custom("Choose Filter Column",
+                        "Select a column to filter by (Cancel to finish selecting):",
+                        remaining_columns, width=500, height=350)
+                    if not col_choice:
+                        break
+                    val = askstring_custom("Filter Value",
+                        f"Enter value for column '{col_choice}':\nOnly records matching this will be exported.",
+                        width=500, height=300)
+                    if val is None:
+                        messagebox.showinfo("Cancelled", "Operation cancelled.")
+                        return
+                    filters[col_choice] = val
+            
+            path = filedialog.asksaveasfilename(
+                title="Export Data",
+                defaultextension=".csv",
+                initialfile="export.csv" if query else f"{source}.csv",
+                filetypes=[
+                    ("CSV files", "*.csv"),
+                    ("Compressed CSV files", "*.csv.gz"),
+                    ("Parquet files", "*.parquet"),
+                ]
+            )
+            if not path:
+                return
+            
+            # Small progress window, refreshed after every batch
+            progress_window = tk.Toplevel()
+            progress_window.title("Exporting...")
+            progress_label = tk.Label(progress_window, text="Starting export...", font=("Arial", 11), padx=30, pady=20)
+            progress_label.pack()
+            
+            def on_progress(rows):
+                progress_label.config(text=f"Exported {rows:,} rows...")
+                progress_window.update()
+            
+            if query:
+                stats = export_query(conn, query, path, progress_callback=on_progress)
+            else:
+                stats = export_table(conn, source, path, filters, progress_callback=on_progress)
+            
+            progress_window.destroy()
+            progress_window = None
+            messagebox.showinfo("Export Complete", format_export_stats(stats))
+        
+        except sqlite3.Error as e:
+            messagebox.showerror("Database Error", f"Failed to export data: {str(e)}")
+        except (ImportError, ValueError, OSError) as e:
+            messagebox.showerror("Export Error", f"Failed to export data: {str(e)}")
+        finally:
+            if progress_window is not None:
+                progress_window.destroy()
+            conn.close()
                
 
             
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""
+Event Bus Module
+Lets windows and background work announce what happened (window closed,
+conversion finished, database changed, job progress) without knowing who
+listens, replacing timer-based polling between the GUI windows.
+"""
+
+import logging
+
+
+# Event names and the keyword data published with them
+WINDOW_CLOSED = 'window_closed'              # window ('conversion' | 'edit'), source
+CONVERSION_FINISHED = 'conversion_finished'  # job, success, database, table
+DB_CHANGED = 'db_changed'                    # database, table, action
+JOB_PROGRESS = 'job_progress'                # job, stage, done, total, detail
+JOB_UPDATED = 'job_updated'                  # job (queued, started, finished or cancelled)
+
+
+class EventBus:
+    """
+    Synchronous publish/subscribe dispatcher
+
+    Callbacks run immediately in the publishing thread, in subscription
+    order. Tk widgets may only be touched from the Tk thread, so events that
+    update widgets must be published from it.
+    """
+
+    def __init__(self):
+        self.subscribers = {}
+
+    def subscribe(self, event, callback):
+        """Call callback(**data) whenever event is published"""
+        callbacks = self.subscribers.setdefault(event, [])
+        if callback not in callbacks:
+            callbacks.append(callback)
+
+    def unsubscribe(self, event, callback):
+        """Stop calling callback for event"""
+        callbacks = self.subscribers.get(event, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    def publish(self, event, **data):
+        """Deliver an event to all subscribers; a failing subscriber does not stop the others"""
+        # Copy so callbacks can unsubscribe while the event is delivered
+        for callback in list(self.subscribers.get(event, [])):
+            try:
+                callback(**data)
+            except Exception as e:
+                logging.warning(f"Error in {event} subscriber: {e}")
+
+
+# Singleton instance for application-wide events
+app_event_bus = EventBus()
+
+
+def get_app_event_bus():
+    """Get the application's global event bus"""
+    return app_event_bus
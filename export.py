@@ -0,0 +1,226 @@
+"""
+Export Module
+Streams a table, a filtered table or a query result out of SQLite to CSV,
+gzip-compressed CSV or Parquet. Rows are fetched in fixed-size batches with
+fetchmany and written straight to the file, so memory use does not grow with
+the table size. Parquet export needs the optional pyarrow package.
+"""
+
+import os
+import csv
+import gzip
+import time
+
+from db_operations import table_columns, where_clause
+
+
+EXPORT_FORMATS = ('csv', 'csv.gz', 'parquet')
+
+# Rows fetched per batch; each Parquet batch becomes one row group
+CSV_BATCH_SIZE = 10_000
+PARQUET_BATCH_SIZE = 65_536
+
+
+def export_format(path):
+    """Export format implied by a file name ('csv', 'csv.gz' or 'parquet')"""
+    name = path.lower()
+    if name.endswith('.parquet'):
+        return 'parquet'
+    if name.endswith('.gz'):
+        return 'csv.gz'
+    return 'csv'
+
+
+def table_query(table_name, filters=None):
+    """
+    SELECT statement for a whole table or the rows matching equality filters
+
+    Returns:
+        tuple: (sql, params)
+    """
+    sql = f"SELECT * FROM [{table_name}]"
+    if not filters:
+        return sql, []
+    clause, params = where_clause(filters)
+    return f"{sql} WHERE {clause}", params
+
+
+def _batches(cursor, batch_size):
+    """Yield lists of row tuples until the cursor is exhausted"""
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield rows
+
+
+def _write_csv(path, columns, batches, compress, progress_callback):
+    """Write a header and all batches as CSV; returns the number of rows"""
+    if compress:
+        f = gzip.open(path, 'wt', encoding='utf-8', newline='')
+    else:
+        f = open(path, 'w', encoding='utf-8', newline='')
+    rows = 0
+    with f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for batch in batches:
+            writer.writerows(batch)
+            rows += len(batch)
+            if progress_callback:
+                progress_callback(rows)
+    return rows
+
+
+def _arrow_type(pa, declared_type, values):
+    """
+    Arrow type for a column, from its declared SQLite type (affinity rules)
+    or, for untyped columns, from the first non-NULL value
+    """
+    declared = (declared_type or '').upper()
+    if 'INT' in declared:
+        return pa.int64()
+    if any(name in declared for name in ('CHAR', 'CLOB', 'TEXT')):
+        return pa.string()
+    if any(name in declared for name in ('REAL', 'FLOA', 'DOUB')):
+        return pa.float64()
+    if 'BLOB' in declared:
+        return pa.binary()
+
+    sample = next((value for value in values if value is not None), None)
+    if isinstance(sample, int):
+        return pa.int64()
+    if isinstance(sample, float):
+        return pa.float64()
+    if isinstance(sample, bytes):
+        return pa.binary()
+    return pa.string()
+
+
+def _write_parquet(path, columns, batches, column_types, progress_callback):
+    """Write all batches to a Parquet file, one row group per batch; returns the number of rows"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet export needs the pyarrow package (pip install pyarrow)")
+
+    rows = 0
+    writer = None
+    try:
+        for batch in batches:
+            values = list(zip(*batch))
+            if writer is None:
+                # The schema is fixed by the first batch
+                schema = pa.schema([(name, _arrow_type(pa, column_types.get(name), column_values))
+                                    for name, column_values in zip(columns, values)])
+                writer = pq.ParquetWriter(path, schema)
+
+            arrays = []
+            for field, column_values in zip(schema, values):
+                if pa.types.is_string(field.type):
+                    # SQLite columns are loosely typed: store any non-text value as text
+                    column_values = [None if value is None else str(value) for value in column_values]
+                try:
+                    # pyarrow would silently truncate REAL values stored in INTEGER columns
+                    if pa.types.is_integer(field.type) and any(isinstance(value, float) for value in column_values):
+                        raise pa.ArrowInvalid("non-integer value")
+                    arrays.append(pa.array(column_values, type=field.type))
+                except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+                    raise ValueError(f"Column '{field.name}' has values that are not {field.type}; "
+                                     "export it to CSV instead")
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            rows += len(batch)
+            if progress_callback:
+                progress_callback(rows)
+
+        if writer is None:
+            # No rows: still write a valid file with the column names
+            schema = pa.schema([(name, _arrow_type(pa, column_types.get(name), [])) for name in columns])
+            writer = pq.ParquetWriter(path, schema)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def export_query(conn, sql, path, params=(), fmt=None, batch_size=None,
+                 column_types=None, progress_callback=None):
+    """
+    Stream the result of a query to a file
+
+    The connection is switched to read-only (PRAGMA query_only) while the
+    query runs, so a user-supplied statement cannot modify the database.
+    The file is written under a temporary name and only replaces path once
+    the export is complete.
+
+    Args:
+        conn: Open sqlite3 connection
+        sql (str): Query returning the rows to export
+        path (str): Output file
+        params: Query parameters
+        fmt (str): One of EXPORT_FORMATS; derived from path if None
+        batch_size (int): Rows per fetchmany batch
+        column_types (dict): Declared SQLite type per column, used for Parquet types
+        progress_callback (callable): Called with the number of rows written after each batch
+
+    Returns:
+        dict: path, format, rows, bytes, seconds, rows_per_second and mb_per_second
+    """
+    fmt = fmt or export_format(path)
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Export format must be one of: {', '.join(EXPORT_FORMATS)}")
+    batch_size = batch_size or (PARQUET_BATCH_SIZE if fmt == 'parquet' else CSV_BATCH_SIZE)
+
+    start = time.perf_counter()
+    temp_path = path + '.part'
+    conn.execute("PRAGMA query_only = ON")
+    try:
+        cursor = conn.execute(sql, params)
+        if cursor.description is None:
+            raise ValueError("The statement does not return rows")
+        columns = [description[0] for description in cursor.description]
+        batches = _batches(cursor, batch_size)
+
+        if fmt == 'parquet':
+            rows = _write_parquet(temp_path, columns, batches, column_types or {}, progress_callback)
+        else:
+            rows = _write_csv(temp_path, columns, batches, fmt == 'csv.gz', progress_callback)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    finally:
+        conn.execute("PRAGMA query_only = OFF")
+
+    seconds = time.perf_counter() - start
+    size = os.path.getsize(path)
+    return {
+        'path': path,
+        'format': fmt,
+        'rows': rows,
+        'bytes': size,
+        'seconds': seconds,
+        'rows_per_second': rows / seconds if seconds else 0.0,
+        'mb_per_second': size / (1024 * 1024) / seconds if seconds else 0.0,
+    }
+
+
+def export_table(conn, table_name, path, filters=None, **kwargs):
+    """
+    Stream a table, or its rows matching equality filters, to a file
+
+    Takes the same keyword arguments as export_query; Parquet column types
+    follow the declared column types of the table.
+    """
+    sql, params = table_query(table_name, filters)
+    column_types = dict(table_columns(conn, table_name))
+    return export_query(conn, sql, path, params, column_types=column_types, **kwargs)
+
+
+def format_export_stats(stats):
+    """One-paragraph summary of an export for message boxes and logs"""
+    return (f"Exported {stats['rows']:,} rows to {os.path.basename(stats['path'])} "
+            f"({stats['bytes'] / (1024 * 1024):.1f} MB) in {stats['seconds']:.2f}s\n"
+            f"Throughput: {stats['rows_per_second']:,.0f} rows/s, {stats['mb_per_second']:.1f} MB/s")
@@ -0,0 +1,224 @@
+"""
+External Sort Module
+Sorts the transformed rows of a conversion by key before they are inserted.
+Rows arriving in primary key order fill the table's B-tree one page after
+another instead of splitting pages all over it, so a WITHOUT ROWID or
+INTEGER PRIMARY KEY table loads faster and comes out compact; sorting a
+rowid table by an index's columns clusters rows that index lookups read
+together.
+
+Rows are collected in memory up to a share of the memory budget, sorted and
+written to a temporary run file as pickled chunks; the runs are then merged
+a few chunks at a time. Input that fits in the budget is sorted in memory
+and never touches the disk.
+"""
+
+import os
+import pickle
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+
+from pipeline import memory_budget_mb, MAX_BATCH_ROWS, MEASURE_ROWS
+
+
+# Share of the memory budget the rows of one run may use before it is written out
+SORT_MEMORY_SHARE = 0.5
+
+# Rows per pickled chunk of a run file, the unit the merge reads
+RUN_CHUNK_ROWS = 10_000
+
+# Helper columns that make the merge order total: ties keep their input order
+_RUN = '__sort_run'
+_POS = '__sort_pos'
+
+
+def parse_sort_columns(sort_input, key_columns, index_specs):
+    """
+    Columns the sort_input option sorts by
+
+    Args:
+        sort_input: True for the primary key (or, without one, the columns of the
+                    first index), or a column name, comma separated names or a list of names
+        key_columns (list): Primary key columns
+        index_specs (list): Parsed index definitions (see indexes.parse_index_spec)
+
+    Returns:
+        list: Column names, or None if the input is not sorted
+    """
+    if not sort_input:
+        return None
+    if sort_input is True:
+        columns = key_columns or (index_specs[0]['columns'] if index_specs else [])
+        if not columns:
+            raise ValueError("Sorting the input needs a primary key, an index or sort columns")
+        return list(columns)
+    if isinstance(sort_input, str):
+        sort_input = sort_input.split(',')
+    return [str(col).strip() for col in sort_input if str(col).strip()]
+
+
+class ExternalSorter:
+    """
+    Sorts batches of any total size with bounded memory
+
+    Call add() with every batch, then iterate sorted_batches(). Batches must
+    have the same columns; their index (the row numbers of the conversion)
+    travels with the rows. Rows with equal keys keep their input order and
+    empty keys sort last.
+    """
+
+    def __init__(self, columns, budget_mb=None):
+        """
+        Args:
+            columns (list): Columns to sort by, most significant first
+            budget_mb (float): Conversion memory budget (see pipeline.memory_budget_mb);
+                               a run holds SORT_MEMORY_SHARE of it
+        """
+        if not columns:
+            raise ValueError("No columns to sort by")
+        self.columns = list(columns)
+        self.max_bytes = memory_budget_mb(budget_mb) * SORT_MEMORY_SHARE * 1024 * 1024
+        self.batches = []
+        self.batch_bytes = 0
+        self.bytes_per_row = 1
+        self.rows = 0
+        self.runs = []
+        self.temp_dir = None
+
+    def add(self, batch):
+        """Collect a batch, writing a sorted run once the collected rows outgrow the budget"""
+        if batch.empty:
+            return
+        missing = [col for col in self.columns if col not in batch.columns]
+        if missing:
+            raise ValueError(f"Sort column(s) not found in input: {', '.join(missing)}")
+        sample = batch.head(MEASURE_ROWS)
+        bytes_per_row = sample.memory_usage(deep=True, index=False).sum() / len(sample)
+        self.bytes_per_row = max(self.bytes_per_row, bytes_per_row)
+        self.batches.append(batch)
+        self.batch_bytes += bytes_per_row * len(batch)
+        self.rows += len(batch)
+        if self.batch_bytes > self.max_bytes:
+            self._write_run()
+
+    def _sort(self, df, columns):
+        try:
+            return df.sort_values(columns, kind='stable', na_position='last')
+        except TypeError as e:
+            # e.g. text left in a numeric column
+            raise ValueError(f"Cannot sort by {', '.join(self.columns)}: mixed value types ({e})")
+
+    def _collected(self):
+        """The collected batches as one sorted DataFrame"""
+        df = pd.concat(self.batches) if len(self.batches) > 1 else self.batches[0]
+        self.batches = []
+        self.batch_bytes = 0
+        return self._sort(df, self.columns)
+
+    def _write_run(self):
+        """Sort the collected rows and write them to a new run file"""
+        run = self._collected()
+        if self.temp_dir is None:
+            self.temp_dir = tempfile.mkdtemp(prefix='csvsql-sort-')
+        path = os.path.join(self.temp_dir, f"run_{len(self.runs)}.pkl")
+        with open(path, 'wb') as f:
+            for start in range(0, len(run), RUN_CHUNK_ROWS):
+                pickle.dump(run.iloc[start:start + RUN_CHUNK_ROWS], f, protocol=pickle.HIGHEST_PROTOCOL)
+        self.runs.append(path)
+
+    def sorted_batches(self, batch_rows=MAX_BATCH_ROWS):
+        """
+        Yield all rows added, in key order
+
+        Args:
+            batch_rows (int): Rows per yielded batch
+        """
+        if not self.runs:
+            if self.batches:
+                df = self._collected()
+                for start in range(0, len(df), batch_rows):
+                    yield df.iloc[start:start + batch_rows]
+            return
+        if self.batches:
+            self._write_run()
+        yield from self._merge(batch_rows)
+
+    def _read_run(self, path):
+        """Chunks of a run file, in order"""
+        with open(path, 'rb') as f:
+            while True:
+                try:
+                    yield pickle.load(f)
+                except EOFError:
+                    return
+
+    def _merge(self, batch_rows):
+        """
+        Merge the run files
+
+        Every run contributes rows up to its frontier, the last row loaded from
+        it. All loaded rows up to the smallest frontier of a run that still has
+        rows on disk are in final order: they are emitted, and that run loads
+        its next chunks. Each run loads about its share of the memory budget
+        at a time.
+        """
+        load_rows = max(RUN_CHUNK_ROWS, int(self.max_bytes / self.bytes_per_row / len(self.runs)))
+        readers = [self._read_run(path) for path in self.runs]
+        loaded = [0] * len(readers)
+        frontier = {}   # run -> _POS of its last loaded row, while it has rows on disk
+        # _RUN and _POS combined into one id, to find frontier rows
+        shift = np.int64(1) << np.int64(40)
+
+        def load(run):
+            chunks = []
+            rows = 0
+            for chunk in readers[run]:
+                chunks.append(chunk)
+                rows += len(chunk)
+                if rows >= load_rows:
+                    break
+            else:
+                # Nothing left on disk: the run no longer bounds what can be emitted
+                frontier.pop(run, None)
+            if not chunks:
+                return None
+            df = pd.concat(chunks) if len(chunks) > 1 else chunks[0]
+            df = df.assign(**{_RUN: run, _POS: np.arange(loaded[run], loaded[run] + len(df))})
+            loaded[run] += len(df)
+            if rows >= load_rows:
+                frontier[run] = loaded[run] - 1
+            return df
+
+        try:
+            pending = [load(run) for run in range(len(readers))]
+            while True:
+                frames = [frame for frame in pending if frame is not None and len(frame)]
+                if not frames:
+                    return
+                merged = self._sort(pd.concat(frames) if len(frames) > 1 else frames[0],
+                                    self.columns + [_RUN, _POS])
+                if frontier:
+                    ids = merged[_RUN].to_numpy(dtype=np.int64) * shift + merged[_POS].to_numpy(dtype=np.int64)
+                    bounds = [run * shift + pos for run, pos in frontier.items()]
+                    end = int(np.flatnonzero(np.isin(ids, bounds))[0]) + 1
+                    bound_run = int(merged[_RUN].iat[end - 1])
+                else:
+                    end = len(merged)
+                done = merged.iloc[:end].drop(columns=[_RUN, _POS])
+                for start in range(0, len(done), batch_rows):
+                    yield done.iloc[start:start + batch_rows]
+                if not frontier:
+                    return
+                pending = [merged.iloc[end:], load(bound_run)]
+        finally:
+            # Release the run files even if the merge is abandoned
+            for reader in readers:
+                reader.close()
+
+    def close(self):
+        """Remove the run files"""
+        if self.temp_dir is not None:
+            shutil.rmtree(self.temp_dir, ignore_errors=True)
+            self.temp_dir = None
@@ -0,0 +1,133 @@
+"""
+Fingerprint Module
+Records a fingerprint of each converted source so unchanged files are not converted again.
+"""
+
+import os
+import json
+import hashlib
+import sqlite3
+import time
+import globals
+
+
+METADATA_TABLE = f"{globals.INTERNAL_TABLE_PREFIX}fingerprints"
+
+# Files up to this size are hashed completely, larger ones by sampled blocks
+FULL_HASH_LIMIT = 4 * 1024 * 1024
+BLOCK_SIZE = 64 * 1024
+SAMPLE_BLOCKS = 32
+
+
+def hash_file_sample(path, size):
+    """
+    Hash a file quickly by reading evenly spaced blocks instead of the whole file
+
+    The first and last blocks are always included, so header changes and
+    appended rows are detected.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(size).encode())
+
+    with open(path, 'rb') as f:
+        if size <= FULL_HASH_LIMIT:
+            for block in iter(lambda: f.read(BLOCK_SIZE), b''):
+                digest.update(block)
+        else:
+            last_offset = size - BLOCK_SIZE
+            for i in range(SAMPLE_BLOCKS):
+                f.seek(last_offset * i // (SAMPLE_BLOCKS - 1))
+                digest.update(f.read(BLOCK_SIZE))
+
+    return digest.hexdigest()
+
+
+def compute_fingerprint(path, options=None):
+    """
+    Build the fingerprint of a source file and the options used to convert it
+
+    Args:
+        path (str): Source file path
+        options (dict): Conversion options that change the output (JSON serializable)
+
+    Returns:
+        dict: source_path, size, mtime_ns, content_hash and options_hash
+    """
+    stat = os.stat(path)
+    options_json = json.dumps(options or {}, sort_keys=True, default=str)
+    return {
+        'source_path': os.path.abspath(path),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'content_hash': hash_file_sample(path, stat.st_size),
+        'options_hash': hashlib.blake2b(options_json.encode(), digest_size=16).hexdigest(),
+    }
+
+
+def ensure_metadata_table(conn):
+    """Create the fingerprint table if it does not exist yet"""
+    conn.execute(f'''CREATE TABLE IF NOT EXISTS "{METADATA_TABLE}" (
+        table_name TEXT PRIMARY KEY,
+        source_path TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        mtime_ns INTEGER NOT NULL,
+        content_hash TEXT NOT NULL,
+        options_hash TEXT NOT NULL,
+        converted_at REAL NOT NULL
+    )''')
+
+
+def is_up_to_date(db_file, table_name, fingerprint):
+    """
+    Check whether a table was already built from exactly this source and options
+
+    Args:
+        db_file (str): Full path of the SQLite database
+        table_name (str): Target table
+        fingerprint (dict): Result of compute_fingerprint
+
+    Returns:
+        bool: True if the stored fingerprint matches and the table still exists
+    """
+    if not os.path.exists(db_file):
+        return False
+
+    conn = None
+    try:
+        conn = sqlite3.connect(db_file)
+        cursor = conn.cursor()
+        # A partitioned table is a view over its partitions
+        cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view') AND name IN (?, ?)",
+                       (METADATA_TABLE, table_name))
+        if len(cursor.fetchall()) != 2:
+            return False
+
+        cursor.execute(f'SELECT source_path, size, mtime_ns, content_hash, options_hash '
+                       f'FROM "{METADATA_TABLE}" WHERE table_name = ?', (table_name,))
+        row = cursor.fetchone()
+        stored = ('source_path', 'size', 'mtime_ns', 'content_hash', 'options_hash')
+        return row is not None and row == tuple(fingerprint[key] for key in stored)
+    except sqlite3.Error:
+        # An unreadable database is never up to date
+        return False
+    finally:
+        if conn:
+            conn.close()
+
+
+def store_fingerprint(conn, table_name, fingerprint):
+    """Record the fingerprint of a finished conversion (caller commits)"""
+    ensure_metadata_table(conn)
+    conn.execute(
+        f'INSERT OR REPLACE INTO "{METADATA_TABLE}" '
+        f'(table_name, source_path, size, mtime_ns, content_hash, options_hash, converted_at) '
+        f'VALUES (?, ?, ?, ?, ?, ?, ?)',
+        (table_name, fingerprint['source_path'], fingerprint['size'], fingerprint['mtime_ns'],
+         fingerprint['content_hash'], fingerprint['options_hash'], time.time())
+    )
+
+
+def forget_fingerprint(conn, table_name):
+    """Remove the fingerprint of a table that is about to be rebuilt (caller commits)"""
+    ensure_metadata_table(conn)
+    conn.execute(f'DELETE FROM "{METADATA_TABLE}" WHERE table_name = ?', (table_name,))
@@ -1,4 +1,6 @@
-CSV_PATH = None
-DB_NAME = None
-DB_PATH = None
-TABLE_NAME = None
+# Database file the database tools open: the target of the latest queued conversion.
+# Conversion settings themselves live on each job (see jobs.ConversionJob).
+ACTIVE_DATABASE = None
+
+# Tables created by the converter for its own bookkeeping start with this prefix
+INTERNAL_TABLE_PREFIX = "_csvsql_"
@@ -0,0 +1,150 @@
+"""
+Index Builder Module
+Parses index specifications and builds SQLite indexes after the bulk insert has finished.
+"""
+
+import sqlite3
+import time
+import logging
+
+from sql_util import quote
+
+
+def parse_index_spec(spec):
+    """
+    Normalize an index specification into a list of index definitions
+
+    Args:
+        spec: None, a string such as "city; last_name,first_name; unique:email",
+              or a list whose entries are column names, lists/tuples of column
+              names (composite index) or dicts with 'columns', 'unique' and 'name'
+
+    Returns:
+        list: Dicts with keys 'columns' (list of str), 'unique' (bool) and 'name' (str or None)
+    """
+    if not spec:
+        return []
+
+    if isinstance(spec, str):
+        entries = [part for part in spec.split(';') if part.strip()]
+    else:
+        entries = list(spec)
+
+    indexes = []
+    for entry in entries:
+        unique = False
+        name = None
+
+        if isinstance(entry, dict):
+            columns = entry.get('columns', [])
+            unique = bool(entry.get('unique', False))
+            name = entry.get('name')
+        elif isinstance(entry, str):
+            text = entry.strip()
+            if text.lower().startswith('unique:'):
+                unique = True
+                text = text[len('unique:'):]
+            columns = text.split(',')
+        else:
+            columns = entry
+
+        if isinstance(columns, str):
+            columns = [columns]
+        columns = [str(col).strip() for col in columns if str(col).strip()]
+
+        if not columns:
+            raise ValueError(f"Index specification has no columns: {entry!r}")
+
+        indexes.append({'columns': columns, 'unique': unique, 'name': name})
+
+    return indexes
+
+
+def parse_key_columns(key):
+    """
+    Normalize a primary key specification ("id", "a,b" or a list) into a list of column names
+    """
+    if not key:
+        return []
+    if isinstance(key, str):
+        key = key.split(',')
+    return [str(col).strip() for col in key if str(col).strip()]
+
+
+def index_name(table_name, index):
+    """Build a deterministic name for an index definition"""
+    if index.get('name'):
+        return index['name']
+    prefix = 'ux' if index['unique'] else 'idx'
+    return f"{prefix}_{table_name}_{'_'.join(index['columns'])}"
+
+
+def build_indexes(conn, table_name, indexes, progress_callback=None, analyze=True):
+    """
+    Create the given indexes on an already populated table
+
+    Building indexes after the data is loaded lets SQLite sort each key once
+    instead of updating every B-tree on every inserted row.
+
+    Args:
+        conn: Open sqlite3 connection
+        table_name (str): Table to index
+        indexes (list): Index definitions as returned by parse_index_spec
+        progress_callback (callable): Optional callback(done, total, name, seconds)
+        analyze (bool): Refresh planner statistics afterwards; callers indexing
+                        several tables can ANALYZE once at the end instead
+
+    Returns:
+        list: (index_name, seconds) tuples in build order
+    """
+    if not indexes:
+        return []
+
+    cursor = conn.cursor()
+    cursor.execute(f'PRAGMA table_info("{table_name}")')
+    existing_columns = {row[1] for row in cursor.fetchall()}
+
+    # Index names are unique per database: IF NOT EXISTS below only skips this table's own indexes
+    cursor.execute("SELECT name, tbl_name FROM sqlite_master WHERE type = 'index'")
+    index_tables = dict(cursor.fetchall())
+
+    # Validate every definition before building anything
+    names = set()
+    for index in indexes:
+        missing = [col for col in index['columns'] if col not in existing_columns]
+        if missing:
+            raise ValueError(f"Index columns not found in table '{table_name}': {', '.join(missing)}")
+        name = index_name(table_name, index)
+        if name in names:
+            raise ValueError(f"Index name '{name}' is used by more than one index definition")
+        if index_tables.get(name, table_name) != table_name:
+            raise ValueError(f"Index '{name}' already exists on table '{index_tables[name]}'")
+        names.add(name)
+
+    timings = []
+    total = len(indexes)
+    for position, index in enumerate(indexes, start=1):
+        name = index_name(table_name, index)
+        columns_sql = ", ".join(quote(col) for col in index['columns'])
+        unique_sql = "UNIQUE " if index['unique'] else ""
+
+        start = time.perf_counter()
+        try:
+            cursor.execute(f'CREATE {unique_sql}INDEX IF NOT EXISTS "{name}" ON "{table_name}" ({columns_sql})')
+            conn.commit()
+        except sqlite3.Error as e:
+            raise sqlite3.Error(f"Error creating index '{name}': {e}")
+        elapsed = time.perf_counter() - start
+
+        timings.append((name, elapsed))
+        logging.info(f"Built index {name} ({position}/{total}) in {elapsed:.3f}s")
+
+        if progress_callback:
+            progress_callback(position, total, name, elapsed)
+
+    # Refresh planner statistics so the new indexes are actually chosen
+    if analyze:
+        cursor.execute('ANALYZE')
+        conn.commit()
+
+    return timings
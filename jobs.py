@@ -0,0 +1,227 @@
+"""
+Jobs Module
+Conversion jobs and a background job queue. Each job carries its own source,
+target, options, state and metrics, so any number of conversions can be
+queued while the rest of the application stays usable.
+
+Jobs run on worker threads and never touch Tk. Their state changes and
+progress are collected in a thread-safe queue and published on the event bus
+by dispatch_events(), which the GUI calls from the Tk thread when the queue's
+notify callback wakes it (once per batch of waiting events).
+"""
+
+import os
+import time
+import queue
+import logging
+import itertools
+import threading
+
+from db_operations import database_file
+from events import get_app_event_bus, JOB_UPDATED, JOB_PROGRESS, CONVERSION_FINISHED, DB_CHANGED
+from profiling import get_app_profiler
+
+
+JOB_STATES = ('queued', 'running', 'done', 'failed', 'cancelled')
+
+# Number of conversions allowed to run at the same time (default 1)
+MAX_JOBS_ENV = 'CSVSQL_MAX_JOBS'
+
+_job_ids = itertools.count(1)
+
+
+class ConversionJob:
+    """One CSV to SQLite conversion with its own settings, state and results"""
+
+    def __init__(self, csv_file, db_file, db_path, table_name, options=None):
+        self.id = next(_job_ids)
+        self.csv_file = csv_file
+        self.db_file = db_file
+        self.db_path = db_path
+        self.table_name = table_name
+        self.options = dict(options or {})
+
+        self.state = 'queued'
+        self.summary = None
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+
+    @property
+    def database(self):
+        """Full path of the target database file"""
+        return database_file(self.db_path, self.db_file)
+
+    @property
+    def metrics(self):
+        """Stage measurements of a finished run (see metrics.ConversionMetrics)"""
+        return self.summary.get('metrics') if self.summary else None
+
+    @property
+    def seconds(self):
+        """Run time so far, or of the finished run"""
+        if self.started is None:
+            return None
+        return (self.finished or time.time()) - self.started
+
+    def describe(self):
+        """Short label for status displays"""
+        return f"#{self.id} {os.path.basename(self.csv_file)} -> {self.db_file}.{self.table_name}"
+
+    def run(self, progress_callback=None, metrics_callback=None):
+        """
+        Run the conversion in the calling thread
+
+        Errors are kept on the job instead of being raised.
+
+        Returns:
+            bool: True if the conversion succeeded
+        """
+        # pandas/numpy load with the converter, on the worker thread
+        from converter import run_conversion
+
+        self.state = 'running'
+        self.started = time.time()
+        try:
+            self.summary = run_conversion(self.csv_file, self.db_file, self.db_path, self.table_name,
+                                          progress_callback=progress_callback,
+                                          metrics_callback=metrics_callback, **self.options)
+            self.state = 'done'
+        except Exception as e:
+            logging.error(f"Job {self.describe()} failed: {e}")
+            self.error = e
+            self.state = 'failed'
+        finally:
+            self.finished = time.time()
+        return self.state == 'done'
+
+
+class JobQueue:
+    """
+    Runs queued jobs on background threads, at most max_workers at a time
+
+    Jobs writing to the same database file never run at the same time,
+    since SQLite allows only one writer.
+    """
+
+    def __init__(self, max_workers=1, event_bus=None, profiler=None, notify=None):
+        """
+        Args:
+            max_workers (int): Jobs allowed to run at the same time
+            event_bus (EventBus): Bus dispatch_events() publishes on
+            profiler (ActionProfiler): Profiler each job runs through
+            notify (callable): Called from a worker thread when events are waiting
+                               for dispatch_events(); not called again until they are dispatched
+        """
+        self.max_workers = max(1, int(max_workers))
+        self.event_bus = event_bus or get_app_event_bus()
+        # Jobs are profiled here: the GUI action that submits them only queues them
+        self.profiler = profiler or get_app_profiler()
+        self.jobs = []
+        self._lock = threading.Lock()
+        self._events = queue.Queue()
+        self._notified = False
+        self.notify = notify
+        self._running = 0
+
+    def set_max_workers(self, max_workers):
+        """Change the concurrency limit; extra workers start immediately if jobs are waiting"""
+        with self._lock:
+            self.max_workers = max(1, int(max_workers))
+        self._start_workers()
+
+    def submit(self, job):
+        """Queue a job and start it as soon as a worker is free"""
+        with self._lock:
+            self.jobs.append(job)
+        self.event_bus.publish(JOB_UPDATED, job=job)
+        self._start_workers()
+        return job
+
+    def cancel(self, job):
+        """Cancel a job that has not started yet; returns False if it already runs or ran"""
+        with self._lock:
+            if job.state != 'queued':
+                return False
+            job.state = 'cancelled'
+        self.event_bus.publish(JOB_UPDATED, job=job)
+        return True
+
+    def counts(self):
+        """Number of jobs per state"""
+        with self._lock:
+            return {state: sum(1 for job in self.jobs if job.state == state) for state in JOB_STATES}
+
+    def _next_job(self):
+        """Claim the oldest queued job whose database is not being written (lock held)"""
+        busy = {job.database for job in self.jobs if job.state == 'running'}
+        for job in self.jobs:
+            if job.state == 'queued' and job.database not in busy:
+                job.state = 'running'
+                return job
+        return None
+
+    def _start_workers(self):
+        while True:
+            with self._lock:
+                if self._running >= self.max_workers:
+                    return
+                job = self._next_job()
+                if job is None:
+                    return
+                self._running += 1
+            threading.Thread(target=self._work, args=(job,), name=f'job-{job.id}', daemon=True).start()
+
+    def _post(self, event, **data):
+        """Queue an event from a worker thread, notifying the GUI if it is not notified yet"""
+        self._events.put((event, data))
+        with self._lock:
+            if self._notified or self.notify is None:
+                return
+            self._notified = True
+        self.notify()
+
+    def _work(self, job):
+        """Worker thread: run one job, then pick up the next one"""
+        self._post(JOB_UPDATED, job=job)
+
+        def on_progress(stage, done, total, detail):
+            self._post(JOB_PROGRESS, job=job, stage=stage, done=done, total=total, detail=detail)
+
+        def on_stage(event):
+            if event['event'] == 'stage_start':
+                on_progress(event['stage'], None, None, None)
+
+        try:
+            success = self.profiler.run('convert.job', job.run, on_progress, on_stage)
+            self._post(JOB_UPDATED, job=job)
+            self._post(CONVERSION_FINISHED, job=job, success=success,
+                       database=job.database, table=job.table_name)
+            if success and job.summary['status'] != 'up_to_date':
+                self._post(DB_CHANGED, database=job.database, table=job.table_name, action='convert')
+        finally:
+            with self._lock:
+                self._running -= 1
+            self._start_workers()
+
+    def dispatch_events(self):
+        """Publish events collected from worker threads; call from the Tk thread"""
+        # Cleared first: an event queued while draining notifies again
+        with self._lock:
+            self._notified = False
+        while True:
+            try:
+                event, data = self._events.get_nowait()
+            except queue.Empty:
+                return
+            self.event_bus.publish(event, **data)
+
+
+# Singleton instance for application-wide conversion jobs
+app_job_queue = JobQueue(os.environ.get(MAX_JOBS_ENV) or 1)
+
+
+def get_app_job_queue():
+    """Get the application's global job queue"""
+    return app_job_queue
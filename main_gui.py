@@ -1,13 +1,20 @@
 import tkinter as tk
-from edit_gui import editgui
 from tkinter import messagebox
 import sys
 import os
 from GUI_tooltip import ToolTip
-from convert_gui import SetupPathsWindow
 from theme_manager import ThemableWindow, get_app_theme_manager
+from profiling import get_app_profiler
+from events import get_app_event_bus, WINDOW_CLOSED, CONVERSION_FINISHED, DB_CHANGED, JOB_PROGRESS, JOB_UPDATED
+from jobs import get_app_job_queue
 import globals
 
+# The conversion and database tool windows (and pandas/numpy behind them) are
+# imported when first opened, so the main window paints without loading them.
+
+# Set to print "first_paint" and exit once the main window is shown (startup benchmark)
+STARTUP_PROBE_ENV = 'CSVSQL_STARTUP_PROBE'
+
 class BaseWindow:
     """Base class for all GUI windows with common functionality"""
     
@@ -79,6 +86,9 @@ class MainGUI(BaseWindow, ThemableWindow):
         
         self.conversion_window = None
         self.edit_window = None
+        self.profiler = get_app_profiler()
+        self.event_bus = get_app_event_bus()
+        self.job_queue = get_app_job_queue()
         
         # Get initial theme
         self.current_theme = self.theme_manager.get_current_theme()
@@ -88,10 +98,22 @@ class MainGUI(BaseWindow, ThemableWindow):
         
         # Apply initial theme
         self.apply_theme()
+        
+        # Child windows and jobs report back through the event bus
+        self.event_bus.subscribe(WINDOW_CLOSED, self.on_window_closed)
+        self.event_bus.subscribe(CONVERSION_FINISHED, self.on_conversion_finished)
+        self.event_bus.subscribe(DB_CHANGED, self.on_db_changed)
+        self.event_bus.subscribe(JOB_PROGRESS, self.on_job_progress)
+        self.event_bus.subscribe(JOB_UPDATED, self.on_job_updated)
+        
+        # Job worker threads wake the Tk thread with a virtual event instead of being polled
+        self.window.bind('<<JobEvent>>', lambda event: self.job_queue.dispatch_events())
+        self.job_queue.notify = self.notify_job_events
     
     def setup_ui(self):
         """Setup the main user interface"""
         try:
+            self.create_menu()
             self.create_theme_toggle_section()
             self.create_title()
             self.create_status_section()
@@ -101,9 +123,76 @@ class MainGUI(BaseWindow, ThemableWindow):
             messagebox.showerror("UI Setup Error", f"Failed to create main interface: {str(e)}")
             self.window.destroy()
 
+    def create_menu(self):
+        """Create the menu bar with the job queue settings and the profiling switch"""
+        menu_bar = tk.Menu(self.window)
+        
+        jobs_menu = tk.Menu(menu_bar, tearoff=0)
+        self.max_jobs = tk.IntVar(value=self.job_queue.max_workers)
+        for count in (1, 2, 4):
+            jobs_menu.add_radiobutton(label=f"Run {count} Conversion{'s' if count > 1 else ''} at a Time",
+                                      value=count, variable=self.max_jobs, command=self.set_max_jobs)
+        jobs_menu.add_separator()
+        jobs_menu.add_command(label="Show Jobs", command=self.show_jobs)
+        jobs_menu.add_command(label="Cancel Queued Jobs", command=self.cancel_queued_jobs)
+        menu_bar.add_cascade(label="Jobs", menu=jobs_menu)
+        
+        diagnostics_menu = tk.Menu(menu_bar, tearoff=0)
+        self.profile_mode = tk.StringVar(value=self.profiler.mode or 'off')
+        diagnostics_menu.add_radiobutton(label="Profiling Off", value='off',
+                                         variable=self.profile_mode, command=self.set_profile_mode)
+        diagnostics_menu.add_radiobutton(label="Profile Actions (cProfile)", value='cprofile',
+                                         variable=self.profile_mode, command=self.set_profile_mode)
+        diagnostics_menu.add_radiobutton(label="Profile Actions (Sampling)", value='sample',
+                                         variable=self.profile_mode, command=self.set_profile_mode)
+        diagnostics_menu.add_separator()
+        diagnostics_menu.add_command(label="Show Diagnostics Folder", command=self.show_diagnostics_folder)
+        
+        menu_bar.add_cascade(label="Diagnostics", menu=diagnostics_menu)
+        self.window.config(menu=menu_bar)
+    
+    def set_profile_mode(self):
+        """Apply the profiling mode chosen in the Diagnostics menu"""
+        mode = self.profile_mode.get()
+        self.profiler.set_mode(None if mode == 'off' else mode)
+    
+    def set_max_jobs(self):
+        """Apply the concurrency limit chosen in the Jobs menu"""
+        self.job_queue.set_max_workers(self.max_jobs.get())
+    
+    def show_jobs(self):
+        """List all conversion jobs of this session with their state"""
+        if not self.job_queue.jobs:
+            messagebox.showinfo("Conversion Jobs", "No conversions have been queued yet.")
+            return
+        
+        lines = []
+        for job in self.job_queue.jobs:
+            line = f"{job.describe()}: {job.state}"
+            if job.seconds is not None:
+                line += f" ({job.seconds:.1f}s)"
+            if job.error:
+                line += f" - {job.error}"
+            lines.append(line)
+        messagebox.showinfo("Conversion Jobs", "\n".join(lines))
+    
+    def cancel_queued_jobs(self):
+        """Cancel all jobs that have not started yet"""
+        cancelled = sum(self.job_queue.cancel(job) for job in list(self.job_queue.jobs))
+        messagebox.showinfo("Conversion Jobs", f"Cancelled {cancelled} queued job(s).\n"
+                            "Running conversions finish normally.")
+    
+    def show_diagnostics_folder(self):
+        """Tell the user where profiles are written"""
+        messagebox.showinfo(
+            "Diagnostics Folder",
+            f"Profiles of database and conversion actions are saved to:\n\n{self.profiler.diagnostics_dir}\n\n"
+            ".prof files open with pstats or snakeviz, .folded files with flamegraph.pl or speedscope."
+        )
+
     def create_theme_toggle_section(self):
         """Create theme toggle button in top-right corner"""
-        theme_frame = tk.Frame(self.window, bg=self.current_theme['bg'])
+        theme_frame = self.themed(tk.Frame(self.window, bg=self.current_theme['bg']))
         theme_frame.pack(anchor='ne', padx=10, pady=10)
         
         self.theme_button = self.create_theme_toggle(theme_frame)
@@ -115,26 +204,26 @@ class MainGUI(BaseWindow, ThemableWindow):
 
     def create_title(self):
         """Create title label"""
-        self.title_label = tk.Label(
+        self.title_label = self.themed(tk.Label(
             self.window, 
             text="CSV to SQL Database Converter",
             font=("Arial", 24, "bold"), 
             bg=self.current_theme['bg'], 
             fg=self.current_theme['title_color']
-        )
+        ))
         self.title_label.pack(pady=0)
         
         # Register as special widget
         self.register_special_widget(self.title_label, 'title')
         
         # Subtitle
-        self.subtitle_label = tk.Label(
+        self.subtitle_label = self.themed(tk.Label(
             self.window,
             text="Convert your CSV files to SQLite databases with ease",
             font=("Arial", 12),
             bg=self.current_theme['bg'],
             fg=self.current_theme['subtitle_color']
-        )
+        ))
         self.subtitle_label.pack(pady=(10, 20))
         
         # Register as special widget
@@ -142,26 +231,26 @@ class MainGUI(BaseWindow, ThemableWindow):
 
     def create_status_section(self):
         """Create status display section"""
-        status_frame = tk.Frame(self.window, bg=self.current_theme['bg'])
+        status_frame = self.themed(tk.Frame(self.window, bg=self.current_theme['bg']))
         status_frame.pack(pady=20, padx=40, fill='x')
         
-        self.status_title = tk.Label(
+        self.status_title = self.themed(tk.Label(
             status_frame,
             text="Current Status:",
             font=("Arial", 12, "bold"),
             bg=self.current_theme['bg'],
             fg=self.current_theme['text']
-        )
+        ))
         self.status_title.pack(anchor='center')
         
-        self.status_label = tk.Label(
+        self.status_label = self.themed(tk.Label(
             status_frame,
             text="Ready to convert CSV files",
             font=("Arial", 10),
             bg=self.current_theme['bg'],
             fg=self.current_theme['status_good'],
             justify='center'
-        )
+        ))
         self.status_label.pack(anchor='center', pady=(5, 0))
         
         # Register status label for dynamic coloring
@@ -171,21 +260,19 @@ class MainGUI(BaseWindow, ThemableWindow):
         self.update_status_display()
     
     def update_status_display(self):
-        """Update the status display with current settings"""
+        """Update the status display with the job queue and the active database"""
         status_parts = []
+        counts = self.job_queue.counts()
         
-        if globals.CSV_PATH:
-            filename = os.path.basename(globals.CSV_PATH)
-            status_parts.append(f"CSV File: {filename}")
+        if counts['running'] or counts['queued']:
+            status_parts.append(f"Jobs: {counts['running']} running, {counts['queued']} queued")
         
-        if globals.DB_NAME:
-            status_parts.append(f"Database: {globals.DB_NAME}")
-            
-        if globals.TABLE_NAME:
-            status_parts.append(f"Table: {globals.TABLE_NAME}")
-            
-        if globals.DB_PATH:
-            status_parts.append(f"Save Path: {globals.DB_PATH}")
+        if self.job_queue.jobs:
+            last_job = self.job_queue.jobs[-1]
+            status_parts.append(f"Last job: {last_job.describe()} ({last_job.state})")
+        
+        if globals.ACTIVE_DATABASE:
+            status_parts.append(f"Database: {globals.ACTIVE_DATABASE}")
         
         if status_parts:
             status_text = "Current Settings:\n" + "\n".join(status_parts)
@@ -205,11 +292,11 @@ class MainGUI(BaseWindow, ThemableWindow):
 
     def create_action_buttons(self):
         """Create main action buttons"""
-        button_frame = tk.Frame(self.window, bg=self.current_theme['bg'])
+        button_frame = self.themed(tk.Frame(self.window, bg=self.current_theme['bg']))
         button_frame.pack(pady=30)
         
         # Convert button
-        self.convert_button = tk.Button(
+        self.convert_button = self.themed(tk.Button(
             button_frame, 
             text="Start Conversion",
             command=self.open_conversion,
@@ -220,7 +307,7 @@ class MainGUI(BaseWindow, ThemableWindow):
             fg=self.current_theme['convert_fg'],
             cursor='hand2',
             relief='raised'
-        )
+        ))
         self.convert_button.pack(pady=(5, 20))
         ToolTip(self.convert_button, "Open the conversion wizard to convert CSV files to SQLite database")
         
@@ -228,7 +315,7 @@ class MainGUI(BaseWindow, ThemableWindow):
         self.register_special_widget(self.convert_button, 'convert')
     
         # Edit database button
-        self.editdb_button = tk.Button(
+        self.editdb_button = self.themed(tk.Button(
             button_frame, 
             text="Database Tools",
             command=self.open_edit_database,
@@ -238,7 +325,7 @@ class MainGUI(BaseWindow, ThemableWindow):
             bg=self.current_theme['edit_bg'],
             fg=self.current_theme['edit_fg'],
             cursor='hand2',
-        )
+        ))
         self.editdb_button.pack(pady=10)
         ToolTip(self.editdb_button, "Database editing tools")
         
@@ -247,10 +334,10 @@ class MainGUI(BaseWindow, ThemableWindow):
     
     def create_terminate_button(self):
         """Create terminate button"""
-        terminate_frame = tk.Frame(self.window, bg=self.current_theme['bg'])
+        terminate_frame = self.themed(tk.Frame(self.window, bg=self.current_theme['bg']))
         terminate_frame.pack(side='bottom', pady=20)
         
-        self.terminate_button = tk.Button(
+        self.terminate_button = self.themed(tk.Button(
             terminate_frame, 
             text="Exit Application",
             command=self.safe_exit,
@@ -260,7 +347,7 @@ class MainGUI(BaseWindow, ThemableWindow):
             bg=self.current_theme['exit_bg'],
             fg=self.current_theme['exit_fg'],
             cursor='hand2'
-        )
+        ))
         self.terminate_button.pack(pady=10)
         ToolTip(self.terminate_button, "Close the application")
         
@@ -285,10 +372,12 @@ class MainGUI(BaseWindow, ThemableWindow):
     
     def safe_exit(self):
         """Safely exit the application with confirmation"""
-        response = messagebox.askyesno(
-            "Exit Application", 
-            "Are you sure you want to exit the CSV to SQL Converter?"
-        )
+        counts = self.job_queue.counts()
+        pending = counts['running'] + counts['queued']
+        message = "Are you sure you want to exit the CSV to SQL Converter?"
+        if pending:
+            message += f"\n\n{pending} conversion job(s) are still running or queued and will be stopped."
+        response = messagebox.askyesno("Exit Application", message)
         if response:
             try:
                 # Close any open conversion windows
@@ -302,8 +391,14 @@ class MainGUI(BaseWindow, ThemableWindow):
             except:
                 pass
             finally:
-                # Unregister from theme callbacks
+                # Unregister from theme callbacks and events
                 self.theme_manager.unregister_theme_callback(self.on_theme_changed)
+                self.event_bus.unsubscribe(WINDOW_CLOSED, self.on_window_closed)
+                self.event_bus.unsubscribe(CONVERSION_FINISHED, self.on_conversion_finished)
+                self.event_bus.unsubscribe(DB_CHANGED, self.on_db_changed)
+                self.event_bus.unsubscribe(JOB_PROGRESS, self.on_job_progress)
+                self.event_bus.unsubscribe(JOB_UPDATED, self.on_job_updated)
+                self.job_queue.notify = None
                 self.window.destroy()
     
     def open_conversion(self):
@@ -321,52 +416,16 @@ class MainGUI(BaseWindow, ThemableWindow):
                     self.conversion_window = None
             
             # Create new conversion window
+            from convert_gui import SetupPathsWindow
             self.conversion_window = SetupPathsWindow(self.window)
             
-            # Set up proper cleanup when window is closed
-            def on_conversion_close():
-                try:
-                    if self.conversion_window:
-                        # Unregister theme callback before destroying
-                        if hasattr(self.conversion_window, 'theme_manager'):
-                            self.conversion_window.theme_manager.unregister_theme_callback(
-                                self.conversion_window.on_theme_changed
-                            )
-                        self.conversion_window = None
-                        self.update_status_display()
-                except Exception as e:
-                    print(f"Error during conversion window cleanup: {e}")
-            
-            # Bind the cleanup to window close event
-            self.conversion_window.window.protocol("WM_DELETE_WINDOW", on_conversion_close)
-            
-            # Update status when conversion window is closed
-            self.window.after(1000, self.check_conversion_window)
+            # Closing from the window manager goes through the window's own close;
+            # it publishes WINDOW_CLOSED when the window is destroyed
+            self.conversion_window.window.protocol("WM_DELETE_WINDOW", self.conversion_window.close_setup)
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to open conversion window:\n{str(e)}")
     
-    def check_conversion_window(self):
-        """Check if conversion window is still open and update status"""
-        try:
-            if self.conversion_window and hasattr(self.conversion_window, 'window'):
-                try:
-                    # Check if window still exists
-                    self.conversion_window.window.winfo_exists()
-                    # Schedule next check
-                    self.window.after(1000, self.check_conversion_window)
-                except tk.TclError:
-                    # Window was destroyed, clean up
-                    self.conversion_window = None
-                    self.update_status_display()
-            else:
-                # Window is closed, update status
-                self.update_status_display()
-        except Exception as e:
-            # Clean up on any error
-            self.conversion_window = None
-            self.update_status_display()
-    
     def open_edit_database(self):
         """Open database editing tools"""
         try:
@@ -382,57 +441,81 @@ class MainGUI(BaseWindow, ThemableWindow):
                     self.edit_window = None
             
             # Create new edit window
+            from edit_gui import editgui
             self.edit_window = editgui(self.window)
             
-            # Set up proper cleanup when window is closed
-            def on_edit_close():
-                try:
-                    if self.edit_window:
-                        # Unregister theme callback before destroying
-                        if hasattr(self.edit_window, 'theme_manager'):
-                            self.edit_window.theme_manager.unregister_theme_callback(
-                                self.edit_window.on_theme_changed
-                            )
-                        self.edit_window = None
-                except Exception as e:
-                    print(f"Error during edit window cleanup: {e}")
-            
-            # Bind the cleanup to window close event
-            self.edit_window.window.protocol("WM_DELETE_WINDOW", on_edit_close)
-            
-            # Update status when edit window is closed
-            self.window.after(1000, self.check_edit_window)
+            # Closing from the window manager goes through the window's own close;
+            # it publishes WINDOW_CLOSED when the window is destroyed
+            self.edit_window.window.protocol("WM_DELETE_WINDOW", self.edit_window.close_setup)
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to open edit window:\n{str(e)}")
     
-    def check_edit_window(self):
-        """Check if edit window is still open"""
-        try:
-            if self.edit_window and hasattr(self.edit_window, 'window'):
-                try:
-                    # Check if window still exists
-                    self.edit_window.window.winfo_exists()
-                    # Schedule next check
-                    self.window.after(1000, self.check_edit_window)
-                except tk.TclError:
-                    # Window was destroyed, clean up
-                    self.edit_window = None
-            else:
-                # Window is closed
-                self.edit_window = None
-        except Exception as e:
-            # Clean up on any error
+    def on_window_closed(self, window, source):
+        """Forget a closed child window and refresh the status"""
+        if window == 'conversion' and self.conversion_window is source:
+            self.conversion_window = None
+            self.update_status_display()
+        elif window == 'edit' and self.edit_window is source:
             self.edit_window = None
     
+    def on_job_updated(self, job):
+        """Refresh the status when a job is queued, starts or ends"""
+        self.update_status_display()
+    
+    def notify_job_events(self):
+        """Wake the Tk thread to publish waiting job events; called from job worker threads"""
+        try:
+            # Tkinter hands calls from other threads to the Tk thread; 'tail' queues the
+            # event behind pending ones instead of handling it synchronously
+            self.window.event_generate('<<JobEvent>>', when='tail')
+        except (tk.TclError, RuntimeError):
+            # The main window is gone or no longer runs its event loop
+            pass
+    
+    def on_job_progress(self, job, stage, done, total, detail):
+        """Show the running conversion stage in the status area"""
+        text = f"Converting {job.describe()}: {stage}"
+        if total:
+            text += f" {done}/{total}"
+        elif done:
+            # Streamed stages do not know the total in advance
+            text += f" {done:,} rows"
+        self.status_label.config(text=text, fg=self.current_theme['status_info'])
+        self.register_special_widget(self.status_label, 'status_info')
+    
+    def on_conversion_finished(self, job, success, database, table):
+        """Report the outcome of a conversion job and refresh the status"""
+        # The converter is already loaded: the job has just run it
+        from converter import format_summary, format_error
+        
+        self.update_status_display()
+        if success:
+            title, message = format_summary(job.summary)
+            messagebox.showinfo(f"{title} (job #{job.id})", message)
+        else:
+            title, message = format_error(job.error)
+            messagebox.showerror(f"{title} (job #{job.id})", message)
+    
+    def on_db_changed(self, database, table, action):
+        """Refresh the status after the database was modified"""
+        self.update_status_display()
+    
     def run(self):
         """Start the main GUI loop"""
         try:
             self.window.protocol("WM_DELETE_WINDOW", self.safe_exit)
+            if os.environ.get(STARTUP_PROBE_ENV):
+                self.window.bind('<Map>', lambda event: self.window.after_idle(self.report_first_paint), add='+')
             self.window.mainloop()
         except Exception as e:
             messagebox.showerror("Application Error", f"An error occurred: {str(e)}")
 
+    def report_first_paint(self):
+        """Startup benchmark hook: report that the window is drawn and quit"""
+        print("first_paint", flush=True)
+        self.window.destroy()
+
 # Factory function to maintain compatibility with existing code
 def create_main_gui():
     """Create and run the main GUI application"""
@@ -0,0 +1,71 @@
+"""
+Memory Database Module
+In-memory conversion mode: the conversion runs against a :memory: database,
+index builds included, and the result is copied to the target file with the
+SQLite backup API in paged steps. The file is then written once, page by page
+in order, instead of being grown by many small commits and index builds, and a
+failed conversion leaves it untouched.
+
+The whole database has to fit in RAM: an existing target file is loaded into
+memory first so its other tables survive the copy.
+"""
+
+import os
+import sqlite3
+
+
+# Pages copied per backup step; progress is reported after each step
+BACKUP_STEP_PAGES = 1024
+
+
+def open_memory_copy(db_file):
+    """
+    Open an in-memory database holding a copy of db_file
+
+    Args:
+        db_file (str): Database file; the copy starts empty if it does not exist
+
+    Returns:
+        sqlite3.Connection: Connection to the in-memory database
+    """
+    conn = sqlite3.connect(':memory:')
+    # Sorts for index builds stay in RAM too
+    conn.execute('PRAGMA temp_store = MEMORY')
+    if os.path.exists(db_file):
+        source = sqlite3.connect(db_file)
+        try:
+            source.backup(conn)
+        finally:
+            source.close()
+    return conn
+
+
+def persist_database(conn, db_file, progress_callback=None, step_pages=BACKUP_STEP_PAGES):
+    """
+    Replace the contents of db_file with an in-memory database (caller commits first)
+
+    Free pages, e.g. those of a replaced table, are dropped with an in-memory
+    VACUUM first, so the file is written compactly.
+
+    Args:
+        conn (sqlite3.Connection): Source database
+        db_file (str): Target file, created if it does not exist
+        progress_callback (callable): Optional callback(pages_done, total_pages) after each step
+        step_pages (int): Pages copied per step
+
+    Returns:
+        int: Size of the written file in bytes
+    """
+    if conn.execute('PRAGMA freelist_count').fetchone()[0]:
+        conn.execute('VACUUM')
+
+    def on_step(status, remaining, total):
+        if progress_callback:
+            progress_callback(total - remaining, total)
+
+    target = sqlite3.connect(db_file)
+    try:
+        conn.backup(target, pages=step_pages, progress=on_step)
+    finally:
+        target.close()
+    return os.path.getsize(db_file)
@@ -0,0 +1,203 @@
+"""
+Metrics Module
+Per-stage timing, row/byte counts and memory high-water marks for the conversion pipeline.
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None if unavailable"""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS reports bytes
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+    except (ImportError, AttributeError):
+        return None
+
+
+def current_rss_mb():
+    """Current resident set size of this process in MB, or None if unavailable"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        return None
+
+
+class StageRecord:
+    """Measurements of one pipeline stage; rows and bytes are filled in by the stage"""
+
+    def __init__(self, name):
+        self.name = name
+        self.seconds = 0.0
+        self.rows = None
+        self.bytes = None
+        self.rss_mb = None
+        self.peak_rss_mb = None
+        # Overlapping pipeline stages only: share of the pipeline's wall time spent
+        # working, and time spent waiting for input or for room downstream
+        self.utilization = None
+        self.starved_seconds = None
+        self.blocked_seconds = None
+
+    def as_dict(self):
+        return {
+            'stage': self.name,
+            'seconds': self.seconds,
+            'rows': self.rows,
+            'bytes': self.bytes,
+            'rss_mb': self.rss_mb,
+            'peak_rss_mb': self.peak_rss_mb,
+            'utilization': self.utilization,
+            'starved_seconds': self.starved_seconds,
+            'blocked_seconds': self.blocked_seconds,
+        }
+
+
+class ConversionMetrics:
+    """
+    Collects stage measurements for one conversion run
+
+    Listeners are called with an event dict when a stage starts
+    ({'event': 'stage_start', 'stage': name}) and ends ('stage_end' plus
+    the StageRecord fields), so callers can show progress or log live.
+    """
+
+    def __init__(self, listeners=None):
+        self.listeners = list(listeners or [])
+        self.stages = []
+        # Values chosen during the run (e.g. adaptive batch sizes), reported with the stages
+        self.settings = {}
+        self.started = time.perf_counter()
+        self.total_seconds = None
+
+    def add_listener(self, callback):
+        """Register a callback(event) for stage events"""
+        self.listeners.append(callback)
+
+    def _emit(self, event):
+        for callback in self.listeners:
+            try:
+                callback(event)
+            except Exception as e:
+                logging.warning(f"Error in metrics callback: {e}")
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Time a block of work as a named stage
+
+        Usage:
+            with metrics.stage('read') as stage:
+                df = ...
+                stage.rows = len(df)
+        """
+        record = StageRecord(name)
+        self._emit({'event': 'stage_start', 'stage': name})
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds = time.perf_counter() - start
+            record.rss_mb = current_rss_mb()
+            record.peak_rss_mb = peak_rss_mb()
+            self.stages.append(record)
+            event = {'event': 'stage_end'}
+            event.update(record.as_dict())
+            self._emit(event)
+
+    def record(self, name, seconds, **fields):
+        """
+        Add a stage that was timed elsewhere (e.g. a stage running on its own thread)
+
+        Args:
+            name (str): Stage name
+            seconds (float): Time the stage was busy
+            **fields: Other StageRecord fields (rows, bytes, utilization, ...)
+        """
+        record = StageRecord(name)
+        record.seconds = seconds
+        for field, value in fields.items():
+            setattr(record, field, value)
+        self.stages.append(record)
+        event = {'event': 'stage_end'}
+        event.update(record.as_dict())
+        self._emit(event)
+        return record
+
+    def finish(self):
+        """Stop the run clock"""
+        self.total_seconds = time.perf_counter() - self.started
+
+    def as_dict(self):
+        return {
+            'total_seconds': self.total_seconds,
+            'peak_rss_mb': peak_rss_mb(),
+            'stages': [record.as_dict() for record in self.stages],
+            'settings': dict(self.settings),
+        }
+
+    def write_log(self, path, context=None):
+        """
+        Append this run as one JSON line to a log file
+
+        Args:
+            path (str): JSON Lines log file
+            context (dict): Extra fields stored with the run (source, table, status, ...)
+        """
+        entry = {'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')}
+        entry.update(context or {})
+        entry.update(self.as_dict())
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+
+
+def format_metrics(metrics):
+    """
+    Human-readable stage table for message boxes and logs
+
+    Args:
+        metrics (dict): Result of ConversionMetrics.as_dict()
+    """
+    lines = []
+    for record in metrics['stages']:
+        line = f"{record['stage']:<13}{record['seconds']:>8.3f}s"
+        if record['rows'] is not None:
+            line += f"  {record['rows']:,} rows"
+        if record['bytes'] is not None:
+            line += f"  {record['bytes'] / (1024 * 1024):,.1f} MB"
+        if record.get('utilization') is not None:
+            line += f"  {record['utilization']:.0%} busy"
+        lines.append(line)
+    if metrics['total_seconds'] is not None:
+        lines.append(f"{'total':<13}{metrics['total_seconds']:>8.3f}s")
+    if metrics['peak_rss_mb'] is not None:
+        lines.append(f"Peak memory: {metrics['peak_rss_mb']:,.0f} MB")
+    for name, value in metrics.get('settings', {}).items():
+        if value is None:
+            continue
+        if isinstance(value, float):
+            value = f"{value:,.1f}"
+        elif isinstance(value, int):
+            value = f"{value:,}"
+        lines.append(f"{name.replace('_', ' ').capitalize()}: {value}")
+    return "\n".join(lines)
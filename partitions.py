@@ -0,0 +1,183 @@
+"""
+Partitions Module
+Horizontal partitioning of the output: rows are routed by the value of a
+column, or by the year, month or day of a date column, into
+<table>__p_<partition> tables, and <table> becomes a UNION ALL view over them.
+
+Every partition table gets an index on the partition column, so a query
+for one partition costs the other partitions a single index seek. An old
+partition is removed by dropping its table (drop_partition, or Delete Table
+in the editor) and rebuilding the view, without touching the other rows.
+"""
+
+import re
+
+from sql_util import quote
+
+
+PARTITION_PERIODS = ('year', 'month', 'day')
+
+# SQLite's default SQLITE_MAX_COMPOUND_SELECT: the view can union at most this many tables
+MAX_PARTITIONS = 500
+
+# Partition of rows whose partition value is empty (or not a date)
+NULL_PARTITION = 'null'
+
+
+def partition_table_name(table_name, label):
+    """Table holding one partition of a table"""
+    return f"{table_name}__p_{label}"
+
+
+def partition_label(value):
+    """Table name suffix for a partition value: letters, digits and underscores only"""
+    return re.sub(r'[^0-9A-Za-z]+', '_', str(value)).strip('_') or 'empty'
+
+
+def list_partitions(conn, table_name):
+    """Partition tables of a table, in name order"""
+    rows = conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name GLOB ? ORDER BY name",
+                        (partition_table_name(table_name, '*'),)).fetchall()
+    return [name for (name,) in rows]
+
+
+def partition_parent(conn, name):
+    """The partitioned table (view) a partition table belongs to, or None"""
+    match = re.match(r'(.+)__p_[0-9A-Za-z_]+$', name)
+    if not match:
+        return None
+    parent = match.group(1)
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'view' AND name = ?", (parent,)).fetchone()
+    return parent if row else None
+
+
+def create_union_view(conn, table_name):
+    """
+    (Re)create <table> as a UNION ALL view over its partition tables (caller commits)
+
+    Returns:
+        int: Number of partitions in the view; without partitions the view is dropped
+    """
+    conn.execute(f'DROP VIEW IF EXISTS {quote(table_name)}')
+    tables = list_partitions(conn, table_name)
+    if tables:
+        union_sql = " UNION ALL ".join(f'SELECT * FROM {quote(table)}' for table in tables)
+        conn.execute(f'CREATE VIEW {quote(table_name)} AS {union_sql}')
+    return len(tables)
+
+
+def drop_partition(conn, table_name, label):
+    """
+    Remove one partition and rebuild the view over the others (caller commits)
+
+    Args:
+        table_name (str): Partitioned table (the view)
+        label (str): Partition label, e.g. '2024_01'
+
+    Returns:
+        int: Number of partitions left
+    """
+    conn.execute(f'DROP TABLE IF EXISTS {quote(partition_table_name(table_name, label))}')
+    return create_union_view(conn, table_name)
+
+
+def drop_partitions(conn, table_name, drop_table=False):
+    """
+    Remove the view and partition tables of a previous partitioned conversion (caller commits)
+
+    Args:
+        drop_table (bool): Also drop <table> if it is a plain table, before it becomes the view
+    """
+    row = conn.execute("SELECT type FROM sqlite_master WHERE name = ?", (table_name,)).fetchone()
+    if row and row[0] == 'view':
+        conn.execute(f'DROP VIEW {quote(table_name)}')
+    elif row and row[0] == 'table' and drop_table:
+        conn.execute(f'DROP TABLE {quote(table_name)}')
+    for table in list_partitions(conn, table_name):
+        conn.execute(f'DROP TABLE IF EXISTS {quote(table)}')
+
+
+class Partitioner:
+    """
+    Routes the rows of each batch to their partition tables
+
+    Partitions are created as rows for them arrive; labels that collide after
+    sanitizing (e.g. 'a-b' and 'a b') get a numeric suffix.
+    """
+
+    def __init__(self, table_name, column, period=None):
+        """
+        Args:
+            table_name (str): Partitioned table; becomes the UNION ALL view
+            column (str): Column whose value (or date bucket) picks the partition
+            period (str): None to partition by value, or 'year', 'month' or 'day' of a date column
+        """
+        if period is not None and period not in PARTITION_PERIODS:
+            raise ValueError(f"Partition period must be one of: {', '.join(PARTITION_PERIODS)}")
+        self.table_name = table_name
+        self.column = column
+        self.period = period
+        self.tables = {}   # partition key -> table name
+        self.rows = {}     # table name -> rows written
+
+    def keys(self, series):
+        """Partition key of every value: the value itself, or its date bucket as a label"""
+        import pandas as pd
+
+        if not self.period:
+            return series
+        if pd.api.types.is_datetime64_any_dtype(series):
+            dates = series
+        elif pd.api.types.is_numeric_dtype(series):
+            # Dates stored as epoch seconds
+            dates = pd.to_datetime(series, unit='s', errors='coerce')
+        else:
+            dates = pd.to_datetime(series, errors='coerce')
+        parts = [dates.dt.year]
+        if self.period in ('month', 'day'):
+            parts.append(dates.dt.month)
+        if self.period == 'day':
+            parts.append(dates.dt.day)
+        labels = parts[0].astype('Int64').astype(str)
+        for part in parts[1:]:
+            labels = labels + '_' + part.astype('Int64').astype(str).str.zfill(2)
+        return labels.mask(dates.isna())
+
+    def table_for(self, key):
+        """Partition table for a key, registering a new partition if needed"""
+        table = self.tables.get(key)
+        if table is None:
+            if len(self.tables) >= MAX_PARTITIONS:
+                hint = " (use a coarser period)" if self.period else ""
+                raise ValueError(f"More than {MAX_PARTITIONS} partitions by '{self.column}'{hint}")
+            label = NULL_PARTITION if key is None else partition_label(key)
+            table = partition_table_name(self.table_name, label)
+            suffix = 2
+            while table in self.rows:
+                table = partition_table_name(self.table_name, f"{label}_{suffix}")
+                suffix += 1
+            self.tables[key] = table
+            self.rows[table] = 0
+        return table
+
+    def split(self, batch):
+        """
+        Rows of a batch grouped by partition
+
+        Returns:
+            list: (table name, DataFrame, new) per partition present in the batch;
+                  new is True for a partition that has no table yet
+        """
+        import pandas as pd
+
+        if self.column not in batch.columns:
+            raise ValueError(f"Partition column not found in input: {self.column}")
+        keys = self.keys(batch[self.column])
+        parts = []
+        for key, part in batch.groupby(keys, sort=False, dropna=False):
+            key = None if pd.isna(key) else key
+            new = key not in self.tables
+            table = self.table_for(key)
+            self.rows[table] += len(part)
+            parts.append((table, part, new))
+        return parts
@@ -0,0 +1,259 @@
+"""
+Pipeline Module
+Runs a conversion as three overlapping stages connected by bounded queues:
+
+    read (reader thread) -> transform (transform thread) -> write (calling thread)
+
+While one batch is being inserted, the next is being cleaned and the one
+after that read, so disk reads, parsing and SQLite inserts overlap instead of
+taking turns. A full queue blocks the stage in front of it (backpressure),
+which caps memory at a few batches per queue. The write stage runs in the
+calling thread because SQLite connections are bound to the thread that
+opened them.
+
+BatchSizer picks the batch size from a memory budget: it measures the bytes
+per row of the batches read so far and sizes the next batch so that every
+batch the pipeline can hold at once fits in the budget.
+"""
+
+import os
+import time
+import queue
+import threading
+
+
+# Batches buffered between two stages
+QUEUE_SIZE = 4
+
+# Seconds between checks whether another stage has failed
+POLL_INTERVAL = 0.1
+
+PIPELINE_STAGES = ('read', 'transform', 'write')
+
+# Memory budget for the batches of one conversion, in MB
+DEFAULT_MEMORY_BUDGET_MB = 512
+MEMORY_BUDGET_ENV = 'CSVSQL_MEMORY_BUDGET_MB'
+
+# Size of the first batch, before any row has been measured
+INITIAL_BATCH_ROWS = 10_000
+
+# Limits for adaptive batch sizes: below MIN the per-batch overhead dominates;
+# above MAX batches are no faster, and fewer of them leave the stages less to overlap
+MIN_BATCH_ROWS = 1_000
+MAX_BATCH_ROWS = 50_000
+
+# Rows of each batch measured to estimate its bytes per row
+MEASURE_ROWS = 1_000
+
+# Transient copies of a batch while it is transformed and inserted
+COPY_FACTOR = 2
+
+_DONE = object()
+
+
+class _Failure:
+    """Carries an exception from a stage thread to the calling thread"""
+
+    def __init__(self, error):
+        self.error = error
+
+
+class StageStats:
+    """Work and wait times of one pipeline stage"""
+
+    def __init__(self, name):
+        self.name = name
+        self.batches = 0
+        self.rows = 0
+        self.busy_seconds = 0.0
+        self.starved_seconds = 0.0   # waiting for input from the previous stage
+        self.blocked_seconds = 0.0   # waiting for room in the next stage's queue
+
+    def as_dict(self, elapsed):
+        return {
+            'stage': self.name,
+            'batches': self.batches,
+            'rows': self.rows,
+            'busy_seconds': self.busy_seconds,
+            'starved_seconds': self.starved_seconds,
+            'blocked_seconds': self.blocked_seconds,
+            'utilization': self.busy_seconds / elapsed if elapsed else None,
+        }
+
+
+def batches_in_flight(queue_size=QUEUE_SIZE):
+    """Most batches alive at once: both queues full plus one in each stage"""
+    return 2 * queue_size + len(PIPELINE_STAGES)
+
+
+def memory_budget_mb(budget_mb=None):
+    """The given memory budget, else CSVSQL_MEMORY_BUDGET_MB, else the default"""
+    return float(budget_mb or os.environ.get(MEMORY_BUDGET_ENV) or DEFAULT_MEMORY_BUDGET_MB)
+
+
+class BatchSizer:
+    """
+    Adapts the batch size to a memory budget
+
+    Call the sizer for the number of rows of the next batch and pass every
+    batch read to observe(). The size follows the widest rows measured so
+    far, so a file whose rows get wider further down shrinks its batches.
+    """
+
+    def __init__(self, budget_mb=None, queue_size=QUEUE_SIZE, initial_rows=INITIAL_BATCH_ROWS):
+        self.budget_mb = memory_budget_mb(budget_mb)
+        self.queue_size = queue_size
+        self.rows = initial_rows
+        self.first_rows = initial_rows
+        self.bytes_per_row = None
+        self.largest_rows = 0
+        self.largest_bytes = 0
+
+    def __call__(self):
+        return self.rows
+
+    def observe(self, batch):
+        """Measure a batch and size the next one"""
+        if len(batch) == 0:
+            return
+        sample = batch.head(MEASURE_ROWS)
+        bytes_per_row = sample.memory_usage(deep=True, index=False).sum() / len(sample)
+        self.bytes_per_row = max(self.bytes_per_row or 0, bytes_per_row, 1)
+        self.largest_rows = max(self.largest_rows, len(batch))
+        self.largest_bytes = max(self.largest_bytes, bytes_per_row * len(batch))
+
+        batch_bytes = self.budget_mb * 1024 * 1024 / (batches_in_flight(self.queue_size) * COPY_FACTOR)
+        self.rows = int(min(MAX_BATCH_ROWS, max(MIN_BATCH_ROWS, batch_bytes // self.bytes_per_row)))
+
+    def as_dict(self):
+        """Chosen sizes for the run metrics"""
+        return {
+            'memory_budget_mb': self.budget_mb,
+            'bytes_per_row': self.bytes_per_row,
+            'first_batch_rows': self.first_rows,
+            'batch_rows': self.rows,
+            'largest_batch_rows': self.largest_rows,
+            'largest_batch_mb': self.largest_bytes / (1024 * 1024),
+        }
+
+
+def run_pipeline(source, transform, write, queue_size=QUEUE_SIZE):
+    """
+    Push batches from source through transform into write, with the stages overlapping
+
+    The first error in any stage stops all stages and is raised in the calling
+    thread.
+
+    Args:
+        source: Iterable of batches (e.g. Reader.raw_batches()); iterated on the reader thread
+        transform (callable): transform(batch) -> batch; runs on the transform thread
+        write (callable): write(batch); runs in the calling thread
+        queue_size (int): Maximum batches waiting between two stages
+
+    Returns:
+        dict: 'seconds' (wall time) and 'stages' (StageStats.as_dict per stage, in order)
+    """
+    stop = threading.Event()
+    read_queue = queue.Queue(maxsize=queue_size)
+    write_queue = queue.Queue(maxsize=queue_size)
+    stats = {name: StageStats(name) for name in PIPELINE_STAGES}
+
+    def put(target, item, stage):
+        """Hand an item downstream, waiting while the queue is full; False once stopped"""
+        start = time.perf_counter()
+        try:
+            while not stop.is_set():
+                try:
+                    target.put(item, timeout=POLL_INTERVAL)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        finally:
+            stage.blocked_seconds += time.perf_counter() - start
+
+    def get(source_queue, stage):
+        """Take the next item from upstream, waiting while the queue is empty; None once stopped"""
+        start = time.perf_counter()
+        try:
+            while not stop.is_set():
+                try:
+                    return source_queue.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    continue
+            return None
+        finally:
+            stage.starved_seconds += time.perf_counter() - start
+
+    def read_stage():
+        stage = stats['read']
+        iterator = iter(source)
+        try:
+            while True:
+                start = time.perf_counter()
+                batch = next(iterator, _DONE)
+                stage.busy_seconds += time.perf_counter() - start
+                if batch is _DONE:
+                    put(read_queue, _DONE, stage)
+                    return
+                stage.batches += 1
+                stage.rows += len(batch)
+                if not put(read_queue, batch, stage):
+                    return
+        except BaseException as e:
+            put(read_queue, _Failure(e), stage)
+        finally:
+            # Release the input file if the pipeline stopped early
+            close = getattr(iterator, 'close', None)
+            if close:
+                close()
+
+    def transform_stage():
+        stage = stats['transform']
+        try:
+            while True:
+                item = get(read_queue, stage)
+                if item is None:
+                    return
+                if item is _DONE or isinstance(item, _Failure):
+                    put(write_queue, item, stage)
+                    return
+                start = time.perf_counter()
+                batch = transform(item)
+                stage.busy_seconds += time.perf_counter() - start
+                stage.batches += 1
+                stage.rows += len(batch)
+                if not put(write_queue, batch, stage):
+                    return
+        except BaseException as e:
+            put(write_queue, _Failure(e), stage)
+
+    threads = [threading.Thread(target=read_stage, name='pipeline-read', daemon=True),
+               threading.Thread(target=transform_stage, name='pipeline-transform', daemon=True)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+
+    stage = stats['write']
+    try:
+        while True:
+            item = get(write_queue, stage)
+            if item is _DONE:
+                break
+            if isinstance(item, _Failure):
+                raise item.error
+            start = time.perf_counter()
+            write(item)
+            stage.busy_seconds += time.perf_counter() - start
+            stage.batches += 1
+            stage.rows += len(item)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    elapsed = time.perf_counter() - started
+    return {
+        'seconds': elapsed,
+        'stages': [stats[name].as_dict(elapsed) for name in PIPELINE_STAGES],
+    }
@@ -0,0 +1,168 @@
+"""
+Profiling Module
+Opt-in per-action profiling for GUI actions. Each profiled action writes its
+own file to the diagnostics folder:
+
+- 'cprofile': deterministic cProfile stats (.prof, open with pstats or snakeviz)
+- 'sample': low-overhead stack sampling written as collapsed stacks (.folded,
+  one "frame;frame;frame count" line per stack, as read by flamegraph.pl and
+  speedscope), suitable for leaving on in production
+
+Conversions run as background jobs (see jobs.py); the job queue profiles
+each job on its worker thread, where the conversion itself runs. Only one
+cProfile profiler can be active in a process, so an action that starts while
+another is being profiled with cProfile is sampled instead.
+
+The mode comes from the CSVSQL_PROFILE environment variable ('cprofile',
+'sample' or unset) and can be changed at runtime from the main window menu.
+"""
+
+import os
+import re
+import sys
+import time
+import logging
+import cProfile
+import itertools
+import threading
+from collections import Counter
+from functools import wraps
+
+
+PROFILE_MODES = ('cprofile', 'sample')
+PROFILE_ENV = 'CSVSQL_PROFILE'
+DIAGNOSTICS_ENV = 'CSVSQL_DIAGNOSTICS_DIR'
+DEFAULT_DIAGNOSTICS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'diagnostics')
+
+# Seconds between stack samples in 'sample' mode
+SAMPLE_INTERVAL = 0.005
+
+
+class StackSampler:
+    """Samples the call stack of one thread from a background thread"""
+
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    def write_folded(self, path):
+        """Write the samples as collapsed stacks"""
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class ActionProfiler:
+    """Wraps GUI action callbacks and profiles them while a mode is active"""
+
+    def __init__(self, mode=None, diagnostics_dir=None):
+        self.mode = None
+        try:
+            self.set_mode(mode)
+        except ValueError as e:
+            logging.warning(f"Profiling disabled: {e}")
+        self.diagnostics_dir = diagnostics_dir or os.environ.get(DIAGNOSTICS_ENV) or DEFAULT_DIAGNOSTICS_DIR
+        # Per thread, so a conversion job profiled on a worker thread and a GUI action
+        # profiled on the Tk thread do not suppress each other
+        self._local = threading.local()
+        # Held while a cProfile profiler runs; Python allows one at a time
+        self._cprofile_lock = threading.Lock()
+        # Numbers output files, so runs started in the same millisecond do not share one
+        self._sequence = itertools.count(1)
+
+    def set_mode(self, mode):
+        """Switch profiling to 'cprofile', 'sample' or off (None)"""
+        mode = (mode or '').strip().lower() or None
+        if mode in ('1', 'true', 'on'):
+            mode = 'cprofile'
+        if mode is not None and mode not in PROFILE_MODES:
+            raise ValueError(f"Profile mode must be one of: {', '.join(PROFILE_MODES)}")
+        self.mode = mode
+
+    def output_path(self, action, extension):
+        """File for one profiled run of an action, unique per call"""
+        os.makedirs(self.diagnostics_dir, exist_ok=True)
+        safe_action = re.sub('[^a-zA-Z0-9_]', '_', action)
+        now = time.time()
+        stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(now)) + f"-{int(now * 1000) % 1000:03d}"
+        return os.path.join(self.diagnostics_dir, f"{stamp}-{next(self._sequence):04d}_{safe_action}{extension}")
+
+    def run(self, action, func, *args, **kwargs):
+        """Call func, profiling it if a mode is active"""
+        # Nested actions (a dialog opened from a profiled action) are part of the outer profile
+        if self.mode is None or getattr(self._local, 'active', False):
+            return func(*args, **kwargs)
+
+        self._local.active = True
+        mode = self.mode
+        if mode == 'cprofile' and not self._cprofile_lock.acquire(blocking=False):
+            # Another thread is being profiled with cProfile
+            mode = 'sample'
+        path = None
+        start = time.perf_counter()
+        try:
+            if mode == 'cprofile':
+                profiler = cProfile.Profile()
+                try:
+                    return profiler.runcall(func, *args, **kwargs)
+                finally:
+                    self._cprofile_lock.release()
+                    path = self.output_path(action, '.prof')
+                    profiler.dump_stats(path)
+            else:
+                sampler = StackSampler(threading.get_ident())
+                sampler.start()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    sampler.stop()
+                    path = self.output_path(action, '.folded')
+                    sampler.write_folded(path)
+        finally:
+            self._local.active = False
+            logging.info(f"Profiled {action} ({mode}) in {time.perf_counter() - start:.3f}s: {path}")
+
+    def wrap(self, action, func):
+        """
+        Return a callback that runs func through the profiler
+
+        The mode is checked on every call, so wrapped callbacks follow
+        runtime changes of the profiling switch.
+        """
+        @wraps(func)
+        def profiled(*args, **kwargs):
+            return self.run(action, func, *args, **kwargs)
+        return profiled
+
+
+# Singleton instance for application-wide profiling
+app_profiler = ActionProfiler(os.environ.get(PROFILE_ENV))
+
+
+def get_app_profiler():
+    """Get the application's global action profiler"""
+    return app_profiler
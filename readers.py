@@ -0,0 +1,645 @@
+"""
+Readers Module
+Input readers for the converter. Every reader turns one source file into
+pandas DataFrames with typed columns, either batch by batch (batches) or all
+at once (read_all), so CSV, TSV, JSON Lines, Parquet and fixed-width files
+all feed the same schema, encoding and SQLite writing logic.
+
+Readers raise FileNotFoundError, PermissionError or ValueError (empty or
+unparseable input) like the rest of the converter; delimited text can skip
+unparseable rows instead (skip_bad_lines). Parquet needs the optional
+pyarrow package.
+"""
+
+import os
+import re
+import bz2
+import gzip
+import json
+import lzma
+import codecs
+import logging
+import warnings
+import threading
+import numpy as np
+import pandas as pd
+from pandas.io.common import get_handle
+
+
+# Rows per batch for readers that stream their input
+DEFAULT_BATCH_ROWS = 100_000
+
+# Rows read up front to find the text columns of a streamed text file
+TYPE_SAMPLE_ROWS = 10_000
+
+# How the pandas C parser reports a row it skipped (on_bad_lines='warn')
+BAD_LINE_PATTERN = re.compile(r'Skipping line (\d+): (.+)')
+
+# Warning capture replaces process-wide state, so only one reader captures at a time
+_capture_lock = threading.Lock()
+
+# Encodings tried in turn when a text file is not valid UTF-8
+FALLBACK_ENCODINGS = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
+
+# Openers for the compressed inputs pandas reads transparently; other archives are not scanned
+COMPRESSED_OPENERS = {'.gz': gzip.open, '.bz2': bz2.open, '.xz': lzma.open}
+UNSCANNED_EXTENSIONS = ('.zip', '.zst', '.tar')
+
+# Bytes decoded at a time when scanning a file for its encoding
+ENCODING_SCAN_BYTES = 1 << 20
+
+# Characters of JSON Lines input checked for new keys at a time
+KEY_SCAN_CHARS = 1 << 20
+
+# A key followed by whitespace before its colon, which the fast key check does not count
+SPACED_KEY_PATTERN = re.compile(r'"\s+:')
+
+# Bytes at the start of a file scanned for its encoding; a decode error after
+# them switches encodings mid-stream (see TextReader.batches)
+ENCODING_SCAN_LIMIT = 4 << 20
+
+
+def detect_encoding(path):
+    """
+    First of FALLBACK_ENCODINGS that decodes the first ENCODING_SCAN_LIMIT bytes
+
+    A chunked read cannot switch encodings once the first rows are parsed, so
+    the start of streamed text is scanned up front; only the prefix is read,
+    to keep large (or compressed) inputs from being decoded twice.
+
+    Returns:
+        str: Encoding name, or None if the file cannot be scanned
+    """
+    if not isinstance(path, (str, os.PathLike)):
+        return None
+    extension = os.path.splitext(path)[1].lower()
+    if extension in UNSCANNED_EXTENSIONS:
+        return None
+    opener = COMPRESSED_OPENERS.get(extension, open)
+    for encoding in FALLBACK_ENCODINGS:
+        decoder = codecs.getincrementaldecoder(encoding)()
+        try:
+            scanned = 0
+            with opener(path, 'rb') as f:
+                while scanned < ENCODING_SCAN_LIMIT and (block := f.read(ENCODING_SCAN_BYTES)):
+                    decoder.decode(block)
+                    scanned += len(block)
+            if scanned < ENCODING_SCAN_LIMIT:
+                # The whole file was scanned: it must not end mid-character
+                decoder.decode(b'', final=True)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return None
+
+
+class Reader:
+    """
+    Base class for input readers
+
+    Subclasses implement batches(); read_all() concatenates the batches
+    unless a reader can load the whole file more efficiently.
+    """
+
+    format = None
+
+    def __init__(self, path, **options):
+        self.path = path
+        self.options = options
+        self.bad_line_callback = None
+
+    def skip_bad_lines(self, callback):
+        """
+        Skip rows that cannot be parsed instead of failing
+
+        callback(line, reason) is called for every skipped row, on the thread
+        reading the batches. Formats without row-level recovery (JSON Lines,
+        Parquet, fixed-width) still raise ValueError.
+        """
+        self.bad_line_callback = callback
+
+    def batches(self, batch_rows=DEFAULT_BATCH_ROWS):
+        """
+        Yield DataFrames of at most batch_rows rows, all with the same columns
+
+        batch_rows may also be a callable returning the size of the next batch
+        (see pipeline.BatchSizer). Parquet batches follow the file's row groups instead.
+        """
+        raise NotImplementedError
+
+    def raw_batches(self, batch_rows=DEFAULT_BATCH_ROWS):
+        """
+        Yield batches for the conversion pipeline, whose ColumnCoercer fixes
+        the column types once for the whole file; typed formats return batches()
+        """
+        return self.batches(batch_rows)
+
+    def read_all(self):
+        """
+        Read the whole input into one DataFrame
+
+        Raises:
+            ValueError: If the input has no rows
+        """
+        frames = list(self.batches())
+        if not frames:
+            raise ValueError(f"{self.format} file is empty")
+        df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+        if df.empty:
+            raise ValueError(f"{self.format} file contains no data")
+        return df
+
+
+class TextReader(Reader):
+    """Base for text formats read through pandas, with the encoding fallback of the CSV reader"""
+
+    def _read(self, **kwargs):
+        """Call the pandas reader, retrying with common encodings on decode errors"""
+        try:
+            return self._pandas_read(**kwargs)
+        except pd.errors.EmptyDataError:
+            raise ValueError(f"{self.format} file is empty")
+        except pd.errors.ParserError as e:
+            raise ValueError(f"Error parsing {self.format} file: {e}")
+        except UnicodeDecodeError:
+            kwargs.pop('encoding', None)
+            for encoding in FALLBACK_ENCODINGS:
+                try:
+                    return self._pandas_read(encoding=encoding, **kwargs)
+                except UnicodeDecodeError:
+                    continue
+            raise ValueError(f"Unable to decode {self.format} file with common encodings")
+
+    def _pandas_read(self, **kwargs):
+        raise NotImplementedError
+
+    def _normalize(self, df):
+        """Adjust a freshly read batch (hook for subclasses)"""
+        return df
+
+    def _stream_encoding(self):
+        """Encoding option for chunked reads: the given one, else the one detected for the file"""
+        if 'encoding' in self.options:
+            return {}
+        if not hasattr(self, '_encoding'):
+            self._encoding = detect_encoding(self.path)
+        return {'encoding': self._encoding} if self._encoding else {}
+
+    def _fallback_encoding(self):
+        """
+        Switch the stream to the next of FALLBACK_ENCODINGS after a decode error
+        past the scanned prefix
+
+        Returns:
+            dict: Encoding option for the retried read, or None if there is none left
+        """
+        if 'encoding' in self.options:
+            return None
+        current = getattr(self, '_encoding', None) or FALLBACK_ENCODINGS[0]
+        if current not in FALLBACK_ENCODINGS[:-1]:
+            return None
+        self._encoding = FALLBACK_ENCODINGS[FALLBACK_ENCODINGS.index(current) + 1]
+        return {'encoding': self._encoding}
+
+    def _parse(self, parse, report=True):
+        """
+        Run parse(), passing the rows pandas skipped to the bad line callback
+        (or dropping them if report is False)
+        """
+        if self.bad_line_callback is None:
+            return parse()
+        with _capture_lock, warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always', pd.errors.ParserWarning)
+            result = parse()
+        for warning in caught:
+            bad_lines = BAD_LINE_PATTERN.findall(str(warning.message))
+            if not bad_lines:
+                # Not ours (possibly from another thread): pass it on
+                warnings.warn_explicit(warning.message, warning.category, warning.filename, warning.lineno)
+            elif report:
+                for line, reason in bad_lines:
+                    self.bad_line_callback(int(line), reason.strip())
+        return result
+
+    def batches(self, batch_rows=DEFAULT_BATCH_ROWS, **kwargs):
+        next_rows = batch_rows if callable(batch_rows) else (lambda: batch_rows)
+        encoding = self._stream_encoding()
+        consumed = 0   # Rows read for the batches yielded so far
+        while True:
+            with self._read(chunksize=next_rows(), **encoding, **kwargs) as chunks:
+                # Chunked readers only parse while iterating, so errors show up here
+                try:
+                    # After an encoding switch, pass over the rows already yielded
+                    skip = consumed
+                    while skip:
+                        chunks.chunksize = min(skip, DEFAULT_BATCH_ROWS)
+                        self._parse(lambda: next(chunks, None), report=False)
+                        skip -= chunks.chunksize
+                    while True:
+                        # The CSV and JSON chunk readers read chunksize rows on every next()
+                        chunks.chunksize = next_rows()
+                        chunk = self._parse(lambda: next(chunks, None))
+                        if chunk is None:
+                            return
+                        consumed += chunks.chunksize
+                        yield self._normalize(chunk)
+                except UnicodeDecodeError:
+                    # Invalid characters past the prefix detect_encoding scanned
+                    encoding = self._fallback_encoding()
+                    if encoding is None:
+                        raise ValueError(f"Unable to decode {self.format} file: invalid characters after the first rows")
+                    logging.info(f"Decode error after {consumed} rows, reading the rest as {encoding['encoding']}")
+                except ValueError as e:
+                    raise ValueError(f"Error parsing {self.format} file: {e}")
+
+
+class UntypedTextReader(TextReader):
+    """Text formats whose columns carry no type information of their own"""
+
+    def raw_batches(self, batch_rows=DEFAULT_BATCH_ROWS):
+        """
+        Columns that are text in the first rows are read as text in every
+        batch, so a later batch of digits only (zip codes, ids) keeps its
+        leading zeros; numeric columns are still parsed by pandas per batch
+        """
+        sample_rows = min(batch_rows() if callable(batch_rows) else batch_rows, TYPE_SAMPLE_ROWS)
+        encoding = self._stream_encoding()
+        sample = self._parse(lambda: self._read(nrows=sample_rows, **encoding), report=False)
+        if len(sample) < sample_rows:
+            # The whole file fits in the sample: read it once more reporting skipped rows
+            if len(sample):
+                yield self._normalize(self._parse(lambda: self._read(**encoding))
+                                      if self.bad_line_callback else sample)
+            return
+        text_columns = {col: str for col in sample.columns if infer_kind(sample[col]) == 'text'}
+        yield from self.batches(batch_rows, dtype=text_columns)
+
+
+class CsvReader(UntypedTextReader):
+    """Delimited text (CSV, or TSV with sep='\\t')"""
+
+    format = 'CSV'
+
+    def _pandas_read(self, **kwargs):
+        if self.bad_line_callback:
+            kwargs['on_bad_lines'] = 'warn'
+        return pd.read_csv(self.path, **self.options, **kwargs)
+
+    def read_all(self):
+        # One read_csv call infers each column's type from the whole file
+        df = self._parse(self._read)
+        if df.empty:
+            raise ValueError(f"{self.format} file contains no data")
+        return df
+
+
+class FixedWidthReader(UntypedTextReader):
+    """
+    Fixed-width text columns
+
+    Column positions are inferred from the first rows unless widths (list of
+    column widths) or colspecs (list of (start, end) pairs) are given.
+    """
+
+    format = 'Fixed-width'
+
+    def _pandas_read(self, **kwargs):
+        return pd.read_fwf(self.path, **self.options, **kwargs)
+
+
+class JsonLinesReader(TextReader):
+    """
+    JSON Lines: one JSON object per line, keys become columns
+
+    A chunk read by pandas only has the keys of its own rows, so the keys of
+    the whole file are collected first and every batch gets all of them.
+    """
+
+    format = 'JSON Lines'
+
+    def _pandas_read(self, **kwargs):
+        return pd.read_json(self.path, lines=True, **self.options, **kwargs)
+
+    def _keys(self):
+        """
+        Top-level keys of every object in the file, in order of first appearance
+
+        Returns:
+            list: Key names, or None if the input is not a file that can be scanned
+        """
+        if not isinstance(self.path, (str, os.PathLike)):
+            return None
+        if not hasattr(self, '_key_list'):
+            keys = {}
+            known = set()   # How the keys found so far are written, with the colon
+            encoding = self.options.get('encoding') or self._stream_encoding().get('encoding', 'utf-8')
+            with get_handle(self.path, 'r', encoding=encoding, errors='replace',
+                            compression=self.options.get('compression', 'infer')) as handles:
+                rest = ''
+                while block := handles.handle.read(KEY_SCAN_CHARS):
+                    block = rest + block
+                    cut = block.rfind('\n') + 1
+                    block, rest = block[:cut], block[cut:]
+                    if self._only_known_keys(block, known):
+                        continue
+                    self._add_keys(keys, block)
+                    known = {json.dumps(key, ensure_ascii=ascii) + ':'
+                             for key in keys for ascii in (True, False)}
+                # A last line without a line break
+                self._add_keys(keys, rest)
+            self._key_list = list(keys)
+        return self._key_list
+
+    @staticmethod
+    def _add_keys(keys, block):
+        """Parse a block of lines and add the keys of its objects to keys (a dict used as ordered set)"""
+        for line in block.splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Blank or malformed: the read itself reports malformed lines
+                continue
+            if isinstance(record, dict):
+                keys.update(dict.fromkeys(record))
+
+    @staticmethod
+    def _only_known_keys(block, known):
+        """
+        True if every key in a block of lines, nested ones included, is one of
+        the known keys, checked without parsing the JSON
+
+        Every '":' ends a key when no string holds an escaped quote, so the block
+        has no new key if the known keys account for all of them.
+        """
+        if not known or '\\"' in block or SPACED_KEY_PATTERN.search(block):
+            return False
+        return block.count('":') == sum(block.count(key) for key in known)
+
+    def batches(self, batch_rows=DEFAULT_BATCH_ROWS, **kwargs):
+        columns = self._keys()
+        for batch in super().batches(batch_rows, **kwargs):
+            if columns is not None:
+                # Keys missing from this chunk are empty (text) columns, as in an unbatched read
+                missing = [col for col in columns if col not in batch.columns]
+                if missing:
+                    batch = batch.assign(**{col: pd.Series(None, index=batch.index, dtype=object)
+                                            for col in missing})
+                batch = batch[columns + [col for col in batch.columns if col not in columns]]
+            yield batch
+
+    def _normalize(self, df):
+        return flatten_nested(df)
+
+
+class ParquetReader(Reader):
+    """Parquet files, read one row group at a time"""
+
+    format = 'Parquet'
+
+    def _open(self):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Reading Parquet files needs the pyarrow package (pip install pyarrow)")
+        try:
+            return pq.ParquetFile(self.path, **self.options)
+        except Exception as e:
+            raise ValueError(f"Error reading Parquet file: {e}")
+
+    def batches(self, batch_rows=DEFAULT_BATCH_ROWS):
+        # Row groups are the unit Parquet files are written and compressed in,
+        # so batch_rows (and an adaptive size) does not split them
+        parquet_file = self._open()
+        for index in range(parquet_file.num_row_groups):
+            table = parquet_file.read_row_group(index)
+            yield flatten_nested(table.to_pandas(types_mapper=nullable_integer_type))
+
+
+def nullable_integer_type(arrow_type):
+    """Map Arrow integer columns to pandas nullable Int64 so NULLs do not turn them into floats"""
+    import pyarrow as pa
+    if pa.types.is_integer(arrow_type):
+        return pd.Int64Dtype()
+    return None
+
+
+NESTED_TYPES = (dict, list, np.ndarray)
+
+
+def _to_json(value):
+    """JSON text for a nested value; arrays (Parquet lists) become JSON lists"""
+    return json.dumps(value, default=lambda item: item.tolist() if hasattr(item, 'tolist') else str(item))
+
+
+def flatten_nested(df):
+    """Store nested values (objects and arrays) as JSON text, since SQLite has no such types"""
+    for col in df.columns:
+        if df[col].dtype == object:
+            nested = df[col].map(lambda value: isinstance(value, NESTED_TYPES))
+            if nested.any():
+                df[col] = df[col].map(lambda value: _to_json(value) if isinstance(value, NESTED_TYPES) else value)
+    return df
+
+
+# Spellings read_csv accepts as booleans
+BOOLEAN_VALUES = {'True': True, 'TRUE': True, 'true': True, 'False': False, 'FALSE': False, 'false': False}
+
+# Values of a bool column, whether it was read as text or as Python booleans
+_BOOLEAN_LOOKUP = {**BOOLEAN_VALUES, True: True, False: False}
+
+
+def infer_kind(series, tolerance=0.0):
+    """
+    Type of a column: 'integer', 'float', 'bool', 'text' or 'other'
+
+    Text columns are inspected the way read_csv would type them: all values
+    numeric gives integer or float, all values boolean words gives bool.
+
+    Args:
+        series: Column to inspect
+        tolerance (float): Share of text values allowed to not fit a numeric
+                           or bool type (values that will be rejected)
+    """
+    if pd.api.types.is_bool_dtype(series):
+        return 'bool'
+    if pd.api.types.is_integer_dtype(series):
+        return 'integer'
+    if pd.api.types.is_float_dtype(series):
+        return 'float'
+    if not (pd.api.types.is_string_dtype(series) or series.dtype == object):
+        return 'other'
+
+    values = series.dropna()
+    sample = values.head(1000)
+    if not values.empty and all(isinstance(value, (bool, np.bool_)) for value in sample):
+        # Booleans with missing values (read_csv gives an object column)
+        return 'bool'
+    if values.empty or not all(isinstance(value, str) for value in sample):
+        return 'text'
+    def fits(matches, count):
+        return count - int(matches.sum()) <= tolerance * count
+
+    # Check the sample first: most text columns fail on it, which spares converting the whole column
+    if fits(sample.isin(BOOLEAN_VALUES.keys()), len(sample)) and fits(values.isin(BOOLEAN_VALUES.keys()), len(values)):
+        return 'bool'
+    if not fits(pd.to_numeric(sample, errors='coerce').notna(), len(sample)):
+        return 'text'
+    numbers = pd.to_numeric(values, errors='coerce')
+    valid = numbers.notna()
+    if fits(valid, len(values)):
+        numbers = numbers[valid]
+        if numbers.dtype.kind in 'iu' or (tolerance and (numbers == numbers.round()).all()):
+            return 'integer'
+        return 'float'
+    return 'text'
+
+
+# Share of values in the first batch that may be rejected without giving up a column's type
+REJECT_TOLERANCE = 0.01
+
+
+# Dtype of each column kind in every coerced batch (integer columns with
+# non-integral values stay float64)
+COERCED_DTYPES = {'integer': pd.Int64Dtype(), 'float': np.dtype('float64'), 'bool': pd.BooleanDtype()}
+
+
+class ColumnCoercer:
+    """
+    Fixes column types on the first batch and converts later batches to them
+
+    Values that do not fit the type of their column are kept unchanged (SQLite
+    stores them as they are) and counted in mismatches, or, with a reject
+    callback, their rows are removed from the batch and passed to
+    reject(rows, reasons) with the original values and one reason per row.
+    """
+
+    def __init__(self, reject=None):
+        self.reject = reject
+        self.kinds = None
+        self.mismatches = {}
+
+    def coerce(self, df):
+        """Convert the columns of a batch to the types chosen on the first batch"""
+        if self.kinds is None:
+            tolerance = REJECT_TOLERANCE if self.reject else 0.0
+            self.kinds = {col: infer_kind(df[col], tolerance) for col in df.columns}
+            self.mismatches = {col: 0 for col in df.columns}
+
+        converted_columns = {}
+        failures = {}
+        for col, kind in self.kinds.items():
+            if kind in ('text', 'other') or col not in df.columns:
+                continue
+            series = df[col]
+            # Every batch of a column gets the same dtype, which duplicate hashes depend on
+            if series.dtype == COERCED_DTYPES[kind]:
+                continue
+            if (kind == 'bool' and pd.api.types.is_bool_dtype(series)
+                    or kind == 'integer' and pd.api.types.is_integer_dtype(series)
+                    or kind == 'float' and (pd.api.types.is_integer_dtype(series) or pd.api.types.is_float_dtype(series))):
+                # Values of the right kind already: only the dtype changes
+                converted_columns[col] = series.astype(COERCED_DTYPES[kind])
+                continue
+
+            if kind == 'bool':
+                converted = series.map(_BOOLEAN_LOOKUP)
+            else:
+                converted = pd.to_numeric(series, errors='coerce')
+            failed = converted.isna() & series.notna()
+
+            if kind == 'integer' and self.reject:
+                # A non-integral number does not fit an integer column either
+                fractional = converted.notna() & (converted != converted.round())
+                failed |= fractional
+                converted = converted.where(~fractional)
+
+            if failed.any():
+                self.mismatches[col] += int(failed.sum())
+                failures[col] = failed
+                if not self.reject:
+                    converted = converted.astype('object')
+                    converted[failed] = series[failed]
+                    converted_columns[col] = converted
+                    continue
+            if kind == 'integer':
+                # Integer columns with missing values stay integers
+                integral = converted.dropna()
+                if (integral == integral.round()).all():
+                    converted = converted.astype('Int64')
+            elif kind == 'bool':
+                converted = converted.astype('boolean')
+            elif kind == 'float':
+                converted = converted.astype('float64')
+            converted_columns[col] = converted
+
+        rejected = None
+        if self.reject and failures:
+            rejected = pd.concat(failures.values(), axis=1).any(axis=1)
+            reasons = {index: [] for index in df.index[rejected]}
+            for col, failed in failures.items():
+                for index, value in df.loc[failed, col].items():
+                    reasons[index].append(f"{col}: '{value}' is not {self.kinds[col]}")
+            self.reject(df[rejected], ['; '.join(reason) for reason in reasons.values()])
+
+        for col, converted in converted_columns.items():
+            df[col] = converted
+        if rejected is not None:
+            df = df[~rejected]
+        return df
+
+    def log_summary(self):
+        """Log columns where later rows did not match the type of the first rows"""
+        outcome = "and their rows were rejected" if self.reject else "and were stored unchanged"
+        for col, count in self.mismatches.items():
+            if count:
+                logging.warning(f"Column {col}: {count} value(s) did not match its {self.kinds[col]} type {outcome}")
+
+
+# Reader class and default options per input format
+INPUT_FORMATS = {
+    'csv': (CsvReader, {}),
+    'tsv': (CsvReader, {'sep': '\t'}),
+    'jsonl': (JsonLinesReader, {}),
+    'parquet': (ParquetReader, {}),
+    'fwf': (FixedWidthReader, {}),
+}
+
+# File extensions recognized for each input format; anything else is read as CSV
+FORMAT_EXTENSIONS = {
+    '.csv': 'csv',
+    '.txt': 'csv',
+    '.tsv': 'tsv',
+    '.tab': 'tsv',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.fwf': 'fwf',
+    # .dat files are as often delimited as fixed-width: read them as CSV and
+    # pass input_format='fwf' for fixed-width ones
+    '.dat': 'csv',
+}
+
+
+def detect_format(path):
+    """Input format implied by a file's extension, or None if it is not recognized"""
+    return FORMAT_EXTENSIONS.get(os.path.splitext(path)[1].lower())
+
+
+def get_reader(path, input_format=None, **options):
+    """
+    Create the reader for an input file
+
+    Args:
+        path (str): Input file
+        input_format (str): One of INPUT_FORMATS; detected from the extension if None
+        **options: Reader options passed to the pandas/pyarrow reader (e.g. sep, widths)
+
+    Returns:
+        Reader: Reader for the file
+    """
+    input_format = input_format or detect_format(path) or 'csv'
+    if input_format not in INPUT_FORMATS:
+        raise ValueError(f"Input format must be one of: {', '.join(INPUT_FORMATS)}")
+    reader_class, defaults = INPUT_FORMATS[input_format]
+    return reader_class(path, **{**defaults, **options})
@@ -0,0 +1,75 @@
+"""
+Rejects Module
+Quarantine for rows that could not be loaded. With reject_bad_rows, rows the
+parser cannot split into the right number of fields and rows whose values do
+not fit their column's type are stored in a <table>__rejects table with their
+position and the reason, while the rest of the file is loaded normally.
+"""
+
+import json
+import threading
+
+from sql_util import quote
+
+
+def rejects_table_name(table_name):
+    """Name of the table holding the rejected rows of a table"""
+    return f"{table_name}__rejects"
+
+
+def drop_rejects_table(conn, table_name):
+    """Remove the rejects of a previous conversion (caller commits)"""
+    conn.execute(f'DROP TABLE IF EXISTS {quote(rejects_table_name(table_name))}')
+
+
+def create_rejects_table(conn, table_name):
+    """
+    Create an empty rejects table (caller commits)
+
+    line is the line number reported by the parser for rows it skipped (a
+    quoted value spanning several lines counts as one line), row the 1-based
+    position among the parsed rows for values of the wrong type, and data the
+    original values of such a row as a JSON object.
+    """
+    drop_rejects_table(conn, table_name)
+    conn.execute(f'''CREATE TABLE {quote(rejects_table_name(table_name))} (
+        line INTEGER,
+        row INTEGER,
+        reason TEXT NOT NULL,
+        data TEXT
+    )''')
+
+
+class RejectLog:
+    """
+    Collects rejected rows from the reader and transform threads until the
+    writer stores them with write()
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def add_bad_line(self, line, reason):
+        """A source line the parser skipped (Reader.skip_bad_lines callback)"""
+        with self._lock:
+            self._pending.append((line, None, reason, None))
+            self.count += 1
+
+    def add_rows(self, rows, reasons):
+        """Rows removed for type mismatches (ColumnCoercer reject callback)"""
+        rejected = [(None, int(index) + 1, reason, json.dumps(values, default=str))
+                    for (index, values), reason in zip(rows.to_dict('index').items(), reasons)]
+        with self._lock:
+            self._pending.extend(rejected)
+            self.count += len(rejected)
+
+    def write(self, conn, table_name):
+        """Insert the rejects collected since the last call (caller commits)"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if pending:
+            conn.executemany(f'INSERT INTO {quote(rejects_table_name(table_name))} VALUES (?, ?, ?, ?)',
+                             pending)
+        return len(pending)
@@ -0,0 +1,10 @@
+"""
+SQL Utility Module
+Helpers shared by the modules that build SQL statements. Kept free of
+pandas and Tk imports so the database tools can use them at startup.
+"""
+
+
+def quote(name):
+    """Quote an identifier (table, view, index or column name) for SQLite"""
+    return '"' + str(name).replace('"', '""') + '"'
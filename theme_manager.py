@@ -3,6 +3,8 @@ Theme Manager Module for GUI Applications
 Provides dark/light mode theming functionality that can be applied to any tkinter window.
 """
 
+import time
+import logging
 import tkinter as tk
 
 class ThemeManager:
@@ -65,6 +67,9 @@ class ThemeManager:
         
         self.current_theme = self.themes['light'].copy()
         self.theme_callbacks = []  # Store callbacks to notify when theme changes
+        
+        # Widget roles styled, widgets reconfigured and time taken by the last theme switch
+        self.last_switch_stats = {'roles': 0, 'widgets': 0, 'seconds': 0.0}
     
     def get_current_theme(self):
         """Get the current theme dictionary"""
@@ -81,11 +86,17 @@ class ThemeManager:
         self.current_theme = self.themes[theme_name].copy()
         
         # Notify all registered callbacks
+        start = time.perf_counter()
+        self.last_switch_stats = {'roles': 0, 'widgets': 0, 'seconds': 0.0}
         for callback in self.theme_callbacks:
             try:
                 callback(self.current_theme)
             except Exception as e:
                 print(f"Error in theme callback: {e}")
+        self.last_switch_stats['seconds'] = time.perf_counter() - start
+        logging.debug(f"Theme switched to {theme_name}: {self.last_switch_stats['widgets']} widgets "
+                      f"in {self.last_switch_stats['roles']} roles reconfigured in "
+                      f"{self.last_switch_stats['seconds'] * 1000:.1f} ms")
     
     def register_theme_callback(self, callback):
         """Register a callback to be called when theme changes"""
@@ -100,6 +111,48 @@ class ThemeManager:
         """Get appropriate text for theme toggle button"""
         return "🌙 Dark Mode" if not self.is_dark_mode else "☀️ Light Mode"
     
+    def widget_colors(self, widget_type, special_role=None):
+        """
+        Color options a widget should have under the current theme
+        
+        Args:
+            widget_type: Widget class ('frame', 'label', 'button', 'entry')
+            special_role: Special role for custom coloring ('title', 'subtitle', 'status_good', 
+                         'status_error', 'convert', 'edit', 'exit', 'theme_toggle')
+        
+        Returns:
+            dict: configure() options; empty for widget types that are not themed
+        """
+        if widget_type == 'frame':
+            return {'bg': self.current_theme['bg']}
+            
+        elif widget_type == 'label':
+            if special_role in ('title', 'subtitle'):
+                fg_color = self.current_theme[f'{special_role}_color']
+            elif special_role in ('status_good', 'status_info', 'status_error', 'status_warning'):
+                fg_color = self.current_theme[special_role]
+            else:
+                fg_color = self.current_theme['text']
+            return {'bg': self.current_theme['bg'], 'fg': fg_color}
+            
+        elif widget_type == 'button':
+            if special_role in ('convert', 'edit', 'exit'):
+                prefix = special_role
+            elif special_role == 'theme_toggle':
+                prefix = 'theme_button'
+            else:
+                prefix = 'button'
+            return {'bg': self.current_theme[f'{prefix}_bg'], 'fg': self.current_theme[f'{prefix}_fg']}
+            
+        elif widget_type == 'entry':
+            return {
+                'bg': self.current_theme['entry_bg'],
+                'fg': self.current_theme['entry_fg'],
+                'insertbackground': self.current_theme['text']  # Cursor color
+            }
+        
+        return {}
+    
     def apply_theme_to_widget(self, widget, widget_type=None, special_role=None):
         """
         Apply current theme to a specific widget
@@ -107,84 +160,50 @@ class ThemeManager:
         Args:
             widget: The tkinter widget to theme
             widget_type: Override widget class detection ('frame', 'label', 'button', 'entry')
-            special_role: Special role for custom coloring ('title', 'subtitle', 'status_good', 
-                         'status_error', 'convert', 'edit', 'exit', 'theme_toggle')
+            special_role: Special role for custom coloring (see widget_colors)
         """
         if not widget_type:
             widget_type = widget.winfo_class().lower()
         
+        colors = self.widget_colors(widget_type, special_role)
+        if not colors:
+            return
         try:
-            if widget_type == 'frame':
-                widget.configure(bg=self.current_theme['bg'])
-                
-            elif widget_type == 'label':
-                bg_color = self.current_theme['bg']
-                
-                if special_role == 'title':
-                    fg_color = self.current_theme['title_color']
-                elif special_role == 'subtitle':
-                    fg_color = self.current_theme['subtitle_color']
-                elif special_role == 'status_good':
-                    fg_color = self.current_theme['status_good']
-                elif special_role == 'status_info':
-                    fg_color = self.current_theme['status_info']
-                elif special_role == 'status_error':
-                    fg_color = self.current_theme['status_error']
-                elif special_role == 'status_warning':
-                    fg_color = self.current_theme['status_warning']
-                else:
-                    fg_color = self.current_theme['text']
-                
-                widget.configure(bg=bg_color, fg=fg_color)
-                
-            elif widget_type == 'button':
-                if special_role == 'convert':
-                    bg_color = self.current_theme['convert_bg']
-                    fg_color = self.current_theme['convert_fg']
-                elif special_role == 'edit':
-                    bg_color = self.current_theme['edit_bg']
-                    fg_color = self.current_theme['edit_fg']
-                elif special_role == 'exit':
-                    bg_color = self.current_theme['exit_bg']
-                    fg_color = self.current_theme['exit_fg']
-                elif special_role == 'theme_toggle':
-                    bg_color = self.current_theme['theme_button_bg']
-                    fg_color = self.current_theme['theme_button_fg']
-                else:
-                    bg_color = self.current_theme['button_bg']
-                    fg_color = self.current_theme['button_fg']
-                
-                widget.configure(bg=bg_color, fg=fg_color)
-                
-            elif widget_type == 'entry':
-                widget.configure(
-                    bg=self.current_theme['entry_bg'],
-                    fg=self.current_theme['entry_fg'],
-                    insertbackground=self.current_theme['text']  # Cursor color
-                )
-                
+            widget.configure(**colors)
         except tk.TclError as e:
             # Some widgets might not support certain configure options
             print(f"Theme application warning for {widget}: {e}")
     
-    def apply_theme_recursively(self, widget, special_widgets=None):
+    def apply_theme_to_registry(self, registry):
         """
-        Recursively apply theme to a widget and all its children
+        Apply the current theme to registered widgets, one style per role
+        
+        The colors of each widget type and role are worked out once and then
+        configured on every widget registered for them, so a theme switch
+        does not walk the widget tree or look up each widget's role.
         
         Args:
-            widget: Root widget to start theming from
-            special_widgets: Dict mapping widget objects to their special roles
-        """
-        if special_widgets is None:
-            special_widgets = {}
+            registry: Dict mapping (widget_type, special_role) to the widgets
+                      registered for them, as kept by ThemableWindow
         
-        # Apply theme to current widget
-        special_role = special_widgets.get(widget)
-        self.apply_theme_to_widget(widget, special_role=special_role)
+        Returns:
+            int: Number of widgets configured
+        """
+        configured = 0
+        for (widget_type, special_role), widgets in registry.items():
+            colors = self.widget_colors(widget_type, special_role)
+            for widget in list(widgets):
+                try:
+                    widget.configure(**colors)
+                except tk.TclError:
+                    # Destroyed without its <Destroy> binding having run
+                    del widgets[widget]
+                    continue
+                configured += 1
         
-        # Recursively apply to children
-        for child in widget.winfo_children():
-            self.apply_theme_recursively(child, special_widgets)
+        self.last_switch_stats['roles'] += len(registry)
+        self.last_switch_stats['widgets'] += configured
+        return configured
     
     def create_theme_toggle_button(self, parent_frame, callback=None):
         """
@@ -227,14 +246,40 @@ class ThemableWindow:
         else:
             self.theme_manager = theme_manager
         
-        self.special_widgets = {}  # Map widgets to their special roles
+        # (widget type, special role) -> widgets with that style, as an insertion-ordered dict
+        self.themed_widgets = {}
         
         # Register for theme updates
         self.theme_manager.register_theme_callback(self.on_theme_changed)
     
     def register_special_widget(self, widget, role):
-        """Register a widget with a special theming role"""
-        self.special_widgets[widget] = role
+        """Register a widget with a special theming role, replacing its previous role"""
+        self.register_themed_widget(widget, role)
+    
+    def register_themed_widget(self, widget, role=None):
+        """Add a widget to the registry that apply_theme updates, under its role"""
+        widget_type = widget.winfo_class().lower()
+        if not self.theme_manager.widget_colors(widget_type):
+            return
+        if not self.forget_widget(widget):
+            # First registration: drop the widget from the registry when it is destroyed
+            widget.bind('<Destroy>', lambda event, widget=widget: self.forget_widget(widget), add='+')
+        self.themed_widgets.setdefault((widget_type, role), {})[widget] = None
+    
+    def forget_widget(self, widget):
+        """Remove a widget from the registry; returns whether it was registered"""
+        for key, widgets in self.themed_widgets.items():
+            if widget in widgets:
+                del widgets[widget]
+                if not widgets:
+                    del self.themed_widgets[key]
+                return True
+        return False
+    
+    def themed(self, widget):
+        """Register a newly created widget for theming and return it"""
+        self.register_themed_widget(widget)
+        return widget
     
     def on_theme_changed(self, new_theme):
         """Called when theme changes - override in subclasses"""
@@ -244,14 +289,14 @@ class ThemableWindow:
     def apply_theme(self):
         """Apply current theme to this window"""
         if hasattr(self, 'window'):
-            self.theme_manager.apply_theme_recursively(self.window, self.special_widgets)
+            self.theme_manager.apply_theme_to_registry(self.themed_widgets)
     
     def create_theme_toggle(self, parent_frame):
         """Create theme toggle button for this window"""
-        return self.theme_manager.create_theme_toggle_button(
+        return self.themed(self.theme_manager.create_theme_toggle_button(
             parent_frame, 
             callback=lambda: self.apply_theme()
-        )
+        ))
 
 
 # Singleton instance for application-wide theme management
@@ -0,0 +1,186 @@
+"""
+Wide Tables Module
+Vertical splitting for inputs with more columns than fit, or belong, in one
+SQLite table. The columns are split into groups: the first group, holding the
+primary key columns, stays in <table>; the others go to <table>__part2,
+<table>__part3, ... whose rows carry the rowid of their row in <table>. The
+<table>_full view joins the groups back into complete rows, while queries on
+a few columns read only the pages of the tables holding them.
+"""
+
+import sqlite3
+
+from sql_util import quote
+
+
+# Compile-time default of SQLITE_MAX_COLUMN, for Pythons without Connection.getlimit
+SQLITE_MAX_COLUMN = 2000
+
+# Names SQLite accepts for the rowid, tried in turn when a column already uses one
+ROWID_NAMES = ('rowid', '_rowid_', 'oid')
+
+
+def column_limit(conn):
+    """Most columns SQLite allows in a table, view or result set on this connection"""
+    if hasattr(conn, 'getlimit'):
+        return conn.getlimit(sqlite3.SQLITE_LIMIT_COLUMN)
+    return SQLITE_MAX_COLUMN
+
+
+def part_table_name(table_name, part):
+    """Table holding column group number part (1-based; the first group is the table itself)"""
+    return table_name if part == 1 else f"{table_name}__part{part}"
+
+
+def full_view_name(table_name):
+    """Name of the view that joins the column groups of a split table"""
+    return f"{table_name}_full"
+
+
+def rowid_name(columns):
+    """A name that refers to the rowid of a table with the given columns"""
+    for name in ROWID_NAMES:
+        if name not in {str(col).lower() for col in columns}:
+            return name
+    raise ValueError("Columns named rowid, _rowid_ and oid hide the rowid of a split table")
+
+
+def drop_column_groups(conn, table_name):
+    """Remove the part tables and view of a previous split conversion (caller commits)"""
+    conn.execute(f'DROP VIEW IF EXISTS {quote(full_view_name(table_name))}')
+    parts = conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name GLOB ?",
+                         (f"{table_name}__part[0-9]*",)).fetchall()
+    for (name,) in parts:
+        conn.execute(f'DROP TABLE IF EXISTS {quote(name)}')
+
+
+class TableSplitter:
+    """
+    Splits the batches of one conversion into column groups
+
+    plan() is called with the columns of the first transformed batch; if the
+    table needs no split, split stays False and the converter writes the
+    table as usual.
+    """
+
+    def __init__(self, table_name, max_columns=None):
+        """
+        Args:
+            table_name (str): Target table; also the table of the first column group
+            max_columns (int): Columns per table; None to split only what exceeds SQLite's limit
+        """
+        if max_columns is not None and int(max_columns) < 1:
+            raise ValueError("Columns per table must be at least 1")
+        self.table_name = table_name
+        self.max_columns = int(max_columns) if max_columns is not None else None
+        self.columns = None
+        self.groups = None
+        self.key_columns = []
+        self.key_is_rowid = False
+
+    @property
+    def split(self):
+        return bool(self.groups) and len(self.groups) > 1
+
+    def plan(self, columns, key_columns, limit):
+        """
+        Choose the column groups for a table with these columns
+
+        Args:
+            columns (list): All columns, in input order
+            key_columns (list): Primary key columns; they go to the first group
+            limit (int): SQLite's column limit (see column_limit)
+
+        Returns:
+            bool: True if the table is split
+        """
+        self.columns = list(columns)
+        self.key_columns = list(key_columns)
+        group_size = min(self.max_columns or limit, limit)
+        if len(self.columns) <= group_size:
+            self.groups = [self.columns]
+            return False
+        if len(self.key_columns) >= group_size:
+            raise ValueError(f"The primary key needs fewer than {group_size} columns to split the table")
+
+        ordered = self.key_columns + [col for col in self.columns if col not in self.key_columns]
+        self.groups = [ordered[start:start + group_size] for start in range(0, len(ordered), group_size)]
+        return True
+
+    def tables(self):
+        """(table name, columns) of every column group, the main table first"""
+        return [(part_table_name(self.table_name, part), columns)
+                for part, columns in enumerate(self.groups, start=1)]
+
+    def use_rowid_key(self, conn):
+        """
+        Check whether the created main table uses its primary key as rowid
+
+        A single INTEGER primary key is the rowid, so the part tables take its
+        values; otherwise rows are numbered explicitly.
+        """
+        info = conn.execute(f'PRAGMA table_info({quote(self.table_name)})').fetchall()
+        keys = [row for row in info if row[5]]
+        self.key_is_rowid = len(keys) == 1 and keys[0][2].upper() == 'INTEGER'
+
+    def insert(self, conn, batch, insert_batch):
+        """
+        Write one batch into every column group (caller commits)
+
+        Args:
+            batch (DataFrame): Transformed batch whose index numbers its rows from 0
+                               across the whole conversion
+            insert_batch (callable): insert_batch of writer.py
+        """
+        if self.key_is_rowid:
+            key = batch[self.key_columns[0]]
+            if key.isna().any():
+                raise ValueError(f"Primary key column '{self.key_columns[0]}' has empty values")
+            rowids = key.to_numpy(dtype='int64')
+        else:
+            rowids = batch.index.to_numpy() + 1
+
+        for position, (table, columns) in enumerate(self.tables()):
+            if position == 0 and self.key_is_rowid:
+                insert_batch(conn, table, batch[columns])
+            else:
+                insert_batch(conn, table, batch[columns], rowids, rowid_name(columns))
+
+    def index_tables(self, indexes):
+        """
+        Assign index definitions to the column group holding their columns
+
+        Returns:
+            list: (table name, index definitions) for every table with indexes
+        """
+        by_table = {}
+        for index in indexes:
+            tables = {table for table, columns in self.tables() for col in index['columns'] if col in columns}
+            if len(tables) > 1:
+                raise ValueError(f"Index on {', '.join(index['columns'])} spans columns "
+                                 f"stored in different tables of the split table")
+            # Unknown columns are reported by build_indexes on the main table
+            by_table.setdefault(tables.pop() if tables else self.table_name, []).append(index)
+        return list(by_table.items())
+
+    def create_view(self, conn, limit):
+        """
+        Create <table>_full joining the column groups back in input order (caller commits)
+
+        Returns:
+            str: View name, or None if the full row has more columns than a view can hold
+        """
+        if len(self.columns) > limit:
+            return None
+        tables = self.tables()
+        alias = {col: f"p{position}" for position, (_, columns) in enumerate(tables, start=1) for col in columns}
+        select_sql = ", ".join(f'{alias[col]}.{quote(col)}' for col in self.columns)
+        main_rowid = rowid_name(tables[0][1])
+        joins = "".join(f' LEFT JOIN {quote(table)} AS p{position} '
+                        f'ON p{position}.{rowid_name(columns)} = p1.{main_rowid}'
+                        for position, (table, columns) in enumerate(tables[1:], start=2))
+        view = full_view_name(self.table_name)
+        conn.execute(f'DROP VIEW IF EXISTS {quote(view)}')
+        conn.execute(f'CREATE VIEW {quote(view)} AS SELECT {select_sql} '
+                     f'FROM {quote(self.table_name)} AS p1{joins}')
+        return view
@@ -0,0 +1,82 @@
+"""
+Writer Module
+Inserts DataFrame batches into SQLite with executemany. Each column is
+converted to native Python values once, as a whole (ndarray.tolist()), and
+the columns are zipped into a lazily consumed row iterator, so no per-row
+DataFrame access, per-value type dispatch or intermediate row lists are
+needed between pandas and sqlite3.
+"""
+
+import numpy as np
+import pandas as pd
+
+from sql_util import quote
+
+
+# Python types sqlite3 binds without an adapter
+BINDABLE_TYPES = (int, float, str, bytes)
+
+
+def column_values(series):
+    """
+    Values of a column as a list of native Python objects, None for missing values
+
+    Numeric columns go through ndarray.tolist(), which converts the whole
+    array in C; only missing values are patched afterwards.
+    """
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in 'iub':
+        # Plain NumPy integers and booleans cannot be missing
+        return series.to_numpy().tolist()
+
+    if isinstance(dtype, np.dtype) and dtype.kind == 'f':
+        array = series.to_numpy()
+        values = array.tolist()
+        for index in np.flatnonzero(np.isnan(array)):
+            values[index] = None
+        return values
+
+    if isinstance(dtype, np.dtype) and dtype.kind in 'mM':
+        # Timestamps and durations are stored as text, like the sqlite3 adapters wrote them
+        missing = series.isna().to_numpy()
+        return [None if is_missing else str(value) for value, is_missing in zip(series.tolist(), missing)]
+
+    # Nullable, string and object columns
+    values = series.to_numpy(dtype=object, na_value=None).tolist()
+    if dtype == object or isinstance(dtype, pd.CategoricalDtype):
+        # Mixed objects may hold NumPy scalars or values sqlite3 cannot bind (e.g. Timestamps)
+        values = [value if value is None or isinstance(value, BINDABLE_TYPES)
+                  else value.item() if isinstance(value, np.generic) else str(value)
+                  for value in values]
+    return values
+
+
+def row_tuples(df, *leading):
+    """
+    Lazily yield the rows of a DataFrame as tuples of native Python values
+
+    Args:
+        df (DataFrame): Rows to convert
+        *leading: Extra columns (sequences of native values) placed before the DataFrame's
+    """
+    return zip(*leading, *(column_values(df.iloc[:, position]) for position in range(len(df.columns))))
+
+
+def insert_batch(conn, table_name, df, rowids=None, rowid_name='rowid'):
+    """
+    Append a batch to an existing table with one executemany call (caller commits)
+
+    Args:
+        rowids: Optional integer array of explicit rowids for the rows
+        rowid_name (str): Name the rowid is inserted under (rowid, _rowid_ or oid)
+
+    Returns:
+        int: Number of rows inserted
+    """
+    names = ([rowid_name] if rowids is not None else []) + list(df.columns)
+    leading = [rowids.tolist()] if rowids is not None else []
+    columns = ", ".join(quote(col) for col in names)
+    placeholders = ", ".join("?" for _ in names)
+    conn.executemany(f'INSERT INTO {quote(table_name)} ({columns}) VALUES ({placeholders})',
+                     row_tuples(df, *leading))
+    return len(df)